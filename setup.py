@@ -54,6 +54,9 @@ setup(name='SimpleReg',
               'simplereg_transform = simplereg.application.transform:main',
               'simplereg_resample = simplereg.application.resample:main',
               'simplereg_register_landmarks = simplereg.application.register_landmarks:main',
+              'simplereg_transform_registry = simplereg.application.transform_registry:main',
+              'simplereg_registration_cache = simplereg.application.registration_cache:main',
+              'simplereg_benchmark_wrappers = simplereg.application.benchmark_wrappers:main',
           ],
       },
       )
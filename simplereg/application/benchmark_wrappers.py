@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+import argparse
+
+import pysitk.python_helper as ph
+
+import simplereg.wrapper_benchmark as wb
+
+
+##
+# Benchmark the overhead of the wrappers of command line registration tools
+# using stub executables
+# \date       2026-10-19 02:20:43+0100
+#
+# \return     exit code
+#
+def main():
+
+    # Read input
+    parser = argparse.ArgumentParser(
+        description="Benchmark the overhead of the wrappers of "
+        "RegAladin, RegF3D and FLIRT. The wrappers are run against stub "
+        "executables which instantly write valid outputs so that neither "
+        "NiftyReg nor FSL is required. Times of all stages (inputs, tool, "
+        "outputs, warp, displacement) are reported in seconds.",
+        prog=None,
+        epilog="Author: Michael Ebner (michael.ebner.14@ucl.ac.uk)",
+    )
+    parser.add_argument(
+        "-s", "--sizes",
+        help="Edge lengths of (cubic) synthetic images",
+        nargs="+",
+        type=int,
+        default=[128, 256],
+    )
+    parser.add_argument(
+        "-m", "--methods",
+        help="Registration methods to benchmark",
+        nargs="+",
+        choices=sorted(wb.METHODS.keys()),
+        default=None,
+    )
+    parser.add_argument(
+        "-r", "--repetitions",
+        help="Number of timed runs per method and size",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--in-memory",
+        help="Use in-memory images instead of images read from files, i.e. "
+        "include writing the images in the inputs stage",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-d", "--dir-output",
+        help="Directory for images and stub executables. If not given, a "
+        "temporary directory is used",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        help="Turn on/off verbose output",
+        type=int,
+        default=0,
+    )
+    args = parser.parse_args()
+
+    benchmark = wb.WrapperBenchmark(
+        sizes=[(size, ) * 3 for size in args.sizes],
+        methods=args.methods,
+        repetitions=args.repetitions,
+        from_file=not args.in_memory,
+        dir_output=args.dir_output,
+        verbose=args.verbose,
+    )
+    benchmark.run()
+    print(benchmark.get_table())
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ import numpy as np
 import SimpleITK as sitk
 
 import pysitk.python_helper as ph
+import simplereg.data_reader as dr
 import simplereg.point_based_registration as pbr
 
 
@@ -19,19 +20,20 @@ def main():
     )
     parser.add_argument(
         "-f", "--fixed",
-        help="Path to fixed image landmarks.",
+        help="Path to fixed image landmarks (.txt, .npy or .npz).",
         type=str,
         required=1,
     )
     parser.add_argument(
         "-m", "--moving",
-        help="Path to moving image landmarks.",
+        help="Path to moving image landmarks (.txt, .npy or .npz).",
         type=str,
         required=1,
     )
     parser.add_argument(
         "-o", "--output",
-        help="Path for obtained SimpleITK registration transform (.txt)",
+        help="Path for obtained SimpleITK registration transform "
+        "(.txt or .h5)",
         type=str,
         required=1,
     )
@@ -44,8 +46,8 @@ def main():
     )
     args = parser.parse_args()
 
-    landmarks_fixed_nda = np.loadtxt(args.fixed)
-    landmarks_moving_nda = np.loadtxt(args.moving)
+    landmarks_fixed_nda = dr.DataReader.read_landmarks(args.fixed)
+    landmarks_moving_nda = dr.DataReader.read_landmarks(args.moving)
 
     point_based_registration = pbr.RigidCoherentPointDrift(
         fixed_points_nda=landmarks_fixed_nda,
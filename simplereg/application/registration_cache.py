@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+import time
+import argparse
+
+import pysitk.python_helper as ph
+
+import simplereg.registration_cache as rc
+
+
+##
+# Inspect, evict and clear the on-disk cache of registration results
+# \date       2026-10-19 01:31:50+0100
+#
+# \return     exit code
+#
+def main():
+
+    # Read input
+    parser = argparse.ArgumentParser(
+        description="Inspect, evict and clear the on-disk cache of "
+        "registration results (see "
+        "SimpleItkRegistrationBase.enable_registration_cache).",
+        prog=None,
+        epilog="Author: Michael Ebner (michael.ebner.14@ucl.ac.uk)",
+    )
+    parser.add_argument(
+        "-d", "--directory",
+        help="Directory of registration cache. If not given, "
+        "SIMPLEREG_REGISTRATION_CACHE or its default is used",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "-ls", "--list",
+        help="List cache entries (key, method, computational time, size "
+        "and last use) from least to most recently used",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--evict",
+        help="Evict least recently used entries until the cache size is "
+        "within the given number of bytes",
+        type=int,
+        metavar="MAX_BYTES",
+        default=None,
+    )
+    parser.add_argument(
+        "--clear",
+        help="Remove all cache entries",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        help="Turn on/off verbose output",
+        type=int,
+        default=0,
+    )
+    args = parser.parse_args()
+
+    registration_cache = rc.RegistrationCache(directory=args.directory)
+
+    if args.evict is not None:
+        registration_cache.evict(max_bytes=args.evict)
+
+    if args.clear:
+        registration_cache.clear()
+
+    if args.list:
+        for entry in registration_cache.get_entries():
+            print("%s %s %.2fs %d %s" % (
+                entry["key"],
+                entry["class"],
+                entry["computational_time"],
+                entry["bytes"],
+                time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(entry["last_used"])),
+            ))
+
+    if args.verbose:
+        statistics = registration_cache.get_statistics()
+        ph.print_info("Registration cache '%s': %d entries, %d bytes" % (
+            registration_cache.get_directory(),
+            statistics["entries"],
+            statistics["bytes"]))
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
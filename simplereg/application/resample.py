@@ -6,6 +6,7 @@ import pysitk.python_helper as ph
 
 import simplereg.resampler
 from simplereg.definitions import ALLOWED_INTERPOLATORS
+from simplereg.definitions import ALLOWED_PRECISIONS
 
 
 ##
@@ -24,7 +25,9 @@ def main():
     )
     parser.add_argument(
         "-m", "--moving",
-        help="Path to moving image",
+        help="Path to moving image. "
+        "Can be a 2D/3D (multi-component) image or a 3D time series (4D) "
+        "in which case all volumes are resampled in a single run.",
         type=str,
         required=1,
     )
@@ -32,7 +35,7 @@ def main():
         "-f", "--fixed",
         help="Path to fixed image. "
         "Can be 'same' if fixed image space is identical to the moving image "
-        "space.",
+        "space. For a 4D image, the space of its first volume is used.",
         type=str,
         required=1,
     )
@@ -44,8 +47,8 @@ def main():
     )
     parser.add_argument(
         "-t", "--transform",
-        help="Path to (SimpleITK) transformation (.txt) or displacement "
-        "field (.nii.gz) to be applied",
+        help="Path to (SimpleITK) transformation (.txt, .h5) or displacement "
+        "field (.nii.gz, .h5) to be applied",
         type=str,
         required=0,
     )
@@ -81,6 +84,53 @@ def main():
         type=float,
         default=None,
     )
+    parser.add_argument(
+        "-roi", "--roi-mask",
+        help="Path to mask defining the region of interest in which the "
+        "image is resampled. Voxels outside the mask are set to the "
+        "padding value",
+        type=str,
+        required=0,
+    )
+    parser.add_argument(
+        "-crop", "--crop",
+        help="Crop the resampled image to the bounding box of the region of "
+        "interest",
+        type=int,
+        required=0,
+        default=0,
+    )
+    parser.add_argument(
+        "-pyr", "--pyramid",
+        help="Integer factors of multi-resolution pyramid levels relative "
+        "to the resampling spacing, e.g. '1 2 4'. The image is resampled only "
+        "once and coarser levels are obtained by anti-aliased decimation. "
+        "Each level is written to the output path with the suffix of its "
+        "spacing, e.g. '_s2' or '_s1x1x3'",
+        nargs="+",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-b", "--backend",
+        help="Resampling backend. 'numpy' resamples (memory-mapped) NIfTI "
+        "data chunk-wise via NumPy/SciPy without requiring ITK",
+        type=str,
+        choices=["sitk", "numpy"],
+        required=0,
+        default="sitk",
+    )
+    parser.add_argument(
+        "-prec", "--precision",
+        help="Floating point precision of images during resampling and "
+        "writing. 'float32' halves memory and I/O of float64 images. If not "
+        "given, the package-wide default is used (environment variable "
+        "SIMPLEREG_PRECISION)",
+        type=str,
+        choices=ALLOWED_PRECISIONS,
+        required=0,
+        default=None,
+    )
     parser.add_argument(
         "-v", "--verbose",
         help="Turn on/off verbose output",
@@ -101,12 +151,17 @@ def main():
         spacing=args.spacing,
         padding=args.padding,
         add_to_grid=args.add_to_grid,
+        path_to_mask=args.roi_mask,
+        crop=args.crop,
+        pyramid_factors=args.pyramid,
+        backend=args.backend,
+        precision=args.precision,
         verbose=args.verbose,
     )
     resampler.run()
     resampler.write_image(args.output)
 
-    if args.verbose:
+    if args.verbose and args.pyramid is None:
         ph.show_niftis([
             args.output,
             args.fixed,
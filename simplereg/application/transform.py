@@ -21,6 +21,7 @@ from simplereg.niftyreg_to_simpleitk_converter import \
 from simplereg.flirt_to_simpleitk_converter import \
     FlirtToSimpleItkConverter as flirt2sitk
 from simplereg.landmark_visualizer import IMPLEMENTED_MARKERS
+from simplereg.definitions import ALLOWED_TRANSFORMS_HDF5
 
 
 ##
@@ -47,7 +48,9 @@ def main():
     parser.add_argument(
         "-c", "--compose",
         help="Compose two (Simple)ITK transformations T2 and T1 to output "
-        "transform T3(x) = T2(T1)(x)",
+        "transform T3(x) = T2(T1)(x). "
+        "If the output is an HDF5 transform (.h5, .hdf5), T3 is stored as "
+        "composite transform.",
         nargs=3,
         metavar=("TRANSFORM_2", "TRANSFORM_1", "OUTPUT_TRANSFORM"),
         default=None,
@@ -72,7 +75,11 @@ def main():
         help="Apply (Simple)ITK transform (or displacement field) to landmarks. "
         "Landmarks are encoded in a text file with one landmark position in "
         "mm per line j: "
-        "<key_j_x> <key_j_y> (<key_j_z>)",
+        "<key_j_x> <key_j_y> (<key_j_z>). "
+        "Alternatively, landmarks can be given as NumPy array (.npy) or "
+        "archive (.npz) holding the array 'landmarks' and, optionally, "
+        "per-point 'labels' and 'weights'. The format is chosen by the file "
+        "extension.",
         nargs=3,
         metavar=("LANDMARKS", "TRANSFORM", "OUTPUT_LANDMARKS"),
         default=None,
@@ -150,6 +157,7 @@ def main():
         "-land2label", "--landmark-to-label",
         help="Convert landmark coordinates to image label where "
         "each landmark corresponds to a different label. "
+        "Per-point labels stored in .npz landmark files are used if given. "
         "An image needs to be provided to define the image space.",
         metavar=("LANDMARKS", "IMAGE", "OUTPUT_LABEL"),
         type=str,
@@ -207,8 +215,14 @@ def main():
     if args.compose is not None:
         transform1_sitk = dr.DataReader.read_transform(args.compose[1])
         transform2_sitk = dr.DataReader.read_transform(args.compose[0])
-        transform_sitk = utils.compose_transforms(
-            transform2_sitk, transform1_sitk)
+        extension = ph.strip_filename_extension(args.compose[2])[1]
+        if extension in ALLOWED_TRANSFORMS_HDF5:
+            # Keep both transforms as (lossless) composite transform
+            transform_sitk = sitk.CompositeTransform(
+                [transform2_sitk, transform1_sitk])
+        else:
+            transform_sitk = utils.compose_transforms(
+                transform2_sitk, transform1_sitk)
         dw.DataWriter.write_transform(
             transform_sitk, args.compose[2], args.verbose)
 
@@ -226,12 +240,13 @@ def main():
 
     if args.landmark is not None:
         landmarks_nda = dr.DataReader.read_landmarks(args.landmark[0])
+        attributes = dr.DataReader.read_landmark_attributes(args.landmark[0])
         transform_sitk = dr.DataReader.read_transform(args.landmark[1])
         for i in range(landmarks_nda.shape[0]):
             landmarks_nda[i, :] = transform_sitk.TransformPoint(
                 landmarks_nda[i, :])
         dw.DataWriter.write_landmarks(
-            landmarks_nda, args.landmark[2], args.verbose)
+            landmarks_nda, args.landmark[2], args.verbose, **attributes)
 
     if args.sitk_to_nreg is not None:
         nreg2sitk.convert_sitk_to_nreg_transform(
@@ -265,9 +280,11 @@ def main():
 
     if args.swap_sitk_nii is not None:
         landmarks_nda = dr.DataReader.read_landmarks(args.swap_sitk_nii[0])
+        attributes = dr.DataReader.read_landmark_attributes(
+            args.swap_sitk_nii[0])
         landmarks_nda[:, 0:2] *= -1
         dw.DataWriter.write_landmarks(
-            landmarks_nda, args.swap_sitk_nii[1], args.verbose)
+            landmarks_nda, args.swap_sitk_nii[1], args.verbose, **attributes)
 
     if args.split_labels is not None:
         dim = int(args.split_labels[1])
@@ -287,13 +304,16 @@ def main():
 
     if args.landmark_to_label:
         landmarks_nda = dr.DataReader.read_landmarks(args.landmark_to_label[0])
+        attributes = dr.DataReader.read_landmark_attributes(
+            args.landmark_to_label[0])
         image_sitk = dr.DataReader.read_image(args.landmark_to_label[1])
         landmark_visualizer = lv.LandmarkVisualizer(
             landmarks_nda=landmarks_nda,
             direction=image_sitk.GetDirection(),
             origin=image_sitk.GetOrigin(),
             spacing=image_sitk.GetSpacing(),
-            size=image_sitk.GetSize()
+            size=image_sitk.GetSize(),
+            labels=attributes.get("labels", None),
         )
         landmark_visualizer.build_landmark_image_sitk(
             marker=args.marker, radius=args.radius)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+
+import argparse
+
+import pysitk.python_helper as ph
+
+import simplereg.transform_registry as tr
+
+
+##
+# Import, export and list transforms of a transform registry
+# \date       2026-10-18 22:31:52+0100
+#
+# \return     exit code
+#
+def main():
+
+    # Read input
+    parser = argparse.ArgumentParser(
+        description="Import, export and list (linear) transforms stored "
+        "in a single transform registry file keyed by subject and step.",
+        prog=None,
+        epilog="Author: Michael Ebner (michael.ebner.14@ucl.ac.uk)",
+    )
+    parser.add_argument(
+        "-r", "--registry",
+        help="Path to transform registry (SQLite file), e.g. 'cohort.db'",
+        type=str,
+        required=1,
+    )
+    parser.add_argument(
+        "-imp", "--import-transforms",
+        help="Import (Simple)ITK transforms (.txt, .h5) for the given step. "
+        "Subjects are given by the file names without extension unless "
+        "specified by --subjects.",
+        nargs="+",
+        metavar="TRANSFORM",
+        default=None,
+    )
+    parser.add_argument(
+        "-exp", "--export-transforms",
+        help="Export transforms (for the given subjects/step) to directory",
+        metavar="OUTPUT_DIRECTORY",
+        default=None,
+    )
+    parser.add_argument(
+        "-s", "--subjects",
+        help="Subjects of imported transforms or subject to export",
+        nargs="+",
+        default=None,
+    )
+    parser.add_argument(
+        "--step",
+        help="Step of imported transforms or step to export",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "-p", "--pattern",
+        help="File name pattern of exported transforms",
+        type=str,
+        default="{subject}_{step}.txt",
+    )
+    parser.add_argument(
+        "-ls", "--list",
+        help="List keys (subject step) of stored transforms",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        help="Turn on/off verbose output",
+        type=int,
+        default=0,
+    )
+    args = parser.parse_args()
+
+    with tr.TransformRegistry(args.registry) as registry:
+
+        if args.import_transforms is not None:
+            if args.step is None:
+                raise IOError("Step of imported transforms must be given")
+            registry.import_transforms(
+                args.import_transforms, args.step, subjects=args.subjects)
+            if args.verbose:
+                ph.print_info("%d transforms imported into '%s'" % (
+                    len(args.import_transforms), args.registry))
+
+        if args.export_transforms is not None:
+            subjects = [None] if args.subjects is None else args.subjects
+            for subject in subjects:
+                registry.export_transforms(
+                    args.export_transforms,
+                    subject=subject,
+                    step=args.step,
+                    pattern=args.pattern,
+                    verbose=args.verbose,
+                )
+
+        if args.list:
+            for key in registry.get_keys(step=args.step):
+                print("%s %s" % key)
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
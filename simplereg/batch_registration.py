@@ -0,0 +1,163 @@
+##
+# \file batch_registration.py
+# \brief      Run many registrations (RegAladin, RegF3D, FLIRT,
+#             SimpleItkRegistration) concurrently across a process pool.
+#
+# Each job is described by a dictionary of file paths and options so that it
+# can be sent to worker processes. Every wrapper registration runs in its own
+# scratch directory which is removed once the job has finished.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import multiprocessing
+import concurrent.futures
+import nibabel as nib
+
+import pysitk.python_helper as ph
+
+import simplereg.flirt as flirt
+import simplereg.niftyreg as nreg
+import simplereg.simple_itk_registration as sitkreg
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+
+# Registration methods available for batch processing
+REGISTRATION_METHODS = [
+    "RegAladin",
+    "RegF3D",
+    "FLIRT",
+    "SimpleItkRegistration",
+]
+
+
+##
+# Gets the registration method object of a job.
+# \date       2026-10-18 23:24:10+0100
+#
+# \param      job   Job as dictionary (see run_registration)
+#
+# \return     Wrapper registration object
+#
+def get_registration_method(job):
+    method = job["method"]
+    if method not in REGISTRATION_METHODS:
+        raise ValueError("Registration method '%s' not known. "
+                         "Allowed options are: %s" % (
+                             method, ", ".join(REGISTRATION_METHODS)))
+
+    kwargs = {"verbose": job.get("verbose", 0)}
+    for name in ["fixed", "moving", "fixed_mask", "moving_mask"]:
+        if job.get(name, None) is not None:
+            kwargs["%s_sitk" % name] = dr.DataReader.read_image(job[name])
+
+    # Options are keyword arguments for SimpleItkRegistration and a string
+    # of command line options for the wrapped tools otherwise
+    if method == "SimpleItkRegistration":
+        kwargs.update(job.get("options", {}))
+        return sitkreg.SimpleItkRegistration(**kwargs)
+
+    kwargs["options"] = job.get("options", "")
+
+    # Warped images of linear registrations are only produced if requested
+    if method in ["RegAladin", "FLIRT"]:
+        kwargs["transform_only"] = job.get("output_warped", None) is None
+
+    if method == "FLIRT":
+        return flirt.FLIRT(**kwargs)
+
+    if job.get("omp", None) is not None:
+        kwargs["omp"] = job["omp"]
+    return getattr(nreg, method)(**kwargs)
+
+
+##
+# Run a single registration job and write its outputs.
+# \date       2026-10-18 23:24:10+0100
+#
+# \param      job   Job as dictionary with keys
+#                   - method: "RegAladin", "RegF3D", "FLIRT" or
+#                     "SimpleItkRegistration"
+#                   - fixed, moving: paths to images
+#                   - fixed_mask, moving_mask (optional): paths to masks
+#                   - options (optional): options of command line tool or
+#                     keyword arguments of SimpleItkRegistration (dict)
+#                   - omp (optional): number of OpenMP threads (NiftyReg)
+#                   - output_transform (optional): path to obtained transform
+#                     (control point grid for RegF3D)
+#                   - output_warped (optional): path to warped moving image
+#                   - verbose (optional)
+#
+# \return     Computational time of registration
+#
+def run_registration(job):
+    with get_registration_method(job) as registration_method:
+        registration_method.run()
+
+        if job.get("output_transform", None) is not None:
+            if job["method"] == "RegF3D":
+                # Keep NIfTI header identifying the control point grid
+                ph.create_directory(
+                    os.path.dirname(job["output_transform"]))
+                nib.save(registration_method.
+                         get_registration_control_point_grid_nib(),
+                         job["output_transform"])
+            else:
+                dw.DataWriter.write_transform(
+                    registration_method.get_registration_transform_sitk(),
+                    job["output_transform"])
+
+        if job.get("output_warped", None) is not None:
+            dw.DataWriter.write_image(
+                registration_method.get_warped_moving_sitk(),
+                job["output_warped"])
+
+        return registration_method.get_computational_time()
+
+
+##
+# Run registration jobs concurrently across a process pool.
+#
+# Unless given in a job, the OpenMP threads of NiftyReg are set so that the
+# processes share the available CPUs instead of oversubscribing them.
+# \date       2026-10-18 23:24:10+0100
+#
+# \param      jobs         List of jobs (see run_registration)
+# \param      n_processes  Number of worker processes; int. If None, the
+#                          number of CPUs is used
+# \param      verbose      Turn on/off verbose output
+#
+# \return     List of results in order of the jobs; either the
+#             computational time or the raised exception of a failed job
+#
+def run_batch(jobs, n_processes=None, verbose=0):
+    n_cpus = multiprocessing.cpu_count()
+    if n_processes is None:
+        n_processes = n_cpus
+    n_processes = max(1, min(int(n_processes), len(jobs)))
+    omp = max(1, n_cpus // n_processes)
+
+    jobs = [dict({"omp": omp}, **job) for job in jobs]
+
+    results = [None] * len(jobs)
+    with concurrent.futures.ProcessPoolExecutor(n_processes) as executor:
+        futures = {
+            executor.submit(run_registration, job): i
+            for i, job in enumerate(jobs)}
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = e
+                if verbose:
+                    ph.print_warning("Job %d (%s) failed: %s" % (
+                        i, jobs[i]["method"], e))
+            else:
+                if verbose:
+                    ph.print_info("Job %d (%s) finished: %s" % (
+                        i, jobs[i]["method"], results[i]))
+
+    return results
@@ -0,0 +1,161 @@
+##
+# \file data_cache.py
+# \brief      In-process LRU cache for images and transforms read from file
+#
+# Cached objects are keyed by absolute path, modification time and size of
+# the file (plus the read options) so that changed files are read again.
+# Objects are copied when they are returned. For sitk.Image and sitk.Transform
+# objects this is cheap as SimpleITK copies are copy-on-write.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import threading
+import collections
+import numpy as np
+import SimpleITK as sitk
+
+
+class DataCache(object):
+
+    ##
+    # Create empty cache
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \param      max_bytes  Byte budget of cache; int. Objects exceeding the
+    #                        budget are not cached
+    #
+    def __init__(self, max_bytes=2**30):
+        self._max_bytes = int(max_bytes)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    ##
+    # Gets the cache key of a file and its read options
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \param      path_to_file  The path to file
+    # \param      options       Read options affecting the returned object
+    #
+    # \return     Cache key as tuple
+    #
+    @staticmethod
+    def get_key(path_to_file, *options):
+        path_to_file = os.path.realpath(path_to_file)
+        stat = os.stat(path_to_file)
+        return (path_to_file, stat.st_mtime, stat.st_size) + options
+
+    ##
+    # Gets the copy of a cached object
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \param      key       Cache key
+    # \param      metadata  Also return the metadata stored with the object;
+    #                       bool
+    #
+    # \return     Copy of cached object or None if not cached; tuple of copy
+    #             and metadata if metadata is True
+    #
+    def get(self, key, metadata=False):
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return (None, None) if metadata else None
+            self._hits += 1
+            # Mark as most recently used
+            entry = self._entries.pop(key)
+            self._entries[key] = entry
+            data = entry[0]
+        if metadata:
+            return self.get_copy(data), entry[2]
+        return self.get_copy(data)
+
+    ##
+    # Add object to cache. Least recently used objects are evicted until the
+    # byte budget is met.
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \param      key       Cache key
+    # \param      data      sitk.Image, sitk.Transform or np.ndarray object
+    # \param      metadata  Metadata stored with the object, e.g. a checksum
+    #                       computed once when the object was read
+    #
+    # \return     Copy of object
+    #
+    def add(self, key, data, metadata=None):
+        nbytes = self.get_nbytes(data)
+        if nbytes <= self._max_bytes:
+            with self._lock:
+                if key in self._entries:
+                    self._bytes -= self._entries.pop(key)[1]
+                self._entries[key] = (data, nbytes, metadata)
+                self._bytes += nbytes
+                while self._bytes > self._max_bytes:
+                    self._bytes -= self._entries.popitem(last=False)[1][1]
+                    self._evictions += 1
+        return self.get_copy(data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    ##
+    # Gets the cache statistics
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \return     Dictionary with number of hits, misses, evictions, entries
+    #             and cached bytes as well as the byte budget
+    #
+    def get_statistics(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+            }
+
+    ##
+    # Gets the (approximate) memory footprint of an object
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \param      data  sitk.Image, sitk.Transform or np.ndarray object
+    #
+    # \return     Number of bytes
+    #
+    @staticmethod
+    def get_nbytes(data):
+        if isinstance(data, sitk.Image):
+            return data.GetNumberOfPixels() * \
+                data.GetNumberOfComponentsPerPixel() * \
+                data.GetSizeOfPixelComponent()
+        if isinstance(data, sitk.Transform):
+            return 8 * (data.GetNumberOfParameters() +
+                        data.GetNumberOfFixedParameters())
+        if isinstance(data, np.ndarray):
+            return data.nbytes
+        raise ValueError("Object of type '%s' cannot be cached" % type(data))
+
+    ##
+    # Gets a copy of an object so that callers cannot alter cached objects
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \param      data  sitk.Image, sitk.Transform or np.ndarray object
+    #
+    # \return     Copy of object of the same type
+    #
+    @staticmethod
+    def get_copy(data):
+        if isinstance(data, np.ndarray):
+            return np.array(data)
+        return type(data)(data)
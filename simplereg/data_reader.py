@@ -7,7 +7,7 @@
 
 import os
 import sys
-import itk
+import zlib
 import numpy as np
 import nibabel as nib
 import SimpleITK as sitk
@@ -15,25 +15,76 @@ import SimpleITK as sitk
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
+import simplereg.precision as prec
+from simplereg.data_cache import DataCache
+from simplereg.nibabel_to_simpleitk_converter import \
+    NibabelToSimpleItkConverter as nib2sitk
 from simplereg.definitions import ALLOWED_IMAGES
 from simplereg.definitions import ALLOWED_LANDMARKS
+from simplereg.definitions import LANDMARK_ATTRIBUTES
 from simplereg.definitions import ALLOWED_TRANSFORMS
 from simplereg.definitions import ALLOWED_TRANSFORMS_DISPLACEMENTS
+from simplereg.definitions import ALLOWED_TRANSFORMS_HDF5
 
 
 class DataReader(object):
 
+    # Opt-in in-process cache of sitk images and transforms
+    _cache = None
+
+    ##
+    # Enable caching of sitk.Image and sitk.Transform objects read by
+    # read_image and read_transform. Cached objects are keyed by absolute
+    # path, modification time and size of the file and are copied when
+    # returned.
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \param      max_bytes  Byte budget of cache; least recently used objects
+    #                        are evicted once exceeded
+    #
+    @staticmethod
+    def enable_cache(max_bytes=2**30):
+        DataReader._cache = DataCache(max_bytes=max_bytes)
+
+    @staticmethod
+    def disable_cache():
+        DataReader._cache = None
+
     ##
-    # Reads an image and returns either an sitk.Image or itk.Image object.
+    # Gets the cache statistics
+    # \date       2026-10-18 19:10:23+0100
+    #
+    # \return     Dictionary with number of hits, misses, evictions, entries
+    #             and cached bytes, or None if caching is disabled
+    #
+    @staticmethod
+    def get_cache_statistics():
+        if DataReader._cache is None:
+            return None
+        return DataReader._cache.get_statistics()
+
+    ##
+    # Reads an image and returns either an sitk.Image, itk.Image or
+    # nib.Nifti1Image object.
     # \date       2018-06-23 16:25:53-0600
     #
     # \param      path_to_file  The path to file
     # \param      itk           Select between sitk.Image or itk.Image object; bool
+    # \param      precision     Floating point sitk.Image objects are read
+    #                           with at most this precision. If None, the
+    #                           package-wide default PRECISION is used
+    # \param      as_nib        Read as nib.Nifti1Image object whose data of
+    #                           uncompressed NIfTI images is memory-mapped,
+    #                           i.e. np.asanyarray(image_nib.dataobj) provides
+    #                           the data array (in x, y [, z] order) without
+    #                           copying it; bool
     #
-    # \return     Image as sitk.Image or itk.Image object
+    # \return     Image as sitk.Image, itk.Image or nib.Nifti1Image object.
+    #             sitk.Image objects remember the file they were read from
+    #             (see get_source_path).
     #
     @staticmethod
-    def read_image(path_to_file, as_itk=0):
+    def read_image(path_to_file, as_itk=0, precision=None, as_nib=0):
 
         if not ph.file_exists(path_to_file):
             raise IOError("Image file '%s' not found" % path_to_file)
@@ -43,18 +94,155 @@ class DataReader(object):
             raise IOError("Image file extension must be of type %s " %
                           ", or ".join(ALLOWED_IMAGES))
 
+        # Read as (memory-mapped) nib.Nifti1Image object
+        if as_nib:
+            image = nib.load(path_to_file, mmap=True)
+
         # Read as itk.Image object
-        if as_itk:
+        elif as_itk:
+            # Imported here as WrapITK is slow to import
+            import itk
             image = itk.imread(path_to_file)
 
         # Read as sitk.Image object
         else:
-            image = sitk.ReadImage(path_to_file)
+            image = None
+            cache = DataReader._cache
+            if cache is not None:
+                key = cache.get_key(
+                    path_to_file, "image", prec.get_precision(precision))
+                image, checksum = cache.get(key, metadata=True)
+
+            if image is None:
+                image = prec.get_limited_image_sitk(
+                    sitk.ReadImage(path_to_file), precision)
+
+                # The buffer of a freshly read image is not shared yet, i.e.
+                # it is hashed without copying it. Cached images keep their
+                # checksum so that cache hits do not hash (shared) buffers.
+                checksum = DataReader._get_image_checksum(image)
+
+                if cache is not None:
+                    image = cache.add(key, image, metadata=checksum)
+
+            image._simplereg_source = (
+                os.path.abspath(path_to_file),
+                DataReader._get_file_stat(path_to_file),
+                DataReader._get_image_header(image),
+                checksum,
+            )
 
         return image
 
+    ##
+    # Gets the path of the file an sitk.Image object was read from by
+    # read_image. Command line tools can read this file directly instead of a
+    # written copy of the image.
+    # \date       2026-10-18 23:58:04+0100
+    #
+    # \param      image_sitk  Image as sitk.Image object
+    #
+    # \return     Path to file; None if the image was not read by read_image
+    #             or if either the file, the image geometry or its pixel data
+    #             (e.g. by in-place edits like image[index] = value) changed
+    #             since
+    #
+    @staticmethod
+    def get_source_path(image_sitk):
+        source = getattr(image_sitk, "_simplereg_source", None)
+        if source is None:
+            return None
+
+        path_to_file, stat, header, checksum = source
+        if not os.path.isfile(path_to_file) or \
+                DataReader._get_file_stat(path_to_file) != stat or \
+                DataReader._get_image_header(image_sitk) != header or \
+                DataReader._get_image_checksum(image_sitk) != checksum:
+            return None
+
+        return path_to_file
+
+    @staticmethod
+    def _get_file_stat(path_to_file):
+        stat = os.stat(path_to_file)
+        return (stat.st_mtime, stat.st_size)
+
+    @staticmethod
+    def _get_image_header(image_sitk):
+        return (
+            image_sitk.GetSize(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetOrigin(),
+            image_sitk.GetDirection(),
+            image_sitk.GetNumberOfComponentsPerPixel(),
+        )
+
+    ##
+    # Gets the checksum of the pixel data of an image used to detect in-place
+    # modifications (CRC-32 is fast and sufficient to detect edits)
+    # \date       2026-10-19 10:02:47+0100
+    #
+    # \param      image_sitk  Image as sitk.Image object
+    #
+    # \return     Checksum as int
+    #
+    @staticmethod
+    def _get_image_checksum(image_sitk):
+        nda = np.ascontiguousarray(sitk.GetArrayViewFromImage(image_sitk))
+        return zlib.crc32(nda.view(np.uint8).reshape(-1)) & 0xffffffff
+
+    ##
+    # Reads landmarks. The format is given by the file extension: text (.txt),
+    # NumPy binary (.npy) or NumPy archive (.npz) holding the array
+    # 'landmarks' and, optionally, per-point 'labels' and 'weights'.
+    # \date       2026-10-18 21:48:05+0100
+    #
+    # \param      path_to_file  The path to file
+    # \param      mmap          State whether .npy landmarks shall be read as
+    #                           (read-only) memory-mapped array; bool
+    #
+    # \return     Landmarks as (N x dim) np.array
+    #
+    @staticmethod
+    def read_landmarks(path_to_file, mmap=0):
+
+        extension = DataReader._get_landmarks_extension(path_to_file)
+
+        if extension == "npy":
+            return np.load(path_to_file, mmap_mode="r" if mmap else None)
+
+        if extension == "npz":
+            with np.load(path_to_file) as data:
+                if "landmarks" not in data:
+                    raise IOError(
+                        "Landmark file '%s' holds no array 'landmarks'" %
+                        path_to_file)
+                return data["landmarks"]
+
+        return np.loadtxt(path_to_file)
+
+    ##
+    # Reads the optional per-point landmark attributes, i.e. 'labels' and
+    # 'weights' of .npz landmark files.
+    # \date       2026-10-18 21:48:05+0100
+    #
+    # \param      path_to_file  The path to file
+    #
+    # \return     Dictionary of attribute name and np.array; empty for
+    #             formats without attributes
+    #
+    @staticmethod
+    def read_landmark_attributes(path_to_file):
+
+        extension = DataReader._get_landmarks_extension(path_to_file)
+        if extension != "npz":
+            return {}
+
+        with np.load(path_to_file) as data:
+            return {k: data[k] for k in LANDMARK_ATTRIBUTES if k in data}
+
     @staticmethod
-    def read_landmarks(path_to_file):
+    def _get_landmarks_extension(path_to_file):
 
         if not ph.file_exists(path_to_file):
             raise IOError("Landmark file '%s' not found" % path_to_file)
@@ -64,15 +252,18 @@ class DataReader(object):
             raise IOError("Landmark file extension must be of type %s " %
                           ", or ".join(ALLOWED_LANDMARKS))
 
-        return np.loadtxt(path_to_file)
+        return extension
 
     ##
-    # Reads a transform.
+    # Reads a transform. Besides text transforms and NIfTI displacement
+    # fields, ITK HDF5 transform files (.h5, .hdf5) are read which can hold
+    # any transform including composite and displacement field transforms.
     # \date       2018-06-12 23:59:38-0600
     #
     # \param      path_to_file  The path to file
     # \param      inverse       The inverse
-    # \param      nii_as_nib    State whether NIfTI image should be read as
+    # \param      nii_as_nib    State whether NIfTI image (or HDF5
+    #                           displacement field) should be read as
     #                           nibabel object (only used for sitk_to_nreg
     #                           displacement field conversion); bool
     #
@@ -86,25 +277,52 @@ class DataReader(object):
 
         extension = ph.strip_filename_extension(path_to_file)[1]
         if extension not in ALLOWED_TRANSFORMS and \
-                extension not in ALLOWED_TRANSFORMS_DISPLACEMENTS:
+                extension not in ALLOWED_TRANSFORMS_DISPLACEMENTS and \
+                extension not in ALLOWED_TRANSFORMS_HDF5:
             raise IOError("Transform file extension must be of type "
-                          "%s (transformation) or %s (displacements)" % (
+                          "%s (transformation), %s (displacements) or "
+                          "%s (HDF5 transformation)" % (
                               ", ".join(ALLOWED_TRANSFORMS),
-                              ", ".join(ALLOWED_TRANSFORMS_DISPLACEMENTS)))
+                              ", ".join(ALLOWED_TRANSFORMS_DISPLACEMENTS),
+                              ", ".join(ALLOWED_TRANSFORMS_HDF5)))
+
+        cache = DataReader._cache
+        if cache is not None and not as_itk and not nii_as_nib:
+            key = cache.get_key(path_to_file, "transform", bool(inverse))
+            transform_sitk = cache.get(key)
+            if transform_sitk is not None:
+                return transform_sitk
+        else:
+            cache = None
 
         if extension in ALLOWED_TRANSFORMS:
             if as_itk:
-                tranform_sitk = sitk.read_transform_itk(
+                transform_sitk = sitkh.read_transform_itk(
                     path_to_file, inverse=inverse)
             else:
                 transform_sitk = sitkh.read_transform_sitk(
                     path_to_file, inverse=inverse)
+        elif extension in ALLOWED_TRANSFORMS_HDF5:
+            # Returned as the specific transform type, e.g.
+            # sitk.CompositeTransform or sitk.DisplacementFieldTransform
+            transform_sitk = sitk.ReadTransform(path_to_file)
+            if inverse:
+                # May throw RuntimeError
+                transform_sitk = transform_sitk.GetInverse()
+            if nii_as_nib and isinstance(
+                    transform_sitk, sitk.DisplacementFieldTransform):
+                return nib2sitk.convert_sitk_to_nib_image(
+                    transform_sitk.GetDisplacementField())
+            if as_itk:
+                transform_sitk = sitkh.get_itk_from_sitk_transform(
+                    transform_sitk)
         else:
             # Used for sitk_to_nreg conversion only
             if nii_as_nib:
                 displacement_sitk = nib.load(path_to_file)
                 return displacement_sitk
             else:
+                # sitk.DisplacementFieldTransform requires 64-bit vectors
                 displacement_sitk = sitk.ReadImage(
                     path_to_file, sitk.sitkVectorFloat64)
                 transform_sitk = sitk.DisplacementFieldTransform(
@@ -113,6 +331,9 @@ class DataReader(object):
                     # May throw RuntimeError
                     transform_sitk = transform_sitk.GetInverse()
 
+        if cache is not None:
+            transform_sitk = cache.add(key, transform_sitk)
+
         return transform_sitk
 
     @staticmethod
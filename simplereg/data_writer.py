@@ -14,56 +14,188 @@ import SimpleITK as sitk
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
+import simplereg.precision as prec
+import simplereg.parallel_gzip as pgz
 from simplereg.definitions import ALLOWED_IMAGES
 from simplereg.definitions import ALLOWED_LANDMARKS
 from simplereg.definitions import ALLOWED_TRANSFORMS
 from simplereg.definitions import ALLOWED_TRANSFORMS_DISPLACEMENTS
+from simplereg.definitions import ALLOWED_TRANSFORMS_HDF5
 
 
 class DataWriter(object):
 
+    ##
+    # Writes an image. Floating point sitk.Image objects are written with at
+    # most the given precision.
+    # \date       2026-10-18 18:02:41+0100
+    #
+    # \param      image_sitk    Image as sitk.Image, nib.Nifti1Image or
+    #                           itk.Image object
+    # \param      path_to_file  The path to file
+    # \param      verbose       Turn on/off verbose output
+    # \param      precision     Precision; either "float32", "float64" or
+    #                           None (package-wide default PRECISION)
+    # \param      compression   Compression of .nii.gz files; compression
+    #                           level (0-9) or mode ("store", "fast",
+    #                           "default", "best") to select the parallel gzip
+    #                           writer. If None, the package-wide default
+    #                           COMPRESSION is used
+    #
     @staticmethod
-    def write_image(image_sitk, path_to_file, verbose=0):
+    def write_image(image_sitk, path_to_file, verbose=0, precision=None,
+                    compression=None):
 
         extension = ph.strip_filename_extension(path_to_file)[1]
         if extension not in ALLOWED_IMAGES:
             raise IOError("Image file extension must be of type %s " %
                           ", or ".join(ALLOWED_IMAGES))
-        if isinstance(image_sitk, sitk.Image):
-            sitkh.write_nifti_image_sitk(
-                image_sitk=image_sitk,
-                path_to_file=path_to_file,
-                verbose=verbose)
+
+        DataWriter._write_nifti(
+            image_sitk, path_to_file, verbose, precision, compression)
+
+    ##
+    # Writes a NIfTI image, either by the default (single-threaded) writers or
+    # by the parallel gzip writer
+    # \date       2026-10-18 21:03:17+0100
+    #
+    # \param      image         Image as sitk.Image, nib.Nifti1Image or
+    #                           itk.Image object
+    # \param      path_to_file  The path to file
+    # \param      verbose       Turn on/off verbose output
+    # \param      precision     Precision of sitk.Image objects
+    # \param      compression   Compression of .nii.gz files
+    #
+    @staticmethod
+    def _write_nifti(image, path_to_file, verbose, precision, compression):
+        level = pgz.get_compression_level(compression)
+
+        if isinstance(image, sitk.Image):
+            image = prec.get_limited_image_sitk(image, precision)
+
+            def write_function(path, verbose):
+                sitkh.write_nifti_image_sitk(
+                    image_sitk=image, path_to_file=path, verbose=verbose)
+
+        elif isinstance(image, nib.Nifti1Image):
+
+            def write_function(path, verbose):
+                ph.create_directory(os.path.dirname(path))
+                nib.save(image, path)
+                if verbose:
+                    ph.print_info("Image written to '%s'" % path)
+
         else:
-            sitkh.write_nifti_image_itk(
-                image_itk=image_sitk,
-                path_to_file=path_to_file,
-                verbose=verbose)
 
+            def write_function(path, verbose):
+                sitkh.write_nifti_image_itk(
+                    image_itk=image, path_to_file=path, verbose=verbose)
+
+        if level is None:
+            write_function(path_to_file, verbose)
+        else:
+            pgz.write_compressed(
+                lambda path: write_function(path, 0), path_to_file, level)
+            if verbose:
+                ph.print_info("Image written to '%s'" % path_to_file)
+
+    ##
+    # Writes landmarks. The format is given by the file extension: text (.txt),
+    # NumPy binary (.npy) or NumPy archive (.npz). Only the latter stores the
+    # optional per-point labels and weights.
+    # \date       2026-10-18 21:48:05+0100
+    #
+    # \param      landmarks_nda  Landmarks as (N x dim) np.array
+    # \param      path_to_file   The path to file
+    # \param      verbose        Turn on/off verbose output
+    # \param      labels         Optional per-point labels as (N,) np.array
+    # \param      weights        Optional per-point weights as (N,) np.array
+    #
     @staticmethod
-    def write_landmarks(landmarks_nda, path_to_file, verbose=0):
+    def write_landmarks(landmarks_nda, path_to_file, verbose=0,
+                        labels=None, weights=None):
 
         extension = ph.strip_filename_extension(path_to_file)[1]
         if extension not in ALLOWED_LANDMARKS:
             raise IOError("Landmark file extension must be of type %s " %
                           ", or ".join(ALLOWED_LANDMARKS))
 
-        ph.write_array_to_file(
-            path_to_file, landmarks_nda, delimiter=" ", access_mode="w",
-            verbose=verbose)
+        attributes = {}
+        for name, attribute in zip(["labels", "weights"], [labels, weights]):
+            if attribute is None:
+                continue
+            attribute = np.asarray(attribute)
+            if attribute.shape != (np.atleast_2d(landmarks_nda).shape[0], ):
+                raise ValueError(
+                    "Landmark %s must be given as one value per point" % name)
+            attributes[name] = attribute
+
+        if extension != "npz" and attributes:
+            ph.print_warning(
+                "Landmark %s cannot be stored in .%s files and are "
+                "discarded" % (" and ".join(attributes.keys()), extension))
+
+        if extension == "txt":
+            ph.write_array_to_file(
+                path_to_file, landmarks_nda, delimiter=" ", access_mode="w",
+                verbose=verbose)
+            return
+
+        ph.create_directory(os.path.dirname(path_to_file))
+        if extension == "npy":
+            np.save(path_to_file, landmarks_nda)
+        else:
+            np.savez(path_to_file, landmarks=landmarks_nda, **attributes)
 
+        if verbose:
+            ph.print_info("Landmarks written to '%s'" % path_to_file)
+
+    ##
+    # Writes a transform or displacement field. Displacement fields given as
+    # sitk.Image objects are written with at most the given precision.
+    # ITK HDF5 transform files (.h5, .hdf5) hold any sitk.Transform,
+    # including composite and displacement field transforms, in binary
+    # (64-bit, uncompressed) representation.
+    # \date       2026-10-18 18:02:41+0100
+    #
+    # \param      transform_sitk  Transform as sitk.Transform, np.ndarray,
+    #                             sitk.Image or nib.Nifti1Image object
+    # \param      path_to_file    The path to file
+    # \param      verbose         Turn on/off verbose output
+    # \param      precision       Precision; either "float32", "float64" or
+    #                             None (package-wide default PRECISION)
+    # \param      compression     Compression of .nii.gz displacement fields
+    #                             (see write_image)
+    #
     @staticmethod
-    def write_transform(transform_sitk, path_to_file, verbose=0):
+    def write_transform(transform_sitk, path_to_file, verbose=0,
+                        precision=None, compression=None):
 
         extension = ph.strip_filename_extension(path_to_file)[1]
         if extension not in ALLOWED_TRANSFORMS and \
-                extension not in ALLOWED_TRANSFORMS_DISPLACEMENTS:
+                extension not in ALLOWED_TRANSFORMS_DISPLACEMENTS and \
+                extension not in ALLOWED_TRANSFORMS_HDF5:
             raise IOError("Transform file extension must be of type "
-                          "%s (transformation) or %s (displacements)" % (
+                          "%s (transformation), %s (displacements) or "
+                          "%s (HDF5 transformation)" % (
                               ", ".join(ALLOWED_TRANSFORMS),
-                              ", ".join(ALLOWED_TRANSFORMS_DISPLACEMENTS)))
+                              ", ".join(ALLOWED_TRANSFORMS_DISPLACEMENTS),
+                              ", ".join(ALLOWED_TRANSFORMS_HDF5)))
+
+        if extension in ALLOWED_TRANSFORMS_HDF5:
+            if isinstance(transform_sitk, sitk.Image):
+                # sitk.DisplacementFieldTransform requires 64-bit vectors
+                transform_sitk = sitk.DisplacementFieldTransform(
+                    sitk.Cast(transform_sitk, sitk.sitkVectorFloat64))
+            if not isinstance(transform_sitk, sitk.Transform):
+                raise IOError("HDF5 transform must be of type "
+                              "sitk.Transform or sitk.Image")
+            ph.create_directory(os.path.dirname(path_to_file))
+            sitk.WriteTransform(transform_sitk, path_to_file)
+            if verbose:
+                ph.print_info("Transform written to '%s'" % path_to_file)
 
-        if extension in ALLOWED_TRANSFORMS:
+        elif extension in ALLOWED_TRANSFORMS:
             if isinstance(transform_sitk, sitk.Image):
                 raise IOError("Cannot convert displacement field (%s) to "
                               "transform (%s)" % (
@@ -93,14 +225,10 @@ class DataWriter(object):
                                   ", ".join(ALLOWED_TRANSFORMS),
                                   ", ".join(ALLOWED_TRANSFORMS_DISPLACEMENTS),
                               ))
-            elif isinstance(transform_sitk, sitk.Image):
-                sitkh.write_nifti_image_sitk(
-                    image_sitk=transform_sitk,
-                    path_to_file=path_to_file,
-                    verbose=verbose)
-            elif isinstance(transform_sitk, nib.nifti1.Nifti1Image):
-                ph.create_directory(os.path.dirname(path_to_file))
-                nib.save(transform_sitk, path_to_file)
+            elif isinstance(transform_sitk, (sitk.Image, nib.Nifti1Image)):
+                DataWriter._write_nifti(
+                    transform_sitk, path_to_file, verbose, precision,
+                    compression)
             else:
                 raise IOError("Transform must be of type "
                               "sitk.Image or nibabel.nifti1.Nifti1Image")
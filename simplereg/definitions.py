@@ -1,4 +1,5 @@
 import os
+import multiprocessing
 
 from pysitk.definitions import DIR_TMP
 
@@ -7,16 +8,49 @@ DIR_ROOT = os.path.realpath(
 DIR_DATA = os.path.join(DIR_ROOT, "data")
 DIR_TEST = os.path.join(DIR_DATA, "tests")
 
+# Total number of cores available to concurrently scheduled registrations
+# (see simplereg.registration_scheduler)
+N_CORES = int(os.environ.get("SIMPLEREG_N_CORES", multiprocessing.cpu_count()))
+
 # OMP threads used for NiftyReg by default
-OMP = 8
+OMP = int(os.environ.get("SIMPLEREG_OMP", min(8, N_CORES)))
+
+# Floating point precision of images and displacement fields. Floating point
+# data is kept with at most this precision ("float32" halves memory and I/O).
+# Can be overridden per call, see simplereg.precision
+PRECISION = os.environ.get("SIMPLEREG_PRECISION", "float64")
+ALLOWED_PRECISIONS = ["float32", "float64"]
+
+# Compression of written .nii.gz files. None uses the default
+# (single-threaded) writers whereas a compression level (0-9) or mode
+# ("store", "fast", "default", "best") selects the parallel gzip writer.
+# See simplereg.parallel_gzip
+COMPRESSION = os.environ.get("SIMPLEREG_COMPRESSION", None)
+
+# Scratch area of the wrapper registrations (NiftyReg/FLIRT) holding the
+# (uncompressed) files exchanged with the command line tools, e.g. "/dev/shm"
+# to keep them on tmpfs
+DIR_SCRATCH = os.environ.get("SIMPLEREG_DIR_SCRATCH", DIR_TMP)
+
+# Default directory of the (opt-in) on-disk cache of registration results.
+# See simplereg.registration_cache
+DIR_REGISTRATION_CACHE = os.environ.get(
+    "SIMPLEREG_REGISTRATION_CACHE",
+    os.path.join(DIR_TMP, "registration_cache"))
 
 ALLOWED_IMAGES = ["nii.gz", "nii"]
 ALLOWED_TRANSFORMS = ["txt"]
 ALLOWED_TRANSFORMS_DISPLACEMENTS = ["nii.gz", "nii"]
-ALLOWED_LANDMARKS = ["txt"]
+# ITK HDF5 transform files holding any (Simple)ITK transform, including
+# composite and (uncompressed) displacement field transforms
+ALLOWED_TRANSFORMS_HDF5 = ["h5", "hdf5"]
+ALLOWED_LANDMARKS = ["txt", "npy", "npz"]
+# Optional per-point attributes stored along with the landmarks in .npz files
+LANDMARK_ATTRIBUTES = ["labels", "weights"]
 ALLOWED_INTERPOLATORS = [
     "Linear",
     "NearestNeighbor",
     "BSpline",
     "OrientedGaussian",
+    "LabelLinear",
 ]
@@ -2,8 +2,6 @@
 # \file FLIRT.py
 # \brief      This class makes FLIRT accessible via Python
 #
-# This class requires Convert3D Medical Image Processing Tool to be installed
-# (https://sourceforge.net/projects/c3d/files/c3d/Nightly/)
 # \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
 # \date       May 2017
 
@@ -12,17 +10,34 @@ import os
 import numpy as np
 import SimpleITK as sitk
 import nipype.interfaces.fsl
-import nipype.interfaces.c3
 
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
 import simplereg.utilities as utils
-from simplereg.definitions import DIR_TMP
 from simplereg.wrapper_registration import WrapperRegistration
 from simplereg.flirt_to_simpleitk_converter import \
     FlirtToSimpleItkConverter as flirt2sitk
 
+
+##
+# FLIRT interface which only estimates the transform, i.e. FLIRT is run
+# without '-out' so that no registered output image is produced
+# \date       2026-10-19 00:31:07+0100
+#
+class _FLIRTTransformOnly(nipype.interfaces.fsl.FLIRT):
+
+    def _parse_inputs(self, skip=None):
+        skip = [] if skip is None else skip
+        return super(_FLIRTTransformOnly, self)._parse_inputs(
+            skip=skip + ["out_file"])
+
+    def _list_outputs(self):
+        outputs = super(_FLIRTTransformOnly, self)._list_outputs()
+        outputs.pop("out_file", None)
+        return outputs
+
+
 class FLIRT(WrapperRegistration):
 
     def __init__(self,
@@ -33,6 +48,7 @@ class FLIRT(WrapperRegistration):
                  options="",
                  subfolder="FLIRT",
                  verbose=False,
+                 transform_only=False,
                  ):
 
         WrapperRegistration.__init__(self,
@@ -43,59 +59,72 @@ class FLIRT(WrapperRegistration):
                                      options=options,
                                      verbose=verbose,
                                      )
-        # Subfolder within DIR_TMP where results will be stored temporarily
-        self._dir_tmp = os.path.join(DIR_TMP, subfolder)
-
-        self._fixed_str = os.path.join(self._dir_tmp, "fixed.nii.gz")
-        self._moving_str = os.path.join(self._dir_tmp, "moving.nii.gz")
+        # Unique scratch directory within DIR_TMP (prefixed by subfolder)
+        # where results will be stored temporarily
+        self._dir_tmp = self._create_dir_tmp(subfolder)
+
+        # Paths to input images handed to the command line tool; set by
+        # _get_interface
+        self._fixed_str = None
+        self._moving_str = None
+        self._fixed_mask_str = None
+        self._moving_mask_str = None
+
+        # Intermediate images are exchanged uncompressed
         self._warped_moving_str = os.path.join(
-            self._dir_tmp, "warped_moving.nii.gz")
-
-        self._fixed_mask_str = os.path.join(
-            self._dir_tmp, "fixed_mask.nii.gz")
-        self._moving_mask_str = os.path.join(
-            self._dir_tmp, "moving_mask.nii.gz")
+            self._dir_tmp, "warped_moving.nii")
 
         self._registration_transform_str = os.path.join(
             self._dir_tmp, "registration_transform.txt")
-        self._registration_transform_sitk_str = os.path.join(
-            self._dir_tmp, "registration_transform_sitk.txt")
 
-    def _run(self):
+        # Only estimate the transform; the warped moving image is resampled
+        # in-process if requested
+        self._transform_only = transform_only
+        self._warped_moving_sitk = None
+
+    def _get_interface(self):
 
         # Create and delete all possibly existing files in the directory
         ph.create_directory(self._dir_tmp, delete_files=True)
 
-        sitkh.write_nifti_image_sitk(self._fixed_sitk, self._fixed_str)
-        sitkh.write_nifti_image_sitk(self._moving_sitk, self._moving_str)
-
-        flt = nipype.interfaces.fsl.FLIRT()
+        # Files of images read from disk are passed through
+        self._fixed_str = self._get_path_to_image(
+            self._fixed_sitk, "fixed.nii")
+        self._moving_str = self._get_path_to_image(
+            self._moving_sitk, "moving.nii")
+
+        if self._transform_only:
+            flt = _FLIRTTransformOnly()
+        else:
+            flt = nipype.interfaces.fsl.FLIRT()
+            flt.inputs.out_file = self._warped_moving_str
         flt.inputs.in_file = self._moving_str
         flt.inputs.reference = self._fixed_str
-        flt.inputs.out_file = self._warped_moving_str
         flt.inputs.out_matrix_file = self._registration_transform_str
-        flt.inputs.output_type = "NIFTI_GZ"
+        flt.inputs.output_type = "NIFTI"
 
         if self._fixed_sitk_mask is not None:
-            sitkh.write_nifti_image_sitk(
-                self._fixed_sitk_mask, self._fixed_mask_str)
+            self._fixed_mask_str = self._get_path_to_image(
+                self._fixed_sitk_mask, "fixed_mask.nii")
             flt.inputs.ref_weight = self._fixed_mask_str
 
         if self._moving_sitk_mask is not None:
-            sitkh.write_nifti_image_sitk(
-                self._moving_sitk_mask, self._moving_mask_str)
+            self._moving_mask_str = self._get_path_to_image(
+                self._moving_sitk_mask, "moving_mask.nii")
             flt.inputs.in_weight = self._moving_mask_str
 
         flt.inputs.args = self._options
 
-        # Execute registration
-        if self._verbose:
-            ph.print_execution(flt.cmdline)
-        flt.run()
+        return flt
+
+    def _read_results(self):
 
         # Read warped image
-        self._warped_moving_sitk = sitkh.read_nifti_image_sitk(
-            self._warped_moving_str)
+        if self._transform_only:
+            self._warped_moving_sitk = None
+        else:
+            self._warped_moving_sitk = sitkh.read_nifti_image_sitk(
+                self._warped_moving_str)
 
         # Convert to sitk affine transform
         self._registration_transform_sitk = self._convert_to_sitk_transform()
@@ -112,32 +141,13 @@ class FLIRT(WrapperRegistration):
     #
     def _convert_to_sitk_transform(self):
 
-        flirt2sitk.convert_flirt_to_sitk_transform(
-            self._registration_transform_str,
-            self._fixed_str,
-            self._moving_str,
-            self._registration_transform_sitk_str,
-            verbose=self._verbose,
+        # Computed in-process from the image headers
+        return flirt2sitk.get_sitk_transform_from_flirt_matrix(
+            np.loadtxt(self._registration_transform_str),
+            self._fixed_sitk,
+            self._moving_sitk,
         )
 
-        # Read transform and convert to affine registration
-        trafo_sitk = sitk.ReadTransform(self._registration_transform_sitk_str)
-
-        parameters = trafo_sitk.GetParameters()
-
-        if self._fixed_sitk.GetDimension() == 2:
-            parameters_ = np.zeros(6)
-            parameters_[0:2] = parameters[0:2]
-            parameters_[2:4] = parameters[3:5]
-            parameters_[4:6] = parameters[10:12]
-            parameters = parameters_
-
-        registration_transform_sitk = sitk.AffineTransform(
-            self._fixed_sitk.GetDimension())
-        registration_transform_sitk.SetParameters(parameters)
-
-        return registration_transform_sitk
-
     def _get_transformed_fixed_sitk(self):
         return sitkh.get_transformed_sitk_image(
             self._fixed_sitk, self.get_registration_transform_sitk())
@@ -146,7 +156,19 @@ class FLIRT(WrapperRegistration):
         return sitkh.get_transformed_sitk_image(
             self._fixed_sitk_mask, self.get_registration_transform_sitk())
 
+    def _get_cache_options(self):
+        options = super(FLIRT, self)._get_cache_options()
+        options["transform_only"] = self._transform_only
+        return options
+
     def _get_warped_moving_sitk(self):
+        # Also without warped moving image of cached results
+        if self._transform_only or self._warped_moving_sitk is None:
+            if self._warped_moving_sitk is None:
+                self._warped_moving_sitk = self._get_resampled_moving_sitk(
+                    sitk.sitkFloat64)
+            return self._warped_moving_sitk
+
         if self._warped_moving_sitk.GetDimension() == 2:
             raise Warning(
                 "warped_moving_sitk seems to be flawed for 2D "
@@ -1,6 +1,13 @@
 # \file flirt_to_simpleitk_converter.py
 #  \brief Class to convert between FLIRT and SimpleITK representations
 #
+# FLIRT matrices map between the "scaled voxel" coordinates of the moving
+# (-in) and fixed (-ref) image, i.e. voxel indices scaled by the spacing
+# where the first axis is flipped for images with positive voxel-to-world
+# determinant (neurological orientation). Conversions are computed in-process
+# from the image headers with full precision (formerly c3d_affine_tool with
+# -fsl2ras/-ras2fsl).
+#
 #  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
 #  \date June 2018
 
@@ -9,11 +16,12 @@ import os
 import sys
 import numpy as np
 import SimpleITK as sitk
-import nipype.interfaces.c3
 
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
+import simplereg.utilities as utils
+
 
 ##
 # Class to convert between FLIRT and SimpleITK representations
@@ -40,23 +48,17 @@ class FlirtToSimpleItkConverter(object):
             verbose=0,
     ):
 
-        ph.create_directory(os.path.dirname(path_to_sitk_transform))
-
-        c3d = nipype.interfaces.c3.C3dAffineTool()
-        c3d.inputs.reference_file = path_to_fixed
-        c3d.inputs.source_file = path_to_moving
-        c3d.inputs.transform_file = path_to_flirt_mat
-        c3d.inputs.fsl2ras = True
-        c3d.inputs.itk_transform = path_to_sitk_transform
+        transform_sitk = \
+            FlirtToSimpleItkConverter.get_sitk_transform_from_flirt_matrix(
+                np.loadtxt(path_to_flirt_mat), path_to_fixed, path_to_moving)
 
+        ph.create_directory(os.path.dirname(path_to_sitk_transform))
+        sitk.WriteTransform(transform_sitk, path_to_sitk_transform)
         if verbose:
-            ph.print_execution(c3d.cmdline)
-        c3d.run()
+            ph.print_info("Transform written to '%s'" % path_to_sitk_transform)
 
     ##
     # Convert SimpleITK to FLIRT transform
-    #
-    # Remark: Conversion to FLIRT only provides 4 decimal places
     # \date       2018-06-10 16:09:56-0600
     #
     # \param      path_to_sitk_transform  Path to SimpleITK transform
@@ -74,15 +76,143 @@ class FlirtToSimpleItkConverter(object):
             verbose=0,
     ):
 
+        matrix_sitk_nda = utils.get_matrix_from_sitk_transform(
+            sitk.ReadTransform(path_to_sitk_transform))
+        matrix_flirt_nda = \
+            FlirtToSimpleItkConverter.convert_sitk_to_flirt_matrices(
+                matrix_sitk_nda, path_to_fixed, path_to_moving)
+
         ph.create_directory(os.path.dirname(path_to_flirt_mat))
+        np.savetxt(path_to_flirt_mat, matrix_flirt_nda, fmt="%.17g")
+        if verbose:
+            ph.print_info("Transform written to '%s'" % path_to_flirt_mat)
+
+    ##
+    # Gets the (affine) SimpleITK transform of a FLIRT matrix
+    # \date       2026-10-19 00:47:22+0100
+    #
+    # \param      matrix_flirt_nda  FLIRT matrix as (4 x 4) np.array
+    # \param      fixed             Fixed image used by FLIRT (-ref) as
+    #                               sitk.Image object or path
+    # \param      moving            Moving image used by FLIRT (-in) as
+    #                               sitk.Image object or path
+    #
+    # \return     Transform as sitk.AffineTransform of the images' dimension
+    #
+    @staticmethod
+    def get_sitk_transform_from_flirt_matrix(matrix_flirt_nda, fixed, moving):
+        fixed = FlirtToSimpleItkConverter._get_image_information(fixed)
+        matrix_sitk_nda = \
+            FlirtToSimpleItkConverter.convert_flirt_to_sitk_matrices(
+                matrix_flirt_nda, fixed, moving)
 
-        c3d = nipype.interfaces.c3.C3dAffineTool()
-        c3d.inputs.reference_file = path_to_fixed
-        c3d.inputs.source_file = path_to_moving
+        # 2D images are treated as single-slice volumes by FLIRT
+        dim = fixed.GetDimension()
+        if dim == 2:
+            matrix_sitk_nda = matrix_sitk_nda[[0, 1, 3]][:, [0, 1, 3]]
 
-        # position of -ras2fsl matters!!
-        c3d.inputs.args = "-itk %s -ras2fsl -o %s" % (
-            path_to_sitk_transform, path_to_flirt_mat)
-        if verbose:
-            ph.print_execution(c3d.cmdline)
-        c3d.run()
+        return utils.get_sitk_transform_from_matrix(
+            matrix_sitk_nda)
+
+    ##
+    # Convert FLIRT matrices to homogeneous SimpleITK matrices, i.e. matrices
+    # mapping physical (LPS) points of the fixed to the moving image space.
+    # \date       2026-10-19 00:47:22+0100
+    #
+    # \param      matrices_flirt_nda  FLIRT matrix as (4 x 4) or stacked FLIRT
+    #                                 matrices as (N x 4 x 4) np.array
+    # \param      fixed               Fixed image used by FLIRT (-ref) as
+    #                                 sitk.Image object or path
+    # \param      moving              Moving image used by FLIRT (-in) as
+    #                                 sitk.Image object or path
+    #
+    # \return     Homogeneous matrices as np.array of the same shape
+    #
+    @staticmethod
+    def convert_flirt_to_sitk_matrices(matrices_flirt_nda, fixed, moving):
+        W_fixed = FlirtToSimpleItkConverter.get_flirt_to_physical_matrix(
+            fixed)
+        W_moving = FlirtToSimpleItkConverter.get_flirt_to_physical_matrix(
+            moving)
+
+        # FLIRT maps moving to fixed scaled voxel coordinates
+        return np.matmul(
+            np.matmul(W_moving, np.linalg.inv(matrices_flirt_nda)),
+            np.linalg.inv(W_fixed))
+
+    ##
+    # Convert homogeneous (3D) SimpleITK matrices to FLIRT matrices
+    # \date       2026-10-19 00:47:22+0100
+    #
+    # \param      matrices_sitk_nda  Homogeneous matrix as (4 x 4) or stacked
+    #                                matrices as (N x 4 x 4) np.array
+    # \param      fixed              Fixed image as sitk.Image object or path
+    # \param      moving             Moving image as sitk.Image object or path
+    #
+    # \return     FLIRT matrices as np.array of the same shape
+    #
+    @staticmethod
+    def convert_sitk_to_flirt_matrices(matrices_sitk_nda, fixed, moving):
+        W_fixed = FlirtToSimpleItkConverter.get_flirt_to_physical_matrix(
+            fixed)
+        W_moving = FlirtToSimpleItkConverter.get_flirt_to_physical_matrix(
+            moving)
+
+        return np.linalg.inv(np.matmul(
+            np.matmul(np.linalg.inv(W_moving), matrices_sitk_nda), W_fixed))
+
+    ##
+    # Gets the homogeneous matrix mapping FLIRT's scaled voxel coordinates of
+    # an image to physical (LPS) coordinates. 2D images are treated as
+    # single-slice volumes.
+    # \date       2026-10-19 00:47:22+0100
+    #
+    # \param      image  Image as sitk.Image object or path (only the header
+    #                    is read)
+    #
+    # \return     Homogeneous matrix as (4 x 4) np.array
+    #
+    @staticmethod
+    def get_flirt_to_physical_matrix(image):
+        image = FlirtToSimpleItkConverter._get_image_information(image)
+        dim = image.GetDimension()
+
+        size = np.ones(3)
+        spacing = np.ones(3)
+        origin = np.zeros(3)
+        direction = np.eye(3)
+        size[0:dim] = image.GetSize()
+        spacing[0:dim] = image.GetSpacing()
+        origin[0:dim] = image.GetOrigin()
+        direction[0:dim, 0:dim] = np.array(
+            image.GetDirection()).reshape(dim, dim)
+
+        # Voxel to physical coordinates
+        V = np.eye(4)
+        V[0:3, 0:3] = direction.dot(np.diag(spacing))
+        V[0:3, 3] = origin
+
+        # Voxel to scaled voxel coordinates; FSL flips the first axis of
+        # images with positive voxel-to-world (RAS) determinant which equals
+        # the determinant of the direction matrix (LPS)
+        S = np.diag(np.append(spacing, 1.))
+        if np.linalg.det(direction) > 0:
+            S[0, 0] = -spacing[0]
+            S[0, 3] = (size[0] - 1) * spacing[0]
+
+        return V.dot(np.linalg.inv(S))
+
+    ##
+    # Gets an object providing the image information, i.e. the image itself
+    # or an image reader which only read the header of the image file
+    # \date       2026-10-19 00:47:22+0100
+    #
+    @staticmethod
+    def _get_image_information(image):
+        if isinstance(image, (sitk.Image, sitk.ImageFileReader)):
+            return image
+
+        reader = sitk.ImageFileReader()
+        reader.SetFileName(image)
+        reader.ReadImageInformation()
+        return reader
@@ -15,6 +15,9 @@ import skimage.measure
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
+import simplereg.data_reader as dr
+import simplereg.numpy_resampler as npr
+
 
 ##
 # Class to estimate landmarks from fiducial segmentations
@@ -86,10 +89,13 @@ class LandmarkEstimator(object):
 
     def run(self):
 
-        # convert image to data array
-        image_label_sitk = sitk.ReadImage(self._path_to_image_label)
-        image_label_nda = sitk.GetArrayFromImage(
-            image_label_sitk).astype(np.uint8)
+        # memory-mapped data array for uncompressed images. Transpose (view)
+        # to [z,] y, x order as sitk to keep the labelling order
+        image_label_nib = dr.DataReader.read_image(
+            self._path_to_image_label, as_nib=True)
+        image_label_nda = np.asanyarray(image_label_nib.dataobj).transpose()
+        if not np.issubdtype(image_label_nda.dtype, np.integer):
+            image_label_nda = image_label_nda.astype(np.uint8)
 
         # if binary mask separate into connected regions
         if image_label_nda.max() == 1:
@@ -98,30 +104,33 @@ class LandmarkEstimator(object):
             labels_nda = image_label_nda
 
         n_landmarks = labels_nda.max()
+        size, origin, spacing, direction = npr.get_grid_from_nib(
+            image_label_nib)
+        dim = len(size)
 
-        # get landmark coordinates in (continuous) voxel space
-        self._landmarks_voxel_space = np.zeros(
-            (n_landmarks, image_label_sitk.GetDimension()))
-        for i in range(n_landmarks):
-            points = np.array(np.where(labels_nda == i + 1))
+        # get landmark coordinates in (continuous) voxel space. Only the
+        # bounding box of each label is searched
+        self._landmarks_voxel_space = np.zeros((n_landmarks, dim))
+        regions = scipy.ndimage.find_objects(labels_nda, n_landmarks)
+        for i, region in enumerate(regions):
 
             # if label not found, set associated landmark coordinates to NaNs
-            if points.size == 0:
+            if region is None:
                 self._landmarks_voxel_space[i, :] = np.nan
 
             else:
-                self._landmarks_voxel_space[i, :] = np.mean(points, axis=1)
+                points = np.array(np.where(labels_nda[region] == i + 1))
+                start = np.array([sl.start for sl in region])
+                self._landmarks_voxel_space[i, :] = \
+                    np.mean(points, axis=1) + start
 
-        # sitk -> nda stores as z, y, x
+        # nda stores as [z,] y, x
         self._landmarks_voxel_space = self._landmarks_voxel_space[:, ::-1]
 
         # get landmark coordinates in image space
-        self._landmarks_image_space = np.zeros_like(
-            self._landmarks_voxel_space)
-        for i in range(n_landmarks):
-            self._landmarks_image_space[i, :] = \
-                image_label_sitk.TransformContinuousIndexToPhysicalPoint(
-                self._landmarks_voxel_space[i, :])
+        M = np.array(direction).reshape(dim, dim).dot(np.diag(spacing))
+        self._landmarks_image_space = \
+            self._landmarks_voxel_space.dot(M.transpose()) + origin
 
         if self._verbose:
             ph.print_info(
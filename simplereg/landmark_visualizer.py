@@ -26,8 +26,23 @@ IMPLEMENTED_MARKERS = ["dot", "cross", "sphere", "hollow_sphere"]
 #
 class LandmarkVisualizer(object):
 
-    def __init__(self, landmarks_nda, direction, origin, spacing, size):
+    ##
+    # Constructor
+    # \date       2026-10-18 21:48:05+0100
+    #
+    # \param      landmarks_nda  Landmarks as (N x dim) np.array
+    # \param      direction      Direction of image space
+    # \param      origin         Origin of image space
+    # \param      spacing        Spacing of image space
+    # \param      size           Size of image space
+    # \param      labels         Optional (positive integer) per-point labels as
+    #                            (N,) np.array. If None, landmark i is marked
+    #                            by label i+1
+    #
+    def __init__(self, landmarks_nda, direction, origin, spacing, size,
+                 labels=None):
         self._landmarks_nda = landmarks_nda
+        self._labels = labels
         self._direction = direction
         self._origin = origin
         self._spacing = np.array(spacing)
@@ -57,7 +72,13 @@ class LandmarkVisualizer(object):
                              "Allowed options are: %s" % ", ".join(
                                  IMPLEMENTED_MARKERS))
 
-        nda = np.zeros(self._size[::-1], dtype=np.uint8)
+        if self._labels is None:
+            labels = np.arange(1, self._landmarks_nda.shape[0] + 1)
+        else:
+            labels = np.asarray(self._labels).astype(int)
+        dtype = np.uint8 if labels.size == 0 else \
+            np.promote_types(np.uint8, np.min_scalar_type(labels.max()))
+        nda = np.zeros(self._size[::-1], dtype=dtype)
 
         foo = sitk.GetImageFromArray(nda)
         foo.SetSpacing(self._spacing)
@@ -72,14 +93,15 @@ class LandmarkVisualizer(object):
                 continue
 
             if marker == "dot":
-                nda[index] = i + 1
+                nda[index] = labels[i]
 
             else:
                 marker_ = self._get_marker[marker](
                     radius=radius,
                     spacing=self._spacing,
                 )
-                nda = self._apply_marker(nda, index, marker_, value=i + 1)
+                nda = self._apply_marker(
+                    nda, index, marker_, value=labels[i])
 
         self._landmark_image_sitk = sitk.GetImageFromArray(nda)
         self._landmark_image_sitk.SetSpacing(self._spacing)
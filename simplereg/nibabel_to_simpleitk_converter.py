@@ -14,6 +14,22 @@ import SimpleITK as sitk
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
+import simplereg.numpy_resampler as npr
+
+
+##
+# Array interface to the pixel buffer of a SimpleITK image. Arrays created
+# from it keep a reference to the image so that the buffer stays valid while
+# the array is in use.
+# \date       2026-10-18 23:02:44+0100
+#
+class _ImageBuffer(object):
+
+    def __init__(self, image_sitk):
+        self._image_sitk = image_sitk
+        self.__array_interface__ = \
+            sitk.GetArrayViewFromImage(image_sitk).__array_interface__
+
 
 ##
 # Class to convert between Nibabel and SimpleITK representations
@@ -21,6 +37,18 @@ import pysitk.simple_itk_helper as sitkh
 #
 class NibabelToSimpleItkConverter(object):
 
+    ##
+    # Convert a SimpleITK image into a nibabel image without copying the data.
+    # The (read-only) data array of the nibabel image is a view of the
+    # SimpleITK image buffer: reversing the [z,] y, x axes of the buffer gives
+    # the Fortran-ordered x, y [,z] layout of NIfTI.
+    # \date       2026-10-18 23:02:44+0100
+    #
+    # \param      image_sitk  Scalar or vector image as sitk.Image object
+    #
+    # \return     Image as nib.Nifti1Image object sharing the data buffer;
+    #             vector images are 5D with fourth dimension of length one
+    #
     @staticmethod
     def convert_sitk_to_nib_image(image_sitk):
 
@@ -33,19 +61,20 @@ class NibabelToSimpleItkConverter(object):
         R[0, 0] = -1
         R[1, 1] = -1
 
-        # Affine matrix for orientation
+        # Affine matrix for orientation and spacing
         A = np.eye(dim + 1)
-        A[0:dim, 0:dim] = R.dot(D)
+        A[0:dim, 0:dim] = R.dot(D).dot(np.diag(image_sitk.GetSpacing()))
         A[0:dim, -1] = R.dot(origin)
 
-        # Reshape [z,] y, x to x, y [,z]
-        nda = sitk.GetArrayFromImage(image_sitk)
-        nda = np.swapaxes(nda, axis1=0, axis2=dim - 1)
-
+        # View [z,] y, x [, components] as x, y [,z] [, 1, components]
+        nda = np.asarray(_ImageBuffer(image_sitk))
         n_components = image_sitk.GetNumberOfComponentsPerPixel()
         if n_components > 1:
-            shape = nda.shape
-            nda = nda.reshape(shape[0], shape[1], shape[2], 1, shape[3])
+            nda = nda.transpose(tuple(range(dim))[::-1] + (dim, ))
+            nda = nda.reshape(
+                nda.shape[0:dim] + (1, ) * (4 - dim) + nda.shape[-1:])
+        else:
+            nda = nda.transpose()
 
         spacing = np.ones(nda.ndim)
         spacing[0:dim] = image_sitk.GetSpacing()
@@ -59,3 +88,39 @@ class NibabelToSimpleItkConverter(object):
             image_nib.header["intent_code"] = 1007
 
         return image_nib
+
+    ##
+    # Convert a nibabel image into a SimpleITK image. Data of memory-mapped
+    # images is only read (and copied) at this point so that SimpleITK
+    # images are built only when a SimpleITK consumer requires one.
+    #
+    # As SimpleITK images own their buffer, the data is copied exactly once
+    # from a (transposed) view of the nibabel data array into the image
+    # buffer; no intermediate arrays are allocated.
+    # \date       2026-10-18 20:14:36+0100
+    #
+    # \param      image_nib  Scalar (2D/3D) or vector image (5D with fourth
+    #                        dimension of length one) as nib.Nifti1Image
+    #
+    # \return     Image as sitk.Image object
+    #
+    @staticmethod
+    def convert_nib_to_sitk_image(image_nib):
+        size, origin, spacing, direction = npr.get_grid_from_nib(image_nib)
+        dim = len(size)
+
+        # Reshape x, y [,z] [, 1, components] to [z,] y, x [, components]
+        nda = np.asanyarray(image_nib.dataobj)
+        is_vector = npr.is_vector_image_nib(image_nib)
+        if is_vector:
+            nda = nda.reshape(nda.shape[0:dim] + nda.shape[-1:])
+            nda = nda.transpose(tuple(range(dim))[::-1] + (dim, ))
+        else:
+            nda = nda.transpose()
+
+        image_sitk = sitk.GetImageFromArray(nda, isVector=is_vector)
+        image_sitk.SetOrigin(origin)
+        image_sitk.SetSpacing(spacing)
+        image_sitk.SetDirection(direction)
+
+        return image_sitk
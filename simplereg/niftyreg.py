@@ -7,6 +7,7 @@
 # Import libraries
 import os
 import numpy as np
+import nibabel as nib
 import SimpleITK as sitk
 from abc import ABCMeta, abstractmethod
 import nipype.interfaces.niftyreg
@@ -14,7 +15,8 @@ import nipype.interfaces.niftyreg
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
-from simplereg.definitions import DIR_TMP, OMP
+import simplereg.precision as prec
+from simplereg.definitions import OMP
 from simplereg.wrapper_registration import WrapperRegistration
 from simplereg.niftyreg_to_simpleitk_converter import \
     NiftyRegToSimpleItkConverter as nreg2sitk
@@ -33,6 +35,7 @@ class NiftyReg(WrapperRegistration):
                  omp,
                  subfolder,
                  verbose,
+                 precision=None,
                  ):
 
         WrapperRegistration.__init__(self,
@@ -44,41 +47,55 @@ class NiftyReg(WrapperRegistration):
                                      verbose=verbose,
                                      )
 
-        # Subfolder within DIR_TMP where results will be stored temporarily
-        self._dir_tmp = os.path.join(DIR_TMP, subfolder)
+        # Unique scratch directory within DIR_TMP (prefixed by subfolder)
+        # where results will be stored temporarily
+        self._dir_tmp = self._create_dir_tmp(subfolder)
 
-        self._fixed_str = os.path.join(self._dir_tmp, "fixed.nii.gz")
-        self._moving_str = os.path.join(self._dir_tmp, "moving.nii.gz")
-        self._warped_moving_str = os.path.join(
-            self._dir_tmp, "warped_moving.nii.gz")
+        # Paths to input images handed to the command line tool; set by
+        # _get_interface
+        self._fixed_str = None
+        self._moving_str = None
+        self._fixed_mask_str = None
+        self._moving_mask_str = None
 
-        self._fixed_mask_str = os.path.join(
-            self._dir_tmp, "fixed_mask.nii.gz")
-        self._moving_mask_str = os.path.join(
-            self._dir_tmp, "moving_mask.nii.gz")
+        # Intermediate images are exchanged uncompressed
+        self._warped_moving_str = os.path.join(
+            self._dir_tmp, "warped_moving.nii")
         self._warped_moving_mask_str = os.path.join(
-            self._dir_tmp, "warped_mask.nii.gz")
+            self._dir_tmp, "warped_mask.nii")
         self._transform_init_str = os.path.join(
             self._dir_tmp, "initial_transform.txt")
 
         self._transform_init = transform_init
         self._omp = omp
 
-    def _run(self):
+        # Floating point precision of warped moving image
+        self._precision = precision
+
+    ##
+    # Provide the input files for the command line tool
+    # \date       2026-10-19 01:58:12+0100
+    #
+    # \param      self  The object
+    #
+    def _prepare_inputs(self):
 
         # Create and delete all possibly existing files in the directory
         ph.create_directory(self._dir_tmp, delete_files=True)
 
-        sitkh.write_nifti_image_sitk(self._fixed_sitk, self._fixed_str)
-        sitkh.write_nifti_image_sitk(self._moving_sitk, self._moving_str)
+        # Files of images read from disk are passed through
+        self._fixed_str = self._get_path_to_image(
+            self._fixed_sitk, "fixed.nii")
+        self._moving_str = self._get_path_to_image(
+            self._moving_sitk, "moving.nii")
 
         if self._fixed_sitk_mask is not None:
-            sitkh.write_nifti_image_sitk(
-                self._fixed_sitk_mask, self._fixed_mask_str)
+            self._fixed_mask_str = self._get_path_to_image(
+                self._fixed_sitk_mask, "fixed_mask.nii")
 
         if self._moving_sitk_mask is not None:
-            sitkh.write_nifti_image_sitk(
-                self._moving_sitk_mask, self._moving_mask_str)
+            self._moving_mask_str = self._get_path_to_image(
+                self._moving_sitk_mask, "moving_mask.nii")
 
         if self._transform_init is not None:
             ph.write_array_to_file(
@@ -87,6 +104,13 @@ class NiftyReg(WrapperRegistration):
                 access_mode="a",
                 verbose=0)
 
+    def _get_cache_options(self):
+        options = super(NiftyReg, self)._get_cache_options()
+        options["transform_init"] = None if self._transform_init is None \
+            else np.asarray(self._transform_init).tolist()
+        options["precision"] = self._precision
+        return options
+
 
 class RegAladin(NiftyReg):
 
@@ -100,6 +124,8 @@ class RegAladin(NiftyReg):
                  subfolder="RegAladin",
                  omp=OMP,
                  verbose=False,
+                 precision=None,
+                 transform_only=False,
                  ):
 
         NiftyReg.__init__(self,
@@ -112,14 +138,20 @@ class RegAladin(NiftyReg):
                           subfolder=subfolder,
                           omp=omp,
                           verbose=verbose,
+                          precision=precision,
                           )
 
         self._registration_transform_str = os.path.join(
             self._dir_tmp, "registration_transform.txt")
 
-    def _run(self):
+        # Only estimate the transform; the warped moving image is resampled
+        # in-process if requested
+        self._transform_only = transform_only
+        self._warped_moving_sitk = None
 
-        super(RegAladin, self)._run()
+    def _get_interface(self):
+
+        self._prepare_inputs()
 
         nreg = nipype.interfaces.niftyreg.RegAladin()
         nreg.inputs.ref_file = self._fixed_str
@@ -138,14 +170,17 @@ class RegAladin(NiftyReg):
         if self._transform_init is not None:
             nreg.inputs.in_aff_file = self._transform_init_str
 
-        # Execute registration
-        if self._verbose:
-            ph.print_execution(nreg.cmdline)
-        nreg.run()
+        return nreg
 
-        # Read warped image
-        self._warped_moving_sitk = sitkh.read_nifti_image_sitk(
-            self._warped_moving_str, sitk.sitkFloat64)
+    def _read_results(self):
+
+        # Read warped image (reg_aladin writes it regardless)
+        if self._transform_only:
+            self._warped_moving_sitk = None
+        else:
+            self._warped_moving_sitk = sitkh.read_nifti_image_sitk(
+                self._warped_moving_str,
+                prec.get_pixel_type_sitk(self._precision))
 
         # Convert to sitk affine transform
         self._registration_transform_sitk = self._convert_to_sitk_transform()
@@ -168,6 +203,11 @@ class RegAladin(NiftyReg):
 
         return registration_transform_sitk
 
+    def _get_cache_options(self):
+        options = super(RegAladin, self)._get_cache_options()
+        options["transform_only"] = self._transform_only
+        return options
+
     def _get_transformed_fixed_sitk(self):
         return sitkh.get_transformed_sitk_image(
             self._fixed_sitk, self.get_registration_transform_sitk())
@@ -177,6 +217,9 @@ class RegAladin(NiftyReg):
             self._fixed_sitk_mask, self.get_registration_transform_sitk())
 
     def _get_warped_moving_sitk(self):
+        if self._warped_moving_sitk is None:
+            self._warped_moving_sitk = self._get_resampled_moving_sitk(
+                prec.get_pixel_type_sitk(self._precision))
         return self._warped_moving_sitk
 
     def _get_warped_moving_sitk_mask(self):
@@ -205,6 +248,7 @@ class RegF3D(NiftyReg):
                  subfolder="RegF3D",
                  omp=OMP,
                  verbose=False,
+                 precision=None,
                  ):
 
         NiftyReg.__init__(self,
@@ -217,14 +261,21 @@ class RegF3D(NiftyReg):
                           subfolder=subfolder,
                           omp=omp,
                           verbose=verbose,
+                          precision=precision,
                           )
 
         self._registration_control_point_grid_str = os.path.join(
-            self._dir_tmp, "registration_cpp.nii.gz")
+            self._dir_tmp, "registration_cpp.nii")
+
+        # Control point grid (nib.Nifti1Image) and the displacement field
+        # transform it is evaluated to once warps are requested
+        self._registration_control_point_grid_nib = None
+        self._displacement_field_transform_sitk = None
+        self._warped_moving_sitk = None
 
-    def _run(self):
+    def _get_interface(self):
 
-        super(RegF3D, self)._run()
+        self._prepare_inputs()
 
         nreg = nipype.interfaces.niftyreg.RegF3D()
         nreg.inputs.ref_file = self._fixed_str
@@ -243,19 +294,112 @@ class RegF3D(NiftyReg):
         if self._transform_init is not None:
             nreg.inputs.aff_file = self._transform_init_str
 
-        # Execute registration
-        if self._verbose:
-            ph.print_execution(nreg.cmdline)
-        nreg.run()
+        return nreg
+
+    def _read_results(self):
 
         # Read warped image
-        self._warped_moving_sitk = sitkh.read_nifti_image_sitk(
-            self._warped_moving_str)
+        self._warped_moving_sitk = prec.get_limited_image_sitk(
+            sitkh.read_nifti_image_sitk(self._warped_moving_str),
+            self._precision)
 
         # Has not been used. Thus, not tested!
         self._registration_transform_sitk = sitkh.read_nifti_image_sitk(
             self._registration_control_point_grid_str)
 
+        # Keep control point grid in memory for in-process warps
+        cpp_nib = nib.load(self._registration_control_point_grid_str)
+        self._registration_control_point_grid_nib = nib.Nifti1Image(
+            np.asanyarray(cpp_nib.dataobj), cpp_nib.affine, cpp_nib.header)
+        self._displacement_field_transform_sitk = None
+
+    ##
+    # Gets the obtained cubic B-spline control point grid as written by
+    # reg_f3d, i.e. including its NIfTI header (intent_p1 = 5)
+    # \date       2026-10-19 11:20:05+0100
+    #
+    # \param      self  The object
+    #
+    # \return     The control point grid as nib.Nifti1Image object
+    #
+    def get_registration_control_point_grid_nib(self):
+        if self._registration_control_point_grid_nib is None:
+            raise UnboundLocalError("Execute 'run' first.")
+
+        return self._registration_control_point_grid_nib
+
+    ##
+    # Gets the obtained deformation as displacement field transform on the
+    # fixed image grid. The control point grid is evaluated once and the
+    # transform is cached.
+    # \date       2026-10-19 01:05:16+0100
+    #
+    # \param      self  The object
+    #
+    # \return     The displacement field transform as
+    #             sitk.DisplacementFieldTransform object
+    #
+    def get_displacement_field_transform_sitk(self):
+        if self._registration_control_point_grid_nib is None:
+            raise UnboundLocalError("Execute 'run' first.")
+
+        if self._displacement_field_transform_sitk is None:
+            displacement_sitk = \
+                nreg2sitk.convert_regf3d_cpp_to_sitk_displacement(
+                    self._registration_control_point_grid_nib,
+                    self._fixed_sitk,
+                    n_threads=self._omp)
+            self._displacement_field_transform_sitk = \
+                sitk.DisplacementFieldTransform(displacement_sitk)
+
+        return self._displacement_field_transform_sitk
+
+    ##
+    # Write the control point grid, and optionally the warped moving image,
+    # into a cache entry directory. The grid is kept as NIfTI file to
+    # preserve its header.
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self          The object
+    # \param      directory     Directory of cache entry
+    # \param      cache_warped  Also write the warped moving image; bool
+    #
+    def _write_cache_results(self, directory, cache_warped):
+        if self._registration_control_point_grid_nib is None:
+            raise UnboundLocalError("Execute 'run' first.")
+        nib.save(self._registration_control_point_grid_nib,
+                 os.path.join(directory, "registration_cpp.nii"))
+        if cache_warped:
+            sitk.WriteImage(
+                self.get_warped_moving_sitk(),
+                os.path.join(directory, "warped_moving.nii"))
+
+    ##
+    # Read the control point grid and, if cached, the warped moving image
+    # from a cache entry directory
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self       The object
+    # \param      directory  Directory of cache entry
+    #
+    def _read_cache_results(self, directory):
+        path_to_cpp = os.path.join(directory, "registration_cpp.nii")
+        if not os.path.isfile(path_to_cpp):
+            raise IOError("Control point grid '%s' not found" % path_to_cpp)
+
+        cpp_nib = nib.load(path_to_cpp)
+        self._registration_control_point_grid_nib = nib.Nifti1Image(
+            np.asanyarray(cpp_nib.dataobj), cpp_nib.affine, cpp_nib.header)
+        self._registration_transform_sitk = sitkh.read_nifti_image_sitk(
+            path_to_cpp)
+        self._displacement_field_transform_sitk = None
+
+        path_to_warped_moving = os.path.join(directory, "warped_moving.nii")
+        if os.path.isfile(path_to_warped_moving):
+            self._warped_moving_sitk = sitk.ReadImage(path_to_warped_moving)
+        else:
+            self._warped_moving_sitk = None
+
     def _get_transformed_fixed_sitk(self):
         raise UnboundLocalError("Not implemented for RegF3D")
         # registration_transform_inv_sitk = self._get_inverted_transform(
@@ -266,6 +410,13 @@ class RegF3D(NiftyReg):
         raise UnboundLocalError("Not implemented for RegF3D")
 
     def _get_warped_moving_sitk(self):
+        if self._warped_moving_sitk is None:
+            self._warped_moving_sitk = prec.get_limited_image_sitk(
+                self.get_deformed_image_sitk(
+                    fixed_sitk=self._fixed_sitk,
+                    moving_sitk=self._moving_sitk,
+                    interpolation_order=1),
+                self._precision)
         return self._warped_moving_sitk
 
     def _get_warped_moving_sitk_mask(self):
@@ -279,47 +430,77 @@ class RegF3D(NiftyReg):
 
     ##
     # Gets the deformed image given the obtained deformable registration
-    # transform.
+    # transform. The image is resampled in-process using the displacement
+    # field transform, i.e. the cached one on the fixed image grid or one
+    # evaluated on the grid of fixed_sitk if it differs.
     # \date       2017-08-09 16:57:39+0100
     #
     # \param      self                 The object
-    # \param      fixed_sitk           Fixed image as sitk.Image
-    # \param      moving_sitk          Moving image as sitk.Image
-    # \param      interpolation_order  Interpolation order, integer
+    # \param      fixed_sitk           Fixed image as sitk.Image; its grid
+    #                                  must lie within the support of the
+    #                                  control point grid
+    # \param      moving_sitk          Moving image as sitk.Image; vector
+    #                                  images are resampled per channel
+    # \param      interpolation_order  Interpolation order, integer (0:
+    #                                  nearest neighbour, 1: linear, 3: cubic
+    #                                  B-spline)
     #
     # \return     The deformed image sitk.
     #
     def get_deformed_image_sitk(self, fixed_sitk, moving_sitk,
                                 interpolation_order):
 
-        # REMARK:
-        # Not possible to write registration transform that way since
-        # some header information gets lost! Therefore, read again the one
-        # which was the output of NiftyReg (and hope that file is not been
-        # deleted)
-        # Create and delete all possibly existing files in the directory
-        # ph.create_directory(self._dir_tmp, delete_files=True)
-        # sitkh.write_nifti_image_sitk(self.get_registration_transform_sitk(),
-        #                 self._registration_control_point_grid_str)
-
-        sitkh.write_nifti_image_sitk(fixed_sitk, self._fixed_str)
-        sitkh.write_nifti_image_sitk(moving_sitk, self._moving_str)
-
-        nreg = nipype.interfaces.niftyreg.RegResample()
-        nreg.inputs.ref_file = self._fixed_str
-        nreg.inputs.flo_file = self._moving_str
-        nreg.inputs.trans_file = self._registration_control_point_grid_str
-        nreg.inputs.out_file = self._warped_moving_str
-        nreg.inputs.omp_core_val = self._omp
-        nreg.inputs.args = "-inter " + str(interpolation_order)
-
-        # Execute registration
-        if self._verbose:
-            ph.print_execution(nreg.cmdline)
-        nreg.run()
+        interpolators = {
+            0: sitk.sitkNearestNeighbor,
+            1: sitk.sitkLinear,
+            3: sitk.sitkBSpline,
+        }
+        if interpolation_order not in interpolators:
+            raise ValueError(
+                "Interpolation order must be one of %s" % ", ".join(
+                    str(o) for o in sorted(interpolators)))
+
+        if self._is_fixed_grid(fixed_sitk):
+            transform_sitk = self.get_displacement_field_transform_sitk()
+        else:
+            if self._registration_control_point_grid_nib is None:
+                raise UnboundLocalError("Execute 'run' first.")
+            transform_sitk = sitk.DisplacementFieldTransform(
+                nreg2sitk.convert_regf3d_cpp_to_sitk_displacement(
+                    self._registration_control_point_grid_nib,
+                    fixed_sitk,
+                    n_threads=self._omp))
+
+        return sitk.Resample(
+            moving_sitk,
+            fixed_sitk,
+            transform_sitk,
+            interpolators[interpolation_order],
+            0.,
+            moving_sitk.GetPixelIDValue(),
+        )
 
-        return sitkh.read_nifti_image_sitk(self._warped_moving_str,
-                                           moving_sitk.GetPixelIDValue())
+    ##
+    # Query whether an image is defined on the grid of the fixed image, i.e.
+    # the grid of the cached displacement field
+    # \date       2026-10-19 10:31:06+0100
+    #
+    # \param      self        The object
+    # \param      image_sitk  Image as sitk.Image
+    # \param      tolerance   Tolerance for origin, spacing and direction
+    #
+    # \return     True if grids match, False otherwise
+    #
+    def _is_fixed_grid(self, image_sitk, tolerance=1e-6):
+        if image_sitk is self._fixed_sitk:
+            return True
+        if image_sitk.GetSize() != self._fixed_sitk.GetSize():
+            return False
+        return all(np.allclose(a, b, rtol=0, atol=tolerance) for a, b in [
+            (image_sitk.GetOrigin(), self._fixed_sitk.GetOrigin()),
+            (image_sitk.GetSpacing(), self._fixed_sitk.GetSpacing()),
+            (image_sitk.GetDirection(), self._fixed_sitk.GetDirection()),
+        ])
 
     # def _get_inverted_transform(self,
     #                             input_def_field_sitk,
@@ -8,6 +8,7 @@
 import os
 import sys
 import numpy as np
+import concurrent.futures
 import nibabel as nib
 import SimpleITK as sitk
 
@@ -127,9 +128,8 @@ class NiftyRegToSimpleItkConverter(object):
     @staticmethod
     def convert_regf3d_to_sitk_displacement(displacement_nreg_nib):
 
-        # Account for x maps_to -x and y maps_to -y in ITK
-        nda = displacement_nreg_nib.get_data()
-        nda[..., 0:2] *= -1
+        nda = NiftyRegToSimpleItkConverter._get_swapped_displacement_nda(
+            displacement_nreg_nib)
 
         displacement_sitk_nib = nib.Nifti1Image(
             nda, displacement_nreg_nib.affine, displacement_nreg_nib.header)
@@ -153,9 +153,8 @@ class NiftyRegToSimpleItkConverter(object):
     @staticmethod
     def convert_sitk_to_regf3d_displacement(displacement_sitk_nib):
 
-        # Account for x maps_to -x and y maps_to -y in ITK
-        nda = displacement_sitk_nib.get_data()
-        nda[..., 0:2] *= -1
+        nda = NiftyRegToSimpleItkConverter._get_swapped_displacement_nda(
+            displacement_sitk_nib)
 
         displacement_nreg_nib = nib.Nifti1Image(
             nda, displacement_sitk_nib.affine, displacement_sitk_nib.header)
@@ -166,3 +165,160 @@ class NiftyRegToSimpleItkConverter(object):
         displacement_nreg_nib.header['intent_p3'] = 0
 
         return displacement_nreg_nib
+
+    ##
+    # Convert a RegF3D cubic B-spline control point grid to a dense
+    # (Simple)ITK displacement field on the grid of the fixed image.
+    #
+    # The control point grid holds the (RAS) positions of the control points
+    # and has to be aligned with the axes of the fixed image, as written by
+    # reg_f3d. The cubic B-spline is evaluated as tensor product along the
+    # image axes, slab by slab across a thread pool.
+    # \date       2026-10-19 01:05:16+0100
+    #
+    # \param      cpp_nib     Control point grid as nib.Nifti1Image object
+    #                         (intent_p1 = 5)
+    # \param      fixed_sitk  Fixed image (reference of reg_f3d) as sitk.Image
+    # \param      n_threads   Number of threads; int. If None, the global
+    #                         default number of threads of SimpleITK is used
+    #
+    # \return     Displacement field as sitk.Image (sitkVectorFloat64)
+    #
+    @staticmethod
+    def convert_regf3d_cpp_to_sitk_displacement(
+            cpp_nib, fixed_sitk, n_threads=None):
+
+        if int(cpp_nib.header['intent_p1']) != 5:
+            raise IOError("Provided image must represent a NiftyReg cubic "
+                          "B-spline control point grid (intent_p1 = 5)")
+
+        dim = fixed_sitk.GetDimension()
+        if n_threads is None:
+            n_threads = sitk.ProcessObject.GetGlobalDefaultNumberOfThreads()
+
+        # Control point positions as (z, y, x, component) array
+        cpp_nda = np.asanyarray(cpp_nib.dataobj)
+        cpp_nda = cpp_nda.reshape(
+            cpp_nda.shape[0:3] + (cpp_nda.shape[-1],))[..., 0:dim]
+        cpp_nda = cpp_nda.transpose(2, 1, 0, 3).astype(np.float64)
+
+        # Voxel to physical (LPS) coordinates of fixed image
+        size = np.ones(3, dtype=int)
+        A_fixed = np.eye(4)
+        size[0:dim] = fixed_sitk.GetSize()
+        A_fixed[0:dim, 0:dim] = np.array(
+            fixed_sitk.GetDirection()).reshape(dim, dim).dot(
+            np.diag(fixed_sitk.GetSpacing()))
+        A_fixed[0:dim, 3] = fixed_sitk.GetOrigin()
+
+        # Fixed voxel to control point grid coordinates (NIfTI uses RAS)
+        L = np.diag([-1., -1., 1., 1.])
+        M = np.linalg.inv(cpp_nib.affine).dot(L).dot(A_fixed)
+        if np.abs(M[0:dim, 0:dim] - np.diag(np.diag(M)[0:dim])).max() > 1e-6:
+            raise ValueError("Control point grid must be aligned with the "
+                             "axes of the fixed image")
+
+        # B-spline weights per axis as dense (size x number of control
+        # points) matrices holding four non-zero weights per row
+        W = [NiftyRegToSimpleItkConverter._get_cubic_bspline_weights(
+            size[i], M[i, i], M[i, 3], cpp_nda.shape[2 - i])
+            for i in range(dim)]
+        if dim == 2:
+            W.append(np.ones((1, 1)))
+
+        displacement_nda = np.empty(
+            (size[2], size[1], size[0], dim), dtype=np.float64)
+
+        # Physical points of fixed image voxels along each axis
+        points = [np.arange(size[i])[:, np.newaxis] * A_fixed[0:dim, i]
+                  for i in range(3)]
+        points[0] = points[0] + A_fixed[0:dim, 3]
+
+        def evaluate_slab(z):
+            # Positions phi(x) = sum_k Bz_k sum_j By_j sum_i Bx_i C_kji
+            phi = np.tensordot(W[2][z], cpp_nda, axes=(1, 0))
+            phi = np.matmul(W[1], phi.reshape(len(z), phi.shape[1], -1))
+            phi = np.matmul(W[0], phi.reshape(
+                len(z), size[1], cpp_nda.shape[2], dim))
+
+            # Displacement in (Simple)ITK convention, i.e. in LPS
+            phi[..., 0:2] *= -1
+            phi -= points[2][z][:, np.newaxis, np.newaxis]
+            phi -= points[1][np.newaxis, :, np.newaxis]
+            phi -= points[0][np.newaxis, np.newaxis]
+            displacement_nda[z] = phi
+
+        slabs = np.array_split(
+            np.arange(size[2]), min(size[2], 4 * max(1, n_threads)))
+        with concurrent.futures.ThreadPoolExecutor(
+                max(1, n_threads)) as executor:
+            list(executor.map(evaluate_slab, slabs))
+
+        displacement_sitk = sitk.GetImageFromArray(
+            displacement_nda.reshape(
+                displacement_nda.shape[3 - dim:]), isVector=True)
+        displacement_sitk.CopyInformation(fixed_sitk)
+
+        return displacement_sitk
+
+    ##
+    # Gets the cubic B-spline weights of grid points along one axis. Image
+    # voxels have to lie within the support of the control point grid, i.e.
+    # all control points with non-zero weight must exist.
+    # \date       2026-10-19 01:05:16+0100
+    #
+    # \param      n          Number of image voxels along axis
+    # \param      scale      Grid coordinate increment per voxel
+    # \param      offset     Grid coordinate of first voxel
+    # \param      n_grid     Number of control points along axis
+    # \param      tolerance  Weights of missing control points up to this
+    #                        value are ignored (rounding errors)
+    #
+    # \return     Weights as (n x n_grid) np.array
+    #
+    @staticmethod
+    def _get_cubic_bspline_weights(n, scale, offset, n_grid, tolerance=1e-8):
+        coordinates = scale * np.arange(n) + offset
+        first = np.floor(coordinates).astype(int) - 1
+        u = coordinates - np.floor(coordinates)
+
+        basis = np.stack([
+            (1 - u)**3 / 6.,
+            (3 * u**3 - 6 * u**2 + 4) / 6.,
+            (-3 * u**3 + 3 * u**2 + 3 * u + 1) / 6.,
+            u**3 / 6.,
+        ], axis=1)
+
+        weights = np.zeros((n, n_grid))
+        for a in range(4):
+            index = first + a
+            inside = (index >= 0) & (index < n_grid)
+            if np.any(basis[~inside, a] > tolerance):
+                raise ValueError(
+                    "Image grid exceeds the support of the control point "
+                    "grid")
+            weights[np.arange(n)[inside], index[inside]] = basis[inside, a]
+        return weights
+
+    ##
+    # Gets the data array of a displacement field with swapped x and y
+    # components to account for x maps_to -x and y maps_to -y in ITK.
+    #
+    # Data freshly read from a (compressed) file is swapped in place; data
+    # shared with other objects (in-memory arrays, memory-mapped files) is
+    # copied once.
+    # \date       2026-10-18 23:02:44+0100
+    #
+    # \param      displacement_nib  Displacement field as nib.Nifti1Image
+    #
+    # \return     Data array with swapped x and y components
+    #
+    @staticmethod
+    def _get_swapped_displacement_nda(displacement_nib):
+        dataobj = displacement_nib.dataobj
+        nda = np.asanyarray(dataobj)
+        if not nib.is_proxy(dataobj) or isinstance(nda, np.memmap) or \
+                not nda.flags.writeable:
+            nda = np.array(nda)
+        nda[..., 0:2] *= -1
+        return nda
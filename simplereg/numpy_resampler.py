@@ -0,0 +1,1256 @@
+##
+# \file numpy_resampler.py
+# \brief      Class to perform resampling operations based on NumPy/SciPy
+#
+# Images are read as (memory-mapped) nibabel objects and resampled chunk-wise
+# using scipy.ndimage. Neither WrapITK nor pysitk.simple_itk_helper (which
+# imports itk) are required so that resampling can be performed in worker
+# processes that cannot import itk.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+
+import os
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import numpy as np
+import nibabel as nib
+import scipy.ndimage
+import scipy.sparse
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+
+import simplereg.precision as prec
+from simplereg.definitions import ALLOWED_IMAGES
+from simplereg.definitions import ALLOWED_INTERPOLATORS
+from simplereg.definitions import ALLOWED_TRANSFORMS_DISPLACEMENTS
+
+# Spline orders used by scipy.ndimage for the supported interpolators
+INTERPOLATION_ORDERS = {
+    "NearestNeighbor": 0,
+    "Linear": 1,
+    "BSpline": 3,
+}
+
+
+##
+# Class to resample images using NumPy/SciPy
+# \date       2026-10-18 12:10:03+0100
+#
+class NumpyResampler(object):
+
+    ##
+    # Store resampling information. Arguments have the same meaning as for
+    # simplereg.resampler.Resampler
+    # \date       2026-10-18 12:10:03+0100
+    #
+    # \param      path_to_fixed      Path to fixed image defining the
+    #                                resampling space
+    # \param      path_to_moving     Path to moving image. Uncompressed NIfTI
+    #                                images are memory-mapped
+    # \param      path_to_transform  Path to transform or displacement field
+    # \param      interpolator       Interpolator
+    # \param      spacing            Spacing for resampling grid
+    # \param      padding            Padding value
+    # \param      add_to_grid        Grid extension/reduction in mm
+    # \param      path_to_mask       Path to mask defining the region of
+    #                                interest (ROI). Only voxels within its
+    #                                bounding box are resampled and voxels
+    #                                outside the mask are set to padding
+    # \param      crop               If True, the output grid is cropped to
+    #                                the bounding box of the ROI. Otherwise,
+    #                                the full grid is kept
+    # \param      n_threads          Number of threads; int. If None, the
+    #                                number of CPUs is used
+    # \param      voxels_per_chunk   Approximate number of output voxels
+    #                                processed per thread and chunk; int
+    # \param      precision          Floating point precision; either
+    #                                "float32", "float64" or None (package-wide
+    #                                default PRECISION)
+    # \param      verbose            Turn on/off verbose output
+    #
+    def __init__(self,
+                 path_to_fixed,
+                 path_to_moving,
+                 path_to_transform,
+                 interpolator="Linear",
+                 spacing=None,
+                 padding=0,
+                 add_to_grid=0,
+                 path_to_mask=None,
+                 crop=False,
+                 n_threads=None,
+                 voxels_per_chunk=2**18,
+                 precision=None,
+                 verbose=0,
+                 ):
+
+        self._path_to_fixed = path_to_fixed
+        self._path_to_moving = path_to_moving
+        self._path_to_transform = path_to_transform
+        self._interpolator = interpolator
+        self._spacing = spacing
+        self._padding = padding
+        self._add_to_grid = add_to_grid
+        self._path_to_mask = path_to_mask
+        self._crop = crop
+        self._n_threads = n_threads
+        self._voxels_per_chunk = voxels_per_chunk
+        self._precision = precision
+        self._verbose = verbose
+
+        self._warped_moving_nib = None
+
+    def get_warped_moving_nib(self):
+        if self._warped_moving_nib is None:
+            raise UnboundLocalError("Execute 'run' first.")
+        return self._warped_moving_nib
+
+    def write_image(self, path_to_output):
+        extension = ph.strip_filename_extension(path_to_output)[1]
+        if extension not in ALLOWED_IMAGES:
+            raise IOError("Image file extension must be of type %s " %
+                          ", or ".join(ALLOWED_IMAGES))
+        ph.create_directory(os.path.dirname(path_to_output))
+        nib.save(self.get_warped_moving_nib(), path_to_output)
+        if self._verbose:
+            ph.print_info("Image written to '%s'" % path_to_output)
+
+    def run(self):
+        fixed_nib = read_image_nib(self._path_to_fixed)
+        moving_nib = read_image_nib(self._path_to_moving)
+
+        # get image resampling information
+        size, origin, spacing, direction = get_space_resampling_properties(
+            *get_grid_from_nib(fixed_nib),
+            spacing=self._spacing,
+            add_to_grid=self._add_to_grid,
+            add_to_grid_unit="mm")
+
+        # Restrict resampling to bounding box of ROI
+        if self._path_to_mask is not None:
+            mask_nib = read_image_nib(self._path_to_mask)
+            mask_nda = resample_nda(
+                nda=np.asanyarray(mask_nib.dataobj),
+                grid=get_grid_from_nib(mask_nib),
+                size=size,
+                origin=origin,
+                spacing=spacing,
+                direction=direction,
+                order=0,
+                n_threads=self._n_threads,
+            ) != 0
+            roi = get_roi_nda(mask_nda)
+            mask_nda = mask_nda[roi]
+            size_full, origin_full = size, origin
+            size, origin = get_roi_grid(roi, origin, spacing, direction)
+
+        if self._path_to_transform is not None:
+            transform_sitk = read_transform_sitk(self._path_to_transform)
+        else:
+            transform_sitk = None
+
+        grid_moving = get_grid_from_nib(moving_nib)
+        labels = self._interpolator == "LabelLinear"
+        if self._interpolator == "OrientedGaussian":
+            if transform_sitk is not None:
+                # This could be implemented for rigid transformations.
+                # For affine, or even displacement fields, it is not quite
+                # clear how a PSF-transformed option shall look like.
+                raise ValueError(
+                    "OrientedGaussian interpolation does not allow a "
+                    "transformation during resampling.")
+            order = None
+            cov = get_oriented_psf_covariance(
+                direction, grid_moving[3], spacing)
+        elif labels:
+            order = None
+            cov = None
+        else:
+            order = convert_interpolator_order(self._interpolator)
+            cov = None
+
+        # Vector images and segmentations keep their data type
+        if is_vector_image_nib(moving_nib) or labels:
+            dtype = get_dtype_nib(moving_nib, self._precision)
+        else:
+            dtype = get_dtype_nib(fixed_nib, self._precision)
+
+        nda = resample_nda(
+            nda=np.asanyarray(moving_nib.dataobj),
+            grid=grid_moving,
+            size=size,
+            origin=origin,
+            spacing=spacing,
+            direction=direction,
+            transform_sitk=transform_sitk,
+            order=order,
+            cov=cov,
+            labels=labels,
+            padding=self._padding,
+            dtype=dtype,
+            n_threads=self._n_threads,
+            voxels_per_chunk=self._voxels_per_chunk,
+            precision=self._precision,
+        )
+
+        if self._path_to_mask is not None:
+            padding = cast_nda(np.array(self._padding), nda.dtype)
+            nda[~mask_nda] = padding
+            if not self._crop:
+                nda_roi = nda
+                nda = np.full(
+                    tuple(size_full) + nda.shape[len(size):], padding,
+                    dtype=nda.dtype)
+                nda[roi] = nda_roi
+                size, origin = size_full, origin_full
+
+        self._warped_moving_nib = get_nib_from_nda(
+            nda, origin, spacing, direction, header=moving_nib.header)
+
+
+##
+# Convert interpolator (or order as string) into interpolator name as
+# listed in ALLOWED_INTERPOLATORS. Shared by the sitk and numpy backends of
+# simplereg.resampler.Resampler.
+# \date       2026-10-19 11:20:05+0100
+#
+# \param      interpolator  Interpolator name (or order as string)
+#
+# \return     Interpolator name as string
+#
+def get_interpolator_name(interpolator):
+    if interpolator.isdigit():
+        if int(interpolator) == 0:
+            interpolator = "NearestNeighbor"
+        elif int(interpolator) == 1:
+            interpolator = "Linear"
+        else:
+            raise ValueError(
+                "Interpolator order not known. Allowed options are: 0, 1")
+    if interpolator not in ALLOWED_INTERPOLATORS:
+        raise ValueError(
+            "Interpolator not known. Allowed options are: %s" % (
+                ", ".join(ALLOWED_INTERPOLATORS)))
+
+    return interpolator
+
+
+##
+# Convert interpolator into spline order used by scipy.ndimage
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      interpolator  Interpolator name (or order as string)
+#
+# \return     Spline order as int
+#
+def convert_interpolator_order(interpolator):
+    interpolator = get_interpolator_name(interpolator)
+    if interpolator not in INTERPOLATION_ORDERS:
+        raise ValueError(
+            "Interpolator '%s' is not supported by NumpyResampler. "
+            "Allowed options are: %s" % (
+                interpolator, ", ".join(sorted(INTERPOLATION_ORDERS))))
+
+    return INTERPOLATION_ORDERS[interpolator]
+
+
+##
+# Reads an image as nibabel object. Uncompressed NIfTI images are
+# memory-mapped.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      path_to_file  The path to file
+#
+# \return     Image as nib.Nifti1Image object
+#
+def read_image_nib(path_to_file):
+    if not ph.file_exists(path_to_file):
+        raise IOError("Image file '%s' not found" % path_to_file)
+
+    extension = ph.strip_filename_extension(path_to_file)[1]
+    if extension not in ALLOWED_IMAGES:
+        raise IOError("Image file extension must be of type %s " %
+                      ", or ".join(ALLOWED_IMAGES))
+
+    return nib.load(path_to_file, mmap=True)
+
+
+##
+# Reads a transform as sitk.Transform object. Displacement fields are
+# converted into sitk.DisplacementFieldTransform objects.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      path_to_file  The path to file
+#
+# \return     Transform as sitk.Transform object
+#
+def read_transform_sitk(path_to_file):
+    if not ph.file_exists(path_to_file):
+        raise IOError("Transform file '%s' not found" % path_to_file)
+
+    extension = ph.strip_filename_extension(path_to_file)[1]
+    if extension in ALLOWED_TRANSFORMS_DISPLACEMENTS:
+        displacement_sitk = sitk.ReadImage(
+            path_to_file, sitk.sitkVectorFloat64)
+        return sitk.DisplacementFieldTransform(displacement_sitk)
+
+    return sitk.ReadTransform(path_to_file)
+
+
+##
+# Query whether the nibabel image represents a vector image
+# \date       2026-10-18 12:10:03+0100
+#
+def is_vector_image_nib(image_nib):
+    shape = image_nib.header.get_data_shape()
+    return len(shape) == 5 and shape[3] == 1
+
+
+##
+# Gets the data type of the data array as read by (Simple)ITK, i.e. scaled
+# images are read as floating point arrays. Floating point data types are
+# limited to the given precision.
+# \date       2026-10-18 12:10:03+0100
+#
+def get_dtype_nib(image_nib, precision=None):
+    slope, inter = image_nib.header.get_slope_inter()
+    if slope not in [None, 1] or inter not in [None, 0]:
+        return prec.get_dtype(precision)
+    return prec.get_limited_dtype(image_nib.get_data_dtype(), precision)
+
+
+##
+# Gets the image grid of a nibabel image in (Simple)ITK convention.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      image_nib  Image as nib.Nifti1Image object
+#
+# \return     size, origin, spacing and direction (flattened) as np.arrays
+#
+def get_grid_from_nib(image_nib):
+    shape = image_nib.header.get_data_shape()
+    dim = min(len(shape), 3)
+
+    # Account for x maps_to -x and y maps_to -y in ITK
+    R = np.eye(4)
+    R[0, 0] = -1
+    R[1, 1] = -1
+    affine = R.dot(image_nib.affine)
+
+    M = affine[0:dim, 0:dim]
+    spacing = np.linalg.norm(M, axis=0)
+    direction = M / spacing
+    origin = affine[0:dim, 3]
+    size = np.array(shape[0:dim]).astype(int)
+
+    return size, origin, spacing, direction.flatten()
+
+
+##
+# Create nibabel image from a data array given in (Simple)ITK index order,
+# i.e. x, y [, z] [, components], and a grid in (Simple)ITK convention.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      nda        The data array
+# \param      origin     Origin of the grid
+# \param      spacing    Spacing of the grid
+# \param      direction  Direction of the grid (flattened)
+# \param      header     Header used to keep time/vector information; optional
+#
+# \return     Image as nib.Nifti1Image object
+#
+def get_nib_from_nda(nda, origin, spacing, direction, header=None):
+    dim = len(origin)
+
+    # Account for x maps_to -x and y maps_to -y in ITK
+    R = np.eye(3)
+    R[0, 0] = -1
+    R[1, 1] = -1
+    M = np.eye(3)
+    M[0:dim, 0:dim] = np.array(direction).reshape(dim, dim).dot(
+        np.diag(spacing))
+    t = np.zeros(3)
+    t[0:dim] = origin
+
+    affine = np.eye(4)
+    affine[0:3, 0:3] = R.dot(M)
+    affine[0:3, 3] = R.dot(t)
+
+    image_nib = nib.Nifti1Image(nda, affine)
+    image_nib.set_qform(affine, code=1)
+    image_nib.set_sform(affine, code=1)
+
+    if header is not None:
+        shape = header.get_data_shape()
+        zooms = list(image_nib.header.get_zooms())
+        for i in range(dim, min(len(shape), len(zooms))):
+            zooms[i] = header.get_zooms()[i]
+        image_nib.header.set_zooms(zooms)
+        image_nib.header.set_xyzt_units(*header.get_xyzt_units())
+        image_nib.header["intent_code"] = header["intent_code"]
+
+    return image_nib
+
+
+##
+# Gets the space resampling properties given a grid and optional
+# spacing/grid adjustment desires. Also used by
+# simplereg.resampler.Resampler.get_space_resampling_properties.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      size              Size of input grid
+# \param      origin            Origin of input grid
+# \param      spacing_in        Spacing of input grid
+# \param      direction         Direction of input grid (flattened)
+# \param      spacing           Spacing for resampling space. If scalar,
+#                               isotropic resampling grid is assumed
+# \param      add_to_grid       Additional grid extension/reduction in each
+#                               direction of each axis. If scalar, changes
+#                               are applied uniformly to grid
+# \param      add_to_grid_unit  Changes to grid size to be understood in
+#                               either millimeter ("mm") or voxel units
+#
+# \return     The space resampling properties: size_out, origin_out,
+#             spacing_out, direction_out
+#
+def get_space_resampling_properties(
+    size,
+    origin,
+    spacing_in,
+    direction,
+    spacing=None,
+    add_to_grid=None,
+    add_to_grid_unit="mm",
+):
+    size_in = np.array(size).astype(int)
+    spacing_in = np.array(spacing_in).astype(np.float64)
+    origin_out = np.array(origin).astype(np.float64)
+    direction_out = np.array(direction).astype(np.float64)
+    dim = len(origin_out)
+
+    # Check given spacing information for grid resampling
+    if spacing is not None:
+        spacing_out = np.atleast_1d(spacing).astype(np.float64)
+        if spacing_out.size != 1 and spacing_out.size != dim:
+            raise IOError(
+                "spacing information for resampling must either match the "
+                "image dimension or is 1D (isotropic resampling)")
+        if spacing_out.size == 1:
+            spacing_out = np.ones(dim) * spacing_out[0]
+    else:
+        spacing_out = spacing_in
+
+    # Check given (optional) add_to_grid information
+    if add_to_grid is not None:
+        add_to_grid = np.atleast_1d(add_to_grid)
+        if add_to_grid.size != 1 and add_to_grid.size != dim:
+            raise IOError(
+                "add_to_grid must either match the image "
+                "dimension or is 1D (uniform change)")
+        if add_to_grid.size == 1:
+            add_to_grid = np.ones(dim) * add_to_grid[0]
+
+        # Get scaling for offset and grid change in (continuous) voxels
+        if add_to_grid_unit == "mm":
+            scale = add_to_grid
+            add_to_grid_vox = add_to_grid / spacing_out
+        else:
+            scale = add_to_grid / spacing_out
+            add_to_grid_vox = add_to_grid
+
+        # Offset origin to account for change in grid size
+        offset = direction_out.reshape(dim, dim)
+        origin_out -= np.sum(offset, axis=1) * scale
+    else:
+        add_to_grid_vox = 0
+
+    size_out = size_in * spacing_in / spacing_out + 2 * add_to_grid_vox
+    size_out = np.round(size_out).astype(int)
+
+    # For Python3: sitk.Resample in Python3 does not like np.int types!
+    size_out = [int(i) for i in size_out]
+
+    return size_out, origin_out, spacing_out, direction_out
+
+
+##
+# Decimate a data array by integer factors.
+#
+# Prior to taking every factor-th voxel, the data array is smoothed by a
+# Gaussian with standard deviation of factor/3 voxels to avoid aliasing.
+# The decimated grid shares its first voxel with the original grid and is
+# of size round(N/factor) as obtained for resampling at factor times the
+# spacing.
+# \date       2026-10-18 16:48:20+0100
+#
+# \param      nda      Data array
+# \param      factors  Decimation factors for each axis of the data array
+#                      as integers; axes with factor 1 remain unchanged
+# \param      smooth   Turn on/off anti-aliasing; bool. Should be off for
+#                      segmentations
+#
+# \return     Decimated data array of same data type
+#
+def get_decimated_nda(nda, factors, smooth=True):
+    factors = [int(f) for f in factors]
+    if any(f < 1 for f in factors):
+        raise ValueError("Decimation factors must be positive integers")
+
+    nda_decimated = np.asarray(nda)
+    if smooth and any(f > 1 for f in factors):
+        nda_decimated = scipy.ndimage.gaussian_filter(
+            nda_decimated,
+            sigma=[f / 3. if f > 1 else 0 for f in factors],
+            output=np.float64,
+            mode="nearest",
+        )
+
+    slices = tuple(
+        slice(0, max(1, int(np.round(n / float(f)))) * f, f)
+        for n, f in zip(nda.shape, factors))
+
+    return cast_nda(nda_decimated[slices], nda.dtype)
+
+
+##
+# Decimate a nibabel image spatially by an integer factor. See
+# get_decimated_nda.
+# \date       2026-10-18 16:48:20+0100
+#
+# \param      image_nib  Image as nib.Nifti1Image object
+# \param      factor     Spatial decimation factor; int
+# \param      smooth     Turn on/off anti-aliasing; bool
+#
+# \return     Decimated image as nib.Nifti1Image object
+#
+def get_decimated_nib(image_nib, factor, smooth=True):
+    size, origin, spacing, direction = get_grid_from_nib(image_nib)
+    nda = np.asanyarray(image_nib.dataobj)
+    dim = len(size)
+    factors = [factor] * dim + [1] * (nda.ndim - dim)
+
+    return get_nib_from_nda(
+        get_decimated_nda(nda, factors, smooth=smooth),
+        origin, spacing * int(factor), direction, header=image_nib.header)
+
+
+##
+# Gets the filename of a pyramid level, e.g. 'image_s2.nii.gz' for
+# isotropic 2 mm or 'image_s1x1x3.nii.gz' for anisotropic spacing
+# \date       2026-10-18 16:48:20+0100
+#
+# \param      path_to_file  Path to file
+# \param      spacing       Spacing of pyramid level
+#
+# \return     Path to file of pyramid level
+#
+def get_pyramid_filename(path_to_file, spacing):
+    spacing = np.atleast_1d(spacing)
+    if np.allclose(spacing, spacing[0]):
+        spacing = spacing[0:1]
+    suffix = "_s%s" % "x".join(["%g" % np.round(s, 4) for s in spacing])
+    return ph.append_to_filename(path_to_file, suffix)
+
+
+##
+# Gets the bounding box of a region of interest (ROI)
+# \date       2026-10-18 16:05:12+0100
+#
+# \param      mask_nda  Mask as boolean data array in (Simple)ITK index order
+#
+# \return     Bounding box as tuple of slices
+#
+def get_roi_nda(mask_nda):
+    indices = np.nonzero(mask_nda)
+    if indices[0].size == 0:
+        raise ValueError("Mask does not overlap with resampling grid")
+
+    return tuple(slice(int(np.min(i)), int(np.max(i)) + 1) for i in indices)
+
+
+##
+# Gets the grid of a bounding box within a grid
+# \date       2026-10-18 16:05:12+0100
+#
+# \param      roi        Bounding box as tuple of slices in (Simple)ITK index
+#                        order
+# \param      origin     Origin of grid
+# \param      spacing    Spacing of grid
+# \param      direction  Direction of grid (flattened)
+#
+# \return     Size and origin of bounding box grid
+#
+def get_roi_grid(roi, origin, spacing, direction):
+    dim = len(origin)
+    start = np.array([sl.start for sl in roi])
+    size = [int(sl.stop - sl.start) for sl in roi]
+    origin = np.array(origin) + np.array(direction).reshape(dim, dim).dot(
+        start * np.array(spacing))
+
+    return size, origin
+
+
+##
+# Resample a data array onto a grid.
+#
+# The output grid is split into slabs along its last axis which are processed
+# by a thread pool. Physical points and mapped continuous indices are computed
+# once per slab and shared across all volumes/components of the data array.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      nda               Data array in (Simple)ITK index order, i.e.
+#                               x, y [, z] [, t or 1, components]. Can be a
+#                               np.memmap
+# \param      grid              Grid of data array as tuple of size, origin,
+#                               spacing and direction
+# \param      size              Size of output grid
+# \param      origin            Origin of output grid
+# \param      spacing           Spacing of output grid
+# \param      direction         Direction of output grid (flattened)
+# \param      transform_sitk    Transform mapping output grid points onto
+#                               data array points as sitk.Transform object;
+#                               None for identity
+# \param      order             Interpolation order; 0, 1 or 3
+# \param      cov               Covariance of oriented Gaussian PSF in
+#                               (physical) coordinates of the data array axes.
+#                               If given, the data array is interpolated using
+#                               a Gaussian kernel instead of order
+# \param      alpha             Cut-off distance of Gaussian kernel in
+#                               multiples of its standard deviations
+# \param      labels            If True, the data array is treated as
+#                               multi-label segmentation which is resampled
+#                               by linear interpolation of each label and
+#                               taking the most likely label (see
+#                               sample_labels_nda)
+# \param      padding           Padding value
+# \param      dtype             Data type of output array
+# \param      n_threads         Number of threads; int
+# \param      voxels_per_chunk  Approximate number of output voxels per chunk
+# \param      precision         Floating point precision of B-spline
+#                               coefficients; either "float32", "float64" or
+#                               None (package-wide default PRECISION)
+#
+# \return     Resampled data array in (Simple)ITK index order
+#
+def resample_nda(nda,
+                 grid,
+                 size,
+                 origin,
+                 spacing,
+                 direction,
+                 transform_sitk=None,
+                 order=1,
+                 cov=None,
+                 alpha=3,
+                 labels=False,
+                 padding=0,
+                 dtype=None,
+                 n_threads=None,
+                 voxels_per_chunk=2**18,
+                 precision=None,
+                 ):
+
+    size_in, origin_in, spacing_in, direction_in = grid
+    dim = len(origin_in)
+    if len(size) != dim:
+        raise ValueError("Dimensions of data array and output grid differ")
+
+    # Treat all additional axes as volumes sharing the same coordinates
+    shape_volumes = nda.shape[dim:]
+    nda = nda.reshape(tuple(nda.shape[0:dim]) + (-1, ))
+    n_volumes = nda.shape[-1]
+
+    if dtype is None:
+        dtype = nda.dtype
+
+    # B-spline coefficients are computed once for the entire data array
+    if cov is None and not labels and order > 1:
+        nda = np.stack([
+            scipy.ndimage.spline_filter(
+                nda[..., i], order=order, output=prec.get_dtype(precision),
+                mode="mirror")
+            for i in range(n_volumes)], axis=-1)
+
+    M_in_inv = np.linalg.inv(
+        np.array(direction_in).reshape(dim, dim).dot(np.diag(spacing_in)))
+    M_out = np.array(direction).reshape(dim, dim).dot(np.diag(spacing))
+    origin_in = np.array(origin_in).astype(np.float64)
+    origin = np.array(origin).astype(np.float64)
+
+    # Linear transforms are composed into a single index-to-index mapping
+    if transform_sitk is None or transform_sitk.IsLinear():
+        L, t = get_affine_from_transform_sitk(transform_sitk, dim)
+        A = M_in_inv.dot(L).dot(M_out)
+        b = M_in_inv.dot(L.dot(origin) + t - origin_in)
+    else:
+        A = None
+
+    if n_threads is None:
+        n_threads = multiprocessing.cpu_count()
+
+    # Gaussian kernel is separable for axis-aligned grids
+    if cov is not None and A is not None and is_axis_aligned(A):
+        nda_out = np.empty(tuple(size) + (n_volumes, ), dtype=dtype)
+        for i in range(n_volumes):
+            nda_out[..., i] = cast_nda(sample_oriented_gaussian_separable_nda(
+                nda[..., i], A, b, size, spacing_in, cov, alpha, padding,
+                n_threads=n_threads), dtype)
+        return nda_out.reshape(tuple(size) + shape_volumes)
+
+    # Label regions and their bounding boxes in the output grid
+    if labels:
+        regions = [get_label_regions_nda(nda[..., i]) for i in range(n_volumes)]
+        if A is not None:
+            A_inv = np.linalg.inv(A)
+            blocks = [
+                [get_label_block(region[1], region[2].shape, A_inv, b, size)
+                 for region in regions_volume]
+                for regions_volume in regions]
+        else:
+            blocks = [[None] * len(r) for r in regions]
+
+    nda_out = np.empty(tuple(size) + (n_volumes, ), dtype=dtype, order="F")
+
+    # Split output grid into slabs along the last axis
+    voxels_per_slice = int(np.prod(size[0:-1]))
+    thickness = max(1, int(voxels_per_chunk) // max(1, voxels_per_slice))
+    slabs = [(k, min(k + thickness, size[-1]))
+             for k in range(0, size[-1], thickness)]
+
+    def _resample_slab(slab):
+        ranges = [np.arange(n) for n in size[0:-1]] + [np.arange(*slab)]
+        indices = np.array([
+            i.flatten(order="F")
+            for i in np.meshgrid(*ranges, indexing="ij")])
+
+        if A is not None:
+            cindices = A.dot(indices) + b[:, np.newaxis]
+        else:
+            points = M_out.dot(indices) + origin[:, np.newaxis]
+            points += get_displacements_sitk(
+                transform_sitk, size, origin, spacing, direction, slab)
+            cindices = M_in_inv.dot(points - origin_in[:, np.newaxis])
+
+        shape_slab = tuple(size[0:-1]) + (slab[1] - slab[0], )
+        for i in range(n_volumes):
+            if labels:
+                values = sample_labels_nda(
+                    nda[..., i], cindices, shape_slab, slab, regions[i],
+                    blocks[i], padding)
+            elif cov is not None:
+                values = sample_oriented_gaussian_nda(
+                    nda[..., i], cindices, spacing_in, cov, alpha, padding)
+            else:
+                values = sample_nda(nda[..., i], cindices, order, padding)
+            nda_out[..., slab[0]:slab[1], i] = cast_nda(
+                values, dtype).reshape(shape_slab, order="F")
+
+    n_threads = max(1, min(int(n_threads), len(slabs)))
+
+    if n_threads == 1:
+        for slab in slabs:
+            _resample_slab(slab)
+    else:
+        pool = multiprocessing.pool.ThreadPool(n_threads)
+        try:
+            pool.map(_resample_slab, slabs)
+        finally:
+            pool.close()
+            pool.join()
+
+    return nda_out.reshape(tuple(size) + shape_volumes, order="F")
+
+
+##
+# Gets the affine representation of a linear transform, i.e. y = L x + t
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      transform_sitk  Linear transform as sitk.Transform object or
+#                             None (identity)
+# \param      dim             Dimension
+#
+# \return     Tuple of matrix L and translation t as np.arrays
+#
+def get_affine_from_transform_sitk(transform_sitk, dim):
+    if transform_sitk is None:
+        return np.eye(dim), np.zeros(dim)
+
+    t = np.array(transform_sitk.TransformPoint((0., ) * dim))
+    L = np.array([
+        transform_sitk.TransformPoint(tuple(e)) for e in np.eye(dim)
+    ]).transpose() - t[:, np.newaxis]
+
+    return L, t
+
+
+##
+# Gets the displacements of a (non-linear) transform on an output grid slab.
+#
+# The transform, e.g. a displacement field, is evaluated on the slab grid via
+# sitk.TransformToDisplacementField.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      transform_sitk  Transform as sitk.Transform object
+# \param      size            Size of output grid
+# \param      origin          Origin of output grid
+# \param      spacing         Spacing of output grid
+# \param      direction       Direction of output grid
+# \param      slab            Tuple (first, last + 1) index of slab along the
+#                             last axis
+#
+# \return     Displacements as (dim x N) np.array in Fortran order of the
+#             slab grid
+#
+def get_displacements_sitk(transform_sitk, size, origin, spacing, direction,
+                           slab):
+    dim = len(origin)
+    M = np.array(direction).reshape(dim, dim).dot(np.diag(spacing))
+    index = np.zeros(dim)
+    index[-1] = slab[0]
+    size_slab = [int(n) for n in size[0:-1]] + [int(slab[1] - slab[0])]
+    displacement_sitk = sitk.TransformToDisplacementField(
+        transform_sitk,
+        sitk.sitkVectorFloat64,
+        size_slab,
+        [float(o) for o in np.array(origin) + M.dot(index)],
+        [float(s) for s in spacing],
+        [float(d) for d in direction],
+    )
+
+    # sitk array is of shape ([z,] y, x, dim)
+    displacement = sitk.GetArrayViewFromImage(displacement_sitk)
+    displacement = displacement.transpose(
+        tuple(range(dim))[::-1] + (dim, )).reshape(-1, dim, order="F")
+
+    return displacement.transpose()
+
+
+##
+# Sample data array at continuous indices following ITK conventions, i.e.
+# points outside [-0.5, N-0.5) are assigned the padding value.
+# \date       2026-10-18 12:10:03+0100
+#
+# \param      nda       Data array (B-spline coefficients for order > 1)
+# \param      cindices  Continuous indices as (dim x N) np.array
+# \param      order     Interpolation order; 0, 1 or 3
+# \param      padding   Padding value
+#
+# \return     Sampled values as np.array of length N
+#
+def sample_nda(nda, cindices, order, padding):
+    shape = np.array(nda.shape)[:, np.newaxis]
+    inside = np.all((cindices >= -0.5) & (cindices < shape - 0.5), axis=0)
+
+    values = np.empty(cindices.shape[1], dtype=np.float64)
+    values[~inside] = padding
+    cindices = cindices[:, inside]
+
+    if order == 0:
+        # Round half integer up as ITK's nearest neighbor interpolator
+        indices = np.floor(cindices + 0.5).astype(int)
+        indices = np.minimum(indices, shape - 1)
+        values[inside] = nda[tuple(indices)]
+
+    elif order == 1:
+        # Interpolation at border corresponds to nearest extrapolation
+        values[inside] = scipy.ndimage.map_coordinates(
+            nda, cindices, output=np.float64, order=1, mode="nearest")
+
+    else:
+        values[inside] = scipy.ndimage.map_coordinates(
+            nda, cindices, order=order, mode="mirror", prefilter=False)
+
+    return values
+
+
+##
+# Sample multi-label segmentation at continuous indices.
+#
+# Each label is linearly interpolated as binary mask and the label with the
+# highest interpolated value is assigned (ties are resolved in favour of the
+# background and labels of lower value). The background, i.e. the most
+# frequent label, is evaluated at all points first. All remaining labels are
+# only evaluated within their bounding boxes so that only the running maximum
+# and its label are kept for all points.
+# \date       2026-10-18 15:21:40+0100
+#
+# \param      nda         Multi-label data array
+# \param      cindices    Continuous indices as (dim x N) np.array in Fortran
+#                         order of the slab grid
+# \param      shape_slab  Shape of slab grid
+# \param      slab        Tuple (first, last + 1) index of slab along the
+#                         last axis of the output grid
+# \param      regions     Label regions as obtained by get_label_regions_nda
+# \param      blocks      Bounding boxes of label regions in the output grid
+#                         as obtained by get_label_block. None entries
+#                         denote the entire grid
+# \param      padding     Padding value
+#
+# \return     Sampled labels as np.array of length N
+#
+def sample_labels_nda(nda, cindices, shape_slab, slab, regions, blocks,
+                      padding):
+    dim = cindices.shape[0]
+    cindices = cindices.reshape((dim, ) + tuple(shape_slab), order="F")
+
+    best_values = np.full(shape_slab, -1.)
+    best_labels = np.zeros(shape_slab, dtype=nda.dtype)
+
+    for (label, start, indicator), block in zip(regions, blocks):
+        if block is None:
+            block = tuple(slice(0, n) for n in shape_slab)
+        else:
+            # Restrict bounding box in output grid to slab
+            block = block[0:-1] + (slice(
+                max(block[-1].start, slab[0]) - slab[0],
+                min(block[-1].stop, slab[1]) - slab[0]), )
+            if any(sl.stop <= sl.start for sl in block):
+                continue
+
+        cindices_block = cindices[(slice(None), ) + block].reshape(dim, -1)
+        values = scipy.ndimage.map_coordinates(
+            indicator,
+            cindices_block - start[:, np.newaxis],
+            output=np.float64,
+            order=1,
+            mode="nearest",
+        ).reshape(best_values[block].shape)
+
+        update = values > best_values[block]
+        best_values[block][update] = values[update]
+        best_labels[block][update] = label
+
+    shape = np.array(nda.shape).reshape((dim, ) + (1, ) * dim)
+    inside = np.all((cindices >= -0.5) & (cindices < shape - 0.5), axis=0)
+
+    values = best_labels.astype(np.float64)
+    values[~inside] = padding
+
+    return values.flatten(order="F")
+
+
+##
+# Gets the regions of all labels of a multi-label segmentation.
+# \date       2026-10-18 15:21:40+0100
+#
+# \param      nda   Multi-label data array
+#
+# \return     List of tuples (label, start index, binary mask of label as
+#             np.uint8 array) with the background, i.e. the most frequent
+#             label, first. Masks are cropped to the bounding box of the
+#             label plus a margin of one voxel (within the image).
+#
+def get_label_regions_nda(nda):
+    nda = np.asarray(nda)
+    labels, inverse, counts = np.unique(
+        nda, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(nda.shape)
+    background = np.argmax(counts)
+
+    regions = [(
+        labels[background],
+        np.zeros(nda.ndim),
+        (inverse == background).astype(np.uint8),
+    )]
+    for i, slices in enumerate(scipy.ndimage.find_objects(inverse + 1)):
+        if i == background or slices is None:
+            continue
+        slices = tuple(
+            slice(max(sl.start - 1, 0), min(sl.stop + 1, n))
+            for sl, n in zip(slices, nda.shape))
+        regions.append((
+            labels[i],
+            np.array([sl.start for sl in slices]),
+            (inverse[slices] == i).astype(np.uint8),
+        ))
+
+    return regions
+
+
+##
+# Gets the bounding box in the output grid of all points which are mapped
+# into a label region.
+# \date       2026-10-18 15:21:40+0100
+#
+# \param      start  Start index of label region in data array
+# \param      shape  Shape of label region
+# \param      A_inv  Inverse of matrix mapping output indices to continuous
+#                    indices of data array
+# \param      b      Offset of mapping
+# \param      size   Size of output grid
+#
+# \return     Bounding box as tuple of slices
+#
+def get_label_block(start, shape, A_inv, b, size):
+    corners = np.array(list(itertools.product(
+        *[(s - 1, s + n) for s, n in zip(start, shape)]))).transpose()
+    corners = A_inv.dot(corners - b[:, np.newaxis])
+    lower = np.maximum(np.floor(np.min(corners, axis=1)), 0).astype(int)
+    upper = np.minimum(
+        np.ceil(np.max(corners, axis=1)) + 1, size).astype(int)
+
+    return tuple(slice(l, max(l, u)) for l, u in zip(lower, upper))
+
+
+##
+# Sample data array at continuous indices using an oriented Gaussian kernel
+# as ITK's OrientedGaussianInterpolateImageFunction.
+#
+# For each point, voxels within the (axis-aligned) bounding box of
+# alpha standard deviations are weighted by exp(-0.5 d^T cov^-1 d) where d is
+# the physical distance along the axes of the data array. The stencil is
+# traversed offset by offset, each vectorized over all given points.
+# \date       2026-10-18 14:02:51+0100
+#
+# \param      nda       Data array
+# \param      cindices  Continuous indices as (dim x N) np.array
+# \param      spacing   Spacing of data array
+# \param      cov       Covariance of Gaussian kernel in (physical)
+#                       coordinates of the data array axes
+# \param      alpha     Cut-off distance in multiples of standard deviations
+# \param      padding   Padding value
+#
+# \return     Sampled values as np.array of length N
+#
+def sample_oriented_gaussian_nda(nda, cindices, spacing, cov, alpha, padding):
+    shape = np.array(nda.shape)[:, np.newaxis]
+    inside = np.all((cindices >= -0.5) & (cindices < shape - 0.5), axis=0)
+
+    values = np.empty(cindices.shape[1], dtype=np.float64)
+    values[~inside] = padding
+    cindices = cindices[:, inside]
+    if cindices.shape[1] == 0:
+        return values
+
+    spacing = np.array(spacing)[:, np.newaxis]
+    cov_inv = np.linalg.inv(cov)
+    start, end = get_gaussian_bounding_box(
+        cindices, spacing, cov, alpha, shape)
+    extent = np.max(end - start, axis=1).astype(int)
+
+    sum_weights = np.zeros(cindices.shape[1])
+    sum_values = np.zeros(cindices.shape[1])
+    for offset in itertools.product(*[range(k) for k in extent]):
+        indices = start + np.array(offset)[:, np.newaxis]
+        mask = np.all(indices < end, axis=0)
+        d = (indices - cindices) * spacing
+        weights = np.exp(-0.5 * np.sum(d * cov_inv.dot(d), axis=0)) * mask
+        indices = np.minimum(indices, shape - 1).astype(int)
+
+        sum_values += weights * nda[tuple(indices)]
+        sum_weights += weights
+
+    values[inside] = sum_values / sum_weights
+
+    return values
+
+
+##
+# Resample data array onto an axis-aligned grid using a Gaussian kernel with
+# diagonal covariance.
+#
+# The kernel is separable so that resampling reduces to one sparse weight
+# matrix per axis. Results are identical to sample_oriented_gaussian_nda.
+# \date       2026-10-18 14:02:51+0100
+#
+# \param      nda        Data array
+# \param      A          Axis-aligned matrix mapping output indices to
+#                        continuous indices of data array
+# \param      b          Offset of mapping
+# \param      size       Size of output grid
+# \param      spacing    Spacing of data array
+# \param      cov        Covariance of Gaussian kernel in (physical)
+#                        coordinates of the data array axes
+# \param      alpha      Cut-off distance in multiples of standard deviations
+# \param      padding    Padding value
+# \param      n_threads  Number of threads; int
+#
+# \return     Resampled data array as np.array of shape size
+#
+def sample_oriented_gaussian_separable_nda(
+        nda, A, b, size, spacing, cov, alpha, padding, n_threads=1):
+    dim = nda.ndim
+    axes_out = np.argmax(np.abs(A), axis=1)
+
+    nda_out = np.asarray(nda, dtype=np.float64)
+    inside = np.ones(size, dtype=bool)
+    for axis in range(dim):
+        axis_out = axes_out[axis]
+        length = nda.shape[axis]
+        cindices = A[axis, axis_out] * np.arange(size[axis_out]) + b[axis]
+        inside_axis = (cindices >= -0.5) & (cindices < length - 0.5)
+
+        # Normalized 1D Gaussian weights of each output index
+        start, end = get_gaussian_bounding_box(
+            cindices[np.newaxis], spacing[axis], cov[axis, axis][np.newaxis],
+            alpha, length)
+        rows = []
+        cols = []
+        for offset in range(int(np.max(end - start))):
+            indices = start[0] + offset
+            mask = inside_axis & (indices < end[0])
+            rows.append(np.where(mask)[0])
+            cols.append(indices[mask])
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols).astype(int)
+        d = (cols - cindices[rows]) * spacing[axis]
+        weights = np.exp(-0.5 * d**2 / cov[axis, axis])
+        W = scipy.sparse.csr_matrix(
+            (weights, (rows, cols)), shape=(size[axis_out], length))
+        W = scipy.sparse.diags(
+            1. / np.maximum(np.asarray(W.sum(axis=1)).flatten(), 1e-300)
+        ).dot(W).tocsr()
+
+        # Apply weights along the axis in column chunks
+        shape = list(nda_out.shape)
+        X = np.moveaxis(nda_out, axis, 0).reshape(length, -1)
+        Y = np.empty((size[axis_out], X.shape[1]))
+        chunks = np.array_split(
+            np.arange(X.shape[1]), max(1, min(int(n_threads), X.shape[1])))
+
+        def _apply(chunk):
+            if chunk.size:
+                Y[:, chunk[0]:chunk[-1] + 1] = W.dot(
+                    X[:, chunk[0]:chunk[-1] + 1])
+
+        if len(chunks) == 1:
+            _apply(chunks[0])
+        else:
+            pool = multiprocessing.pool.ThreadPool(len(chunks))
+            try:
+                pool.map(_apply, chunks)
+            finally:
+                pool.close()
+                pool.join()
+        shape[axis] = size[axis_out]
+        nda_out = np.moveaxis(
+            Y.reshape([shape[axis]] + shape[:axis] + shape[axis + 1:]),
+            0, axis)
+
+        shape_inside = [1] * dim
+        shape_inside[axis_out] = size[axis_out]
+        inside = inside & inside_axis.reshape(shape_inside)
+
+    # Order axes according to output grid
+    nda_out = nda_out.transpose(np.argsort(axes_out))
+    nda_out[~inside] = padding
+
+    return nda_out
+
+
+##
+# Gets the bounding box of a Gaussian kernel centered at continuous indices
+# \date       2026-10-18 14:02:51+0100
+#
+# \param      cindices  Continuous indices as (dim x N) np.array
+# \param      spacing   Spacing of data array
+# \param      cov       Covariance of Gaussian kernel
+# \param      alpha     Cut-off distance in multiples of standard deviations
+# \param      shape     Shape of data array
+#
+# \return     Tuple of first and last + 1 indices as (dim x N) np.arrays
+#
+def get_gaussian_bounding_box(cindices, spacing, cov, alpha, shape):
+    cutoff = alpha * np.sqrt(np.diag(np.atleast_2d(cov)))
+    cutoff = cutoff.reshape(-1, 1) / np.reshape(spacing, (-1, 1))
+    start = np.maximum(np.floor(cindices + 0.5 - cutoff), 0)
+    end = np.minimum(np.ceil(cindices + 0.5 + cutoff),
+                     np.reshape(shape, (-1, 1)))
+    return start, end
+
+
+##
+# Query whether an index mapping matrix is axis-aligned, i.e. every axis of
+# the output grid is mapped onto exactly one axis of the data array
+# \date       2026-10-18 14:02:51+0100
+#
+def is_axis_aligned(A, tolerance=1e-6):
+    nonzero = np.abs(A) > tolerance * np.max(np.abs(A))
+    return bool(np.all(np.sum(nonzero, axis=0) == 1) and
+                np.all(np.sum(nonzero, axis=1) == 1))
+
+
+##
+# Compute (axis aligned) covariance matrix from spacing. The PSF is
+# modelled as Gaussian with
+#  *- FWHM = 1.2*in-plane-resolution (in-plane)
+#  *- FWHM = slice thickness (through-plane)
+# \date       2017-11-01 16:16:36+0000
+#
+# \param      spacing  3D array containing in-plane and through-plane
+#                      dimensions
+#
+# \return     (axis aligned) covariance matrix representing PSF modelled
+#             Gaussian as 3x3 np.array
+#
+def get_psf_covariance(spacing):
+    spacing = np.array(spacing).astype(np.float64)
+    sigma2 = np.zeros_like(spacing)
+
+    # Compute Gaussian to approximate in-plane PSF:
+    sigma2[0:2] = (1.2 * spacing[0:2])**2 / (8 * np.log(2))
+
+    # Compute Gaussian to approximate through-plane PSF:
+    if sigma2.size == 3:
+        sigma2[2] = spacing[2]**2 / (8 * np.log(2))
+
+    return np.diag(sigma2)
+
+
+##
+# Gets the relative rotation matrix to express fixed-axis aligned
+# covariance matrix in coordinates of moving image
+# \date       2016-10-14 16:37:57+0100
+#
+# \param      fixed_direction   fixed image direction
+# \param      moving_direction  moving image direction
+#
+# \return     The relative rotation matrix as 3x3 numpy array
+#
+def get_rotation_matrix(fixed_direction, moving_direction):
+    dim = np.sqrt(np.array(fixed_direction).size).astype(np.uint8)
+    fixed_direction = np.array(fixed_direction).reshape(dim, dim)
+    moving_direction = np.array(moving_direction).reshape(dim, dim)
+
+    return moving_direction.transpose().dot(fixed_direction)
+
+
+##
+# Gets the covariance of the fixed axis-aligned PSF expressed in coordinates
+# of the moving image axes
+# \date       2026-10-18 14:02:51+0100
+#
+# \param      fixed_direction   Direction of fixed image (flattened)
+# \param      moving_direction  Direction of moving image (flattened)
+# \param      spacing           Spacing of fixed (resampling) grid
+#
+# \return     Covariance as np.array
+#
+def get_oriented_psf_covariance(fixed_direction, moving_direction, spacing):
+
+    # Fixed axis-aligned covariance matrix representing the PSF
+    cov = get_psf_covariance(spacing)
+
+    # Express fixed axis-aligned PSF in moving space coordinates
+    U = get_rotation_matrix(fixed_direction, moving_direction)
+    cov = U.dot(cov).dot(U.transpose())
+
+    return cov
+
+
+##
+# Cast data array to given data type. Similar to ITK, integer types are
+# clamped to their representable range before casting.
+# \date       2026-10-18 12:10:03+0100
+#
+def cast_nda(nda, dtype):
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        nda = np.clip(nda, info.min, info.max)
+    return nda.astype(dtype)
@@ -0,0 +1,144 @@
+##
+# \file parallel_gzip.py
+# \brief      Parallel gzip compression of (NIfTI) files.
+#
+# The input is split into independent blocks which are compressed by a
+# thread pool (zlib releases the GIL). Each block is written as a gzip member
+# so that the concatenation is a valid multi-member gzip stream readable by
+# gzip, zlib (and thus ITK, nibabel, NiftyReg and FSL).
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import io
+import os
+import gzip
+import tempfile
+import multiprocessing
+import multiprocessing.pool
+
+import simplereg.definitions as definitions
+
+# Named compression modes and their gzip compression levels
+COMPRESSION_MODES = {
+    "store": 0,
+    "fast": 1,
+    "default": 6,
+    "best": 9,
+}
+
+
+##
+# Gets the gzip compression level of a compression setting
+# \date       2026-10-18 21:03:17+0100
+#
+# \param      compression  Compression level (0-9), mode ("store", "fast",
+#                          "default", "best") or None for the package-wide
+#                          default COMPRESSION
+#
+# \return     Compression level as int or None if the (single-threaded)
+#             default writers shall be used
+#
+def get_compression_level(compression=None):
+    if compression is None:
+        compression = definitions.COMPRESSION
+    if compression is None:
+        return None
+
+    if compression in COMPRESSION_MODES:
+        return COMPRESSION_MODES[compression]
+
+    try:
+        level = int(compression)
+    except (TypeError, ValueError):
+        level = None
+    if level is None or level < 0 or level > 9:
+        raise ValueError(
+            "Compression '%s' not known. Allowed options are: 0-9, %s" % (
+                compression, ", ".join(COMPRESSION_MODES.keys())))
+
+    return level
+
+
+##
+# Compress a file into a multi-member gzip file using a thread pool.
+# \date       2026-10-18 21:03:17+0100
+#
+# \param      path_to_input   Path to (uncompressed) input file
+# \param      path_to_output  Path to gzip output file
+# \param      level           Compression level (0-9); int
+# \param      block_size      Number of bytes compressed per gzip member
+# \param      n_threads       Number of threads; int. If None, the number of
+#                             CPUs is used
+#
+def compress_file(path_to_input,
+                  path_to_output,
+                  level=6,
+                  block_size=2**22,
+                  n_threads=None,
+                  ):
+    if n_threads is None:
+        n_threads = multiprocessing.cpu_count()
+    n_threads = max(1, int(n_threads))
+
+    # gzip.compress supports mtime for Python >= 3.8 only
+    def _compress(block):
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb",
+                           compresslevel=level, mtime=0) as fout:
+            fout.write(block)
+        return buffer.getvalue()
+
+    # Blocks are read batch-wise to bound memory consumption
+    pool = multiprocessing.pool.ThreadPool(n_threads)
+    try:
+        with open(path_to_input, "rb") as fin, \
+                open(path_to_output, "wb") as fout:
+            while True:
+                blocks = []
+                for _ in range(2 * n_threads):
+                    block = fin.read(block_size)
+                    if not block:
+                        break
+                    blocks.append(block)
+                if not blocks:
+                    break
+                for member in pool.map(_compress, blocks):
+                    fout.write(member)
+    finally:
+        pool.close()
+        pool.join()
+
+
+##
+# Write a file using a writer function and, for gzip file extensions, compress
+# it in parallel.
+#
+# The writer function writes the uncompressed file into a temporary file next
+# to the output which is compressed and removed afterwards.
+# \date       2026-10-18 21:03:17+0100
+#
+# \param      write_function  Function writing to the path given as argument
+# \param      path_to_file    Path to output file
+# \param      level           Compression level (0-9); int
+# \param      n_threads       Number of threads; int
+#
+def write_compressed(write_function, path_to_file, level, n_threads=None):
+    if not path_to_file.endswith(".gz"):
+        write_function(path_to_file)
+        return
+
+    directory = os.path.dirname(os.path.abspath(path_to_file))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    basename = os.path.basename(path_to_file)[:-len(".gz")]
+    handle, path_to_tmp = tempfile.mkstemp(
+        prefix=".", suffix="_" + basename, dir=directory)
+    os.close(handle)
+    try:
+        write_function(path_to_tmp)
+        compress_file(
+            path_to_tmp, path_to_file, level=level, n_threads=n_threads)
+    finally:
+        os.remove(path_to_tmp)
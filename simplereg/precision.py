@@ -0,0 +1,132 @@
+##
+# \file precision.py
+# \brief      Helpers to resolve the floating point precision used for images
+#             and displacement fields.
+#
+# The package-wide default is given by simplereg.definitions.PRECISION and
+# can be overridden per call by passing a precision explicitly. Floating
+# point data is stored with at most the selected precision, i.e. selecting
+# "float32" halves memory and I/O of float64 images and displacement fields
+# whereas "float64" leaves all pixel types untouched. Integer images are never
+# altered.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import numpy as np
+import SimpleITK as sitk
+
+import simplereg.definitions as definitions
+
+PIXEL_TYPES_SITK = {
+    "float32": sitk.sitkFloat32,
+    "float64": sitk.sitkFloat64,
+}
+
+VECTOR_PIXEL_TYPES_SITK = {
+    "float32": sitk.sitkVectorFloat32,
+    "float64": sitk.sitkVectorFloat64,
+}
+
+
+##
+# Gets the precision, i.e. the package-wide default if not given explicitly.
+# \date       2026-10-18 18:02:41+0100
+#
+# \param      precision  Precision; either "float32", "float64" or None
+#
+# \return     Precision as string
+#
+def get_precision(precision=None):
+    if precision is None:
+        precision = definitions.PRECISION
+
+    if precision not in definitions.ALLOWED_PRECISIONS:
+        raise ValueError(
+            "Precision '%s' not known. Allowed options are: %s" % (
+                precision, ", ".join(definitions.ALLOWED_PRECISIONS)))
+
+    return precision
+
+
+##
+# Gets the numpy data type associated with the precision
+# \date       2026-10-18 18:02:41+0100
+#
+# \param      precision  Precision; either "float32", "float64" or None
+#
+# \return     Data type as np.dtype
+#
+def get_dtype(precision=None):
+    return np.dtype(get_precision(precision))
+
+
+##
+# Gets the data type to store data of given data type with at most the
+# selected precision.
+# \date       2026-10-18 18:02:41+0100
+#
+# \param      dtype      Data type
+# \param      precision  Precision; either "float32", "float64" or None
+#
+# \return     Data type as np.dtype
+#
+def get_limited_dtype(dtype, precision=None):
+    dtype = np.dtype(dtype)
+    dtype_precision = get_dtype(precision)
+    if np.issubdtype(dtype, np.floating) and \
+            dtype.itemsize > dtype_precision.itemsize:
+        return dtype_precision
+    return dtype
+
+
+##
+# Gets the SimpleITK pixel type associated with the precision
+# \date       2026-10-18 18:02:41+0100
+#
+# \param      precision  Precision; either "float32", "float64" or None
+# \param      vector     If True, the vector pixel type is returned
+#
+# \return     SimpleITK pixel type as int
+#
+def get_pixel_type_sitk(precision=None, vector=False):
+    if vector:
+        return VECTOR_PIXEL_TYPES_SITK[get_precision(precision)]
+    return PIXEL_TYPES_SITK[get_precision(precision)]
+
+
+##
+# Gets the SimpleITK pixel type to store an image of given pixel type with at
+# most the selected precision.
+# \date       2026-10-18 18:02:41+0100
+#
+# \param      pixel_id   SimpleITK pixel type
+# \param      precision  Precision; either "float32", "float64" or None
+#
+# \return     SimpleITK pixel type as int
+#
+def get_limited_pixel_type_sitk(pixel_id, precision=None):
+    if pixel_id == sitk.sitkFloat64:
+        return get_pixel_type_sitk(precision)
+    if pixel_id == sitk.sitkVectorFloat64:
+        return get_pixel_type_sitk(precision, vector=True)
+    return pixel_id
+
+
+##
+# Casts a floating point image to at most the selected precision. Integer
+# images are returned unaltered.
+# \date       2026-10-18 18:02:41+0100
+#
+# \param      image_sitk  Image as sitk.Image object
+# \param      precision   Precision; either "float32", "float64" or None
+#
+# \return     Image as sitk.Image object
+#
+def get_limited_image_sitk(image_sitk, precision=None):
+    pixel_id = get_limited_pixel_type_sitk(
+        image_sitk.GetPixelIDValue(), precision)
+    if pixel_id == image_sitk.GetPixelIDValue():
+        return image_sitk
+    return sitk.Cast(image_sitk, pixel_id)
@@ -0,0 +1,233 @@
+##
+# \file registration_cache.py
+# \brief      On-disk cache of registration results
+#
+# Results are keyed by a hash of the registration class, the fixed, moving
+# and mask images (header and pixel buffer) and all options affecting the
+# result, including the initial transform. Each entry is a directory holding
+# the registration transform, optionally the warped moving image, and a JSON
+# file with the options and the computational time of the registration.
+# Once the cache exceeds its byte budget, least recently used entries are
+# evicted.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+import pysitk.python_helper as ph
+
+from simplereg.scratch_store import ScratchStore
+from simplereg.definitions import DIR_REGISTRATION_CACHE
+
+# Metadata file of each cache entry
+METADATA = "metadata.json"
+
+
+class RegistrationCache(object):
+
+    ##
+    # Open (or create) registration cache
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      directory     Directory of cache; if None,
+    #                           DIR_REGISTRATION_CACHE is used
+    # \param      max_bytes     Byte budget of cache; int. Least recently
+    #                           used entries are evicted once exceeded
+    # \param      cache_warped  Store the warped moving image of wrapper
+    #                           registrations along with the transform; bool
+    #
+    def __init__(self, directory=None, max_bytes=2**32, cache_warped=False):
+        if directory is None:
+            directory = DIR_REGISTRATION_CACHE
+        ph.create_directory(directory)
+
+        self._directory = directory
+        self._max_bytes = int(max_bytes)
+        self._cache_warped = bool(cache_warped)
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_directory(self):
+        return self._directory
+
+    ##
+    # Gets the cache key of a registration method
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      registration_method  Registration method, i.e. instance of
+    #                                  SimpleItkRegistrationBase
+    #
+    # \return     Key as hexadecimal string; None if the registration method
+    #             does not support caching
+    #
+    @staticmethod
+    def get_key(registration_method):
+        options = registration_method._get_cache_options()
+        if options is None:
+            return None
+
+        images = [
+            registration_method.get_fixed_sitk(),
+            registration_method.get_moving_sitk(),
+            registration_method.get_fixed_sitk_mask(),
+            registration_method.get_moving_sitk_mask(),
+        ]
+
+        h = hashlib.sha256()
+        h.update(registration_method.__class__.__name__.encode())
+        h.update(json.dumps(options, sort_keys=True, default=repr).encode())
+        for image_sitk in images:
+            key = "" if image_sitk is None else \
+                ScratchStore.get_key(image_sitk)
+            h.update(key.encode())
+        return h.hexdigest()[0:32]
+
+    ##
+    # Load a cached result into a registration method
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      key                  Cache key
+    # \param      registration_method  Registration method
+    #
+    # \return     True if the result was cached, False otherwise
+    #
+    def load(self, key, registration_method):
+        directory = os.path.join(self._directory, key)
+        path_to_metadata = os.path.join(directory, METADATA)
+        try:
+            registration_method._read_cache_results(directory)
+            os.utime(path_to_metadata)
+        except (IOError, OSError, RuntimeError):
+            # Missing, incomplete or just evicted entry
+            self._misses += 1
+            return False
+
+        self._hits += 1
+        return True
+
+    ##
+    # Save the result of a registration method
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      key                  Cache key
+    # \param      registration_method  Registration method whose run has
+    #                                  finished
+    #
+    def save(self, key, registration_method):
+        directory = os.path.join(self._directory, key)
+        if os.path.isdir(directory):
+            return
+
+        # Entry is written to a temporary directory and moved into place so
+        # that concurrent readers never see incomplete entries
+        directory_tmp = tempfile.mkdtemp(prefix=".", dir=self._directory)
+        try:
+            registration_method._write_cache_results(
+                directory_tmp, self._cache_warped)
+            metadata = {
+                "key": key,
+                "class": registration_method.__class__.__name__,
+                "options": registration_method._get_cache_options(),
+                "computational_time": registration_method.
+                get_computational_time().total_seconds(),
+                "created": time.time(),
+            }
+            with open(os.path.join(directory_tmp, METADATA), "w") as fout:
+                json.dump(metadata, fout, indent=1, default=repr)
+            os.rename(directory_tmp, directory)
+        except (IOError, OSError) as e:
+            shutil.rmtree(directory_tmp, True)
+
+            # Failures other than a concurrently written entry (e.g. full
+            # disk or missing permissions) do not affect the registration
+            if not os.path.isdir(directory):
+                ph.print_warning(
+                    "Registration result could not be cached: %s" % e)
+            return
+        except BaseException:
+            shutil.rmtree(directory_tmp, True)
+            raise
+
+        self.evict()
+
+    ##
+    # Gets the metadata of all cache entries
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \return     List of dictionaries (key, class, options,
+    #             computational_time, created, last_used, bytes) sorted from
+    #             least to most recently used
+    #
+    def get_entries(self):
+        entries = []
+        for name in os.listdir(self._directory):
+            directory = os.path.join(self._directory, name)
+            if name.startswith(".") or not os.path.isdir(directory):
+                continue
+            path_to_metadata = os.path.join(directory, METADATA)
+            try:
+                with open(path_to_metadata) as fin:
+                    metadata = json.load(fin)
+                metadata["last_used"] = os.stat(path_to_metadata).st_mtime
+                metadata["bytes"] = sum(
+                    os.path.getsize(os.path.join(directory, f))
+                    for f in os.listdir(directory))
+            except (IOError, OSError, ValueError):
+                continue
+            entries.append(metadata)
+        return sorted(entries, key=lambda e: e["last_used"])
+
+    ##
+    # Remove least recently used entries until the byte budget is met
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      max_bytes  Byte budget; int. If None, the cache's budget is
+    #                        used
+    #
+    def evict(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = self._max_bytes
+
+        entries = self.get_entries()
+        n_bytes = sum(e["bytes"] for e in entries)
+        for entry in entries:
+            if n_bytes <= max_bytes:
+                break
+            self.delete(entry["key"])
+            n_bytes -= entry["bytes"]
+            self._evictions += 1
+
+    def delete(self, key):
+        shutil.rmtree(os.path.join(self._directory, key), True)
+
+    def clear(self):
+        for entry in self.get_entries():
+            self.delete(entry["key"])
+
+    ##
+    # Gets the cache statistics
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \return     Dictionary with number of hits, misses and evictions of
+    #             this instance and number of entries and bytes of the cache
+    #             as well as the byte budget
+    #
+    def get_statistics(self):
+        entries = self.get_entries()
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "entries": len(entries),
+            "bytes": sum(e["bytes"] for e in entries),
+            "max_bytes": self._max_bytes,
+        }
@@ -0,0 +1,206 @@
+##
+# \file registration_scheduler.py
+# \brief      Scheduler running registration jobs concurrently within a total
+#             core budget.
+#
+# Each job is assigned a number of threads based on the size of its fixed
+# image. It is used for the OpenMP threads of NiftyReg (omp_core_val) and the
+# global number of threads of SimpleITK (sitk.ProcessObject) in the worker.
+# Jobs are started in order as long as their threads fit into the remaining
+# budget; the others are queued until running jobs finish.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import time
+import resource
+import collections
+import numpy as np
+import SimpleITK as sitk
+import concurrent.futures
+
+import pysitk.python_helper as ph
+
+import simplereg.batch_registration as br
+from simplereg.definitions import N_CORES
+
+# Number of fixed image voxels per assigned thread, i.e. a 128^3 image is
+# registered single-threaded and a 256^3 image with 8 threads
+VOXELS_PER_THREAD = 128**3
+
+# Registration methods which run single-threaded
+SINGLE_THREADED_METHODS = ["FLIRT"]
+
+
+class RegistrationScheduler(object):
+
+    ##
+    # Constructor
+    # \date       2026-10-18 23:51:30+0100
+    #
+    # \param      n_cores            Total number of cores (threads) used by
+    #                                all concurrently running jobs; int. If
+    #                                None, N_CORES is used
+    # \param      min_threads        Minimum number of threads per job; int
+    # \param      max_threads        Maximum number of threads per job; int.
+    #                                If None, n_cores is used
+    # \param      voxels_per_thread  Number of fixed image voxels per thread
+    # \param      verbose            Turn on/off verbose output
+    #
+    def __init__(self,
+                 n_cores=None,
+                 min_threads=1,
+                 max_threads=None,
+                 voxels_per_thread=VOXELS_PER_THREAD,
+                 verbose=0,
+                 ):
+        self._n_cores = N_CORES if n_cores is None else int(n_cores)
+        if self._n_cores < 1:
+            raise ValueError("Number of cores must be positive")
+
+        self._max_threads = self._n_cores if max_threads is None \
+            else min(int(max_threads), self._n_cores)
+        self._min_threads = max(1, min(int(min_threads), self._max_threads))
+        self._voxels_per_thread = voxels_per_thread
+        self._verbose = verbose
+
+    def get_n_cores(self):
+        return self._n_cores
+
+    ##
+    # Gets the number of threads assigned to a job. A job may request a fixed
+    # number by its key 'n_threads'.
+    # \date       2026-10-18 23:51:30+0100
+    #
+    # \param      job   Job as dictionary (see batch_registration)
+    #
+    # \return     Number of threads; int
+    #
+    def get_number_of_threads(self, job):
+        if job.get("n_threads", None) is not None:
+            n_threads = int(job["n_threads"])
+        elif job["method"] in SINGLE_THREADED_METHODS:
+            n_threads = 1
+        else:
+            # Only the image header is read
+            reader = sitk.ImageFileReader()
+            reader.SetFileName(job["fixed"])
+            reader.ReadImageInformation()
+            n_voxels = np.prod(reader.GetSize())
+            n_threads = int(np.ceil(n_voxels / float(self._voxels_per_thread)))
+
+        return max(self._min_threads, min(n_threads, self._max_threads))
+
+    ##
+    # Run jobs concurrently within the core budget.
+    # \date       2026-10-18 23:51:30+0100
+    #
+    # \param      jobs  List of jobs (see batch_registration.run_registration)
+    #
+    # \return     List of reports (dictionaries) in order of the jobs holding
+    #             method, n_threads, computational_time, wall_time, cpu_time,
+    #             cpu_utilisation (CPU time per wall time and thread) and
+    #             error (None or error message)
+    #
+    def run(self, jobs):
+        n_threads = [self.get_number_of_threads(job) for job in jobs]
+        reports = [None] * len(jobs)
+
+        queue = collections.deque(range(len(jobs)))
+        running = {}
+        n_cores_in_use = 0
+
+        with concurrent.futures.ProcessPoolExecutor(
+                max(1, min(self._n_cores, len(jobs)))) as executor:
+            while queue or running:
+
+                # Start queued jobs in order while they fit into the budget
+                while queue and (not running or n_cores_in_use +
+                                 n_threads[queue[0]] <= self._n_cores):
+                    i = queue.popleft()
+                    future = executor.submit(
+                        _run_scheduled_job, jobs[i], n_threads[i])
+                    running[future] = i
+                    n_cores_in_use += n_threads[i]
+                    if self._verbose:
+                        ph.print_info(
+                            "Job %d (%s) started with %d threads "
+                            "(%d/%d cores in use, %d queued)" % (
+                                i, jobs[i]["method"], n_threads[i],
+                                n_cores_in_use, self._n_cores, len(queue)))
+
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    n_cores_in_use -= n_threads[i]
+                    reports[i] = future.result()
+                    if self._verbose:
+                        self._print_report(i, reports[i])
+
+        return reports
+
+    @staticmethod
+    def _print_report(i, report):
+        if report["error"] is not None:
+            ph.print_warning("Job %d (%s) failed: %s" % (
+                i, report["method"], report["error"]))
+        else:
+            ph.print_info(
+                "Job %d (%s) finished: wall time %.1fs, CPU time %.1fs, "
+                "CPU utilisation %.0f%% of %d threads" % (
+                    i, report["method"], report["wall_time"],
+                    report["cpu_time"], 100 * report["cpu_utilisation"],
+                    report["n_threads"]))
+
+
+##
+# Gets the CPU time used by the current process and its (terminated)
+# child processes, e.g. the wrapped command line tools.
+# \date       2026-10-18 23:51:30+0100
+#
+# \return     CPU time in seconds
+#
+def _get_cpu_time():
+    cpu_time = 0
+    for who in [resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN]:
+        usage = resource.getrusage(who)
+        cpu_time += usage.ru_utime + usage.ru_stime
+    return cpu_time
+
+
+##
+# Run a job in a worker process with the given number of threads.
+# \date       2026-10-18 23:51:30+0100
+#
+# \param      job        Job as dictionary
+# \param      n_threads  Number of threads; int
+#
+# \return     Report as dictionary (see RegistrationScheduler.run)
+#
+def _run_scheduled_job(job, n_threads):
+    report = {
+        "method": job["method"],
+        "n_threads": n_threads,
+        "computational_time": None,
+        "error": None,
+    }
+
+    sitk.ProcessObject.SetGlobalDefaultNumberOfThreads(n_threads)
+    job = dict(job, omp=n_threads)
+
+    cpu_time_start = _get_cpu_time()
+    wall_time_start = time.time()
+    try:
+        report["computational_time"] = br.run_registration(job)
+    except Exception as e:
+        # Exceptions of external tools cannot always be pickled
+        report["error"] = "%s: %s" % (type(e).__name__, e)
+
+    report["wall_time"] = time.time() - wall_time_start
+    report["cpu_time"] = _get_cpu_time() - cpu_time_start
+    report["cpu_utilisation"] = report["cpu_time"] / \
+        max(report["wall_time"] * n_threads, 1e-9)
+
+    return report
@@ -8,7 +8,6 @@
 
 
 import os
-import itk
 import numpy as np
 import SimpleITK as sitk
 
@@ -18,14 +17,77 @@ import pysitk.simple_itk_helper as sitkh
 import simplereg.data_reader as dr
 import simplereg.data_writer as dw
 import simplereg.utilities as utils
+import simplereg.numpy_resampler as npr
 from simplereg.niftyreg_to_simpleitk_converter import \
     NiftyRegToSimpleItkConverter as nreg2sitk
 
-from simplereg.definitions import ALLOWED_INTERPOLATORS
+
+# Vector pixel types used to resample all volumes of a time series in one pass
+VECTOR_PIXEL_TYPES_SITK = {
+    sitk.sitkUInt8: sitk.sitkVectorUInt8,
+    sitk.sitkInt8: sitk.sitkVectorInt8,
+    sitk.sitkUInt16: sitk.sitkVectorUInt16,
+    sitk.sitkInt16: sitk.sitkVectorInt16,
+    sitk.sitkUInt32: sitk.sitkVectorUInt32,
+    sitk.sitkInt32: sitk.sitkVectorInt32,
+    sitk.sitkUInt64: sitk.sitkVectorUInt64,
+    sitk.sitkInt64: sitk.sitkVectorInt64,
+    sitk.sitkFloat32: sitk.sitkVectorFloat32,
+    sitk.sitkFloat64: sitk.sitkVectorFloat64,
+}
 
 
 class Resampler(object):
 
+    ##
+    # Resample a moving image onto the (possibly altered) grid of a fixed
+    # image.
+    #
+    # Moving images can be 2D/3D scalar images, multi-component (vector)
+    # images or 3D time series (4D images). For the latter, volumes are
+    # resampled in chunks of \p volumes_per_chunk volumes as vector images so
+    # that the spatial transform is evaluated only once per voxel and chunk.
+    # \date       2026-10-18 09:41:12+0100
+    #
+    # \param      path_to_fixed      Path to fixed image defining the
+    #                                resampling space. If 4D, the grid of its
+    #                                first volume is used
+    # \param      path_to_moving     Path to moving image
+    # \param      path_to_transform  Path to transform or displacement field
+    # \param      interpolator       Interpolator
+    # \param      spacing            Spacing for resampling grid
+    # \param      padding            Padding value
+    # \param      add_to_grid        Grid extension/reduction in mm
+    # \param      path_to_mask       Path to mask defining the region of
+    #                                interest (ROI). Only voxels within its
+    #                                bounding box are resampled and voxels
+    #                                outside the mask are set to padding
+    # \param      crop               If True, the output grid is cropped to
+    #                                the bounding box of the ROI. Otherwise,
+    #                                the full grid is kept
+    # \param      pyramid_factors    Optional list of integer factors to
+    #                                obtain a multi-resolution pyramid. The
+    #                                image is resampled once at \p spacing and
+    #                                each level is derived by anti-aliased
+    #                                decimation by its factor. All levels are
+    #                                written with suffix of their spacing
+    #                                (see get_pyramid_filename in
+    #                                simplereg.numpy_resampler)
+    # \param      volumes_per_chunk  Number of volumes of a 4D moving image
+    #                                resampled at once; int
+    # \param      backend            Resampling backend; either "sitk"
+    #                                (SimpleITK/WrapITK) or "numpy"
+    #                                (NumPy/SciPy on memory-mapped arrays,
+    #                                see simplereg.numpy_resampler)
+    # \param      precision          Floating point precision of images
+    #                                throughout reading, resampling and
+    #                                writing; either "float32", "float64" or
+    #                                None (package-wide default PRECISION).
+    #                                Displacement fields used as transforms
+    #                                are always kept in float64 as required
+    #                                by sitk.DisplacementFieldTransform
+    # \param      verbose            Turn on/off verbose output
+    #
     def __init__(self,
                  path_to_fixed,
                  path_to_moving,
@@ -34,6 +96,12 @@ class Resampler(object):
                  spacing=None,
                  padding=0,
                  add_to_grid=0,
+                 path_to_mask=None,
+                 crop=False,
+                 pyramid_factors=None,
+                 volumes_per_chunk=16,
+                 backend="sitk",
+                 precision=None,
                  verbose=0,
                  ):
 
@@ -44,81 +112,93 @@ class Resampler(object):
         self._spacing = spacing
         self._padding = padding
         self._add_to_grid = add_to_grid
+        self._path_to_mask = path_to_mask
+        self._crop = crop
+        self._pyramid_factors = pyramid_factors
+        self._volumes_per_chunk = volumes_per_chunk
+        self._backend = backend
+        self._precision = precision
         self._verbose = verbose
 
         self._warped_moving_sitk = None
-        self._warped_moving_itk = None
+        self._warped_moving_nib = None
+        self._pyramid = None
 
     def write_image(self, path_to_output):
-        if self._warped_moving_sitk is not None:
+        if self._pyramid is not None:
+            for spacing, image in self._pyramid:
+                dw.DataWriter.write_image(
+                    image, npr.get_pyramid_filename(path_to_output, spacing),
+                    verbose=self._verbose, precision=self._precision)
+        elif self._warped_moving_sitk is not None:
             dw.DataWriter.write_image(
-                self._warped_moving_sitk, path_to_output)
+                self._warped_moving_sitk, path_to_output,
+                precision=self._precision)
         else:
             dw.DataWriter.write_image(
-                self._warped_moving_itk, path_to_output)
+                self._warped_moving_nib, path_to_output)
 
     def run(self):
-        # Possible to use _run_itk for all interpolators. However, loading of
-        # itk library takes noticeably longer. Hence, only use it when required
-        if self._interpolator in ["OrientedGaussian"]:
-            if self._path_to_transform is not None:
-                # This could be implemented for rigid transformations.
-                # For affine, or even displacement fields, it is not quite
-                # clear how a PSF-transformed option shall look like.
-                raise ValueError(
-                    "OrientedGaussian interpolation does not allow a "
-                    "transformation during resampling.")
-            self._run_itk()
+        if self._backend not in ["sitk", "numpy"]:
+            raise ValueError(
+                "Backend '%s' not known. Allowed options are: sitk, numpy" %
+                self._backend)
+
+        # Some interpolators are provided by the numpy backend only
+        if self._backend == "numpy" or \
+                self._interpolator in ["OrientedGaussian", "LabelLinear"]:
+            self._run_numpy()
         else:
             self._run_sitk()
 
-    def _run_itk(self):
-        # read input
-        fixed_itk = dr.DataReader.read_image(self._path_to_fixed, as_itk=1)
-        moving_itk = dr.DataReader.read_image(self._path_to_moving, as_itk=1)
-
-        # get image resampling information
-        size, origin, spacing, direction = self.get_space_resampling_properties(
-            image_sitk=fixed_itk,
+        if self._pyramid_factors is not None:
+            self._run_pyramid()
+
+    def _run_pyramid(self):
+        # Avoid mixing of labels
+        smooth = self._interpolator not in [
+            "NearestNeighbor", "0", "LabelLinear"]
+
+        self._pyramid = []
+        for factor in self._pyramid_factors:
+            if self._warped_moving_sitk is not None:
+                image = self.get_decimated_image_sitk(
+                    self._warped_moving_sitk, factor, smooth=smooth)
+                dim = min(image.GetDimension(), 3)
+                spacing = image.GetSpacing()[0:dim]
+            else:
+                image = npr.get_decimated_nib(
+                    self._warped_moving_nib, factor, smooth=smooth)
+                spacing = npr.get_grid_from_nib(image)[2]
+            self._pyramid.append((spacing, image))
+
+    def _run_numpy(self):
+        resampler = npr.NumpyResampler(
+            path_to_fixed=self._path_to_fixed,
+            path_to_moving=self._path_to_moving,
+            path_to_transform=self._path_to_transform,
+            interpolator=self._interpolator,
             spacing=self._spacing,
+            padding=self._padding,
             add_to_grid=self._add_to_grid,
-            add_to_grid_unit="mm")
-
-        if self._path_to_transform is not None:
-            transform_itk = dr.DataReader.read_transform(
-                self._path_to_transform, as_itk=1)
-        else:
-            transform_itk = getattr(
-                itk, "Euler%dDTransform" % fixed_itk.GetImageDimension()).New()
-
-        interpolator_itk = self._convert_interpolator_itk(
-            fixed_itk,
-            moving_itk,
-            spacing,
-            self._interpolator,
-            alpha_cut=3,
+            path_to_mask=self._path_to_mask,
+            crop=self._crop,
+            precision=self._precision,
+            verbose=self._verbose,
         )
-
-        # resample image
-        resampler_itk = itk.ResampleImageFilter[
-            type(moving_itk), type(fixed_itk)].New()
-        resampler_itk.SetInput(moving_itk)
-        resampler_itk.SetSize(size)
-        resampler_itk.SetTransform(transform_itk)
-        resampler_itk.SetInterpolator(interpolator_itk)
-        resampler_itk.SetOutputOrigin(origin)
-        resampler_itk.SetOutputSpacing(spacing)
-        resampler_itk.SetOutputDirection(fixed_itk.GetDirection())
-        resampler_itk.SetDefaultPixelValue(self._padding)
-        resampler_itk.UpdateLargestPossibleRegion()
-        resampler_itk.Update()
-        self._warped_moving_itk = resampler_itk.GetOutput()
-        self._warped_moving_itk.DisconnectPipeline()
+        resampler.run()
+        self._warped_moving_nib = resampler.get_warped_moving_nib()
 
     def _run_sitk(self):
         # read input
-        fixed_sitk = dr.DataReader.read_image(self._path_to_fixed)
-        moving_sitk = dr.DataReader.read_image(self._path_to_moving)
+        fixed_sitk = dr.DataReader.read_image(
+            self._path_to_fixed, precision=self._precision)
+        moving_sitk = dr.DataReader.read_image(
+            self._path_to_moving, precision=self._precision)
+
+        # Resampling space of a time series is given by its first volume
+        if fixed_sitk.GetDimension() == 4:
+            fixed_sitk = fixed_sitk[:, :, :, 0]
 
         # get image resampling information
         size, origin, spacing, direction = self.get_space_resampling_properties(
@@ -127,6 +207,17 @@ class Resampler(object):
             add_to_grid=self._add_to_grid,
             add_to_grid_unit="mm")
 
+        # Restrict resampling to bounding box of ROI
+        if self._path_to_mask is not None:
+            mask_sitk = dr.DataReader.read_image(self._path_to_mask)
+            mask_sitk = self.get_resampled_mask_sitk(
+                mask_sitk, size, origin, spacing, direction)
+            roi = npr.get_roi_nda(
+                sitk.GetArrayViewFromImage(mask_sitk).transpose())
+            mask_sitk = mask_sitk[roi]
+            size_full, origin_full = size, origin
+            size, origin = npr.get_roi_grid(roi, origin, spacing, direction)
+
         if self._path_to_transform is not None:
             transform_sitk = dr.DataReader.read_transform(
                 self._path_to_transform)
@@ -134,129 +225,314 @@ class Resampler(object):
             transform_sitk = getattr(
                 sitk, "Euler%dDTransform" % fixed_sitk.GetDimension())()
 
+        # Vector images keep their pixel type (e.g. displacement fields).
+        # Vector fixed images define the grid only.
+        if moving_sitk.GetNumberOfComponentsPerPixel() > 1 or \
+                fixed_sitk.GetNumberOfComponentsPerPixel() > 1:
+            pixel_id = moving_sitk.GetPixelIDValue()
+        else:
+            pixel_id = fixed_sitk.GetPixelIDValue()
+
         # resample image
-        self._warped_moving_sitk = sitk.Resample(
-            moving_sitk,
-            size,
-            transform_sitk,
-            self._convert_interpolator_sitk(self._interpolator),
+        if moving_sitk.GetDimension() == 4:
+            self._warped_moving_sitk = self.get_resampled_time_series_sitk(
+                moving_sitk,
+                size,
+                transform_sitk,
+                self._convert_interpolator_sitk(self._interpolator),
+                origin,
+                spacing,
+                direction,
+                float(self._padding),
+                pixel_id,
+                volumes_per_chunk=self._volumes_per_chunk,
+            )
+        else:
+            # Avoid interpolation if grids are related trivially
+            self._warped_moving_sitk = \
+                self.get_trivially_resampled_image_sitk(
+                    moving_sitk,
+                    size,
+                    transform_sitk,
+                    self._convert_interpolator_sitk(self._interpolator),
+                    origin,
+                    spacing,
+                    direction,
+                    float(self._padding),
+                    pixel_id,
+                )
+            if self._warped_moving_sitk is None:
+                self._warped_moving_sitk = sitk.Resample(
+                    moving_sitk,
+                    size,
+                    transform_sitk,
+                    self._convert_interpolator_sitk(self._interpolator),
+                    origin,
+                    spacing,
+                    direction,
+                    float(self._padding),
+                    pixel_id,
+                )
+
+        if self._path_to_mask is not None:
+            self._warped_moving_sitk = self.get_roi_masked_image_sitk(
+                self._warped_moving_sitk, mask_sitk, self._padding)
+            if not self._crop:
+                self._warped_moving_sitk = self.get_roi_padded_image_sitk(
+                    self._warped_moving_sitk, roi, size_full, origin_full,
+                    self._padding)
+
+    ##
+    # Resample a mask onto a grid using nearest neighbour interpolation
+    # \date       2026-10-18 16:05:12+0100
+    #
+    # \param      mask_sitk  Mask as sitk.Image object
+    # \param      size       Size of grid
+    # \param      origin     Origin of grid
+    # \param      spacing    Spacing of grid
+    # \param      direction  Direction of grid
+    #
+    # \return     Resampled mask as sitk.Image object
+    #
+    @staticmethod
+    def get_resampled_mask_sitk(mask_sitk, size, origin, spacing, direction):
+        args = (
+            mask_sitk,
+            [int(i) for i in size],
+            getattr(sitk, "Euler%dDTransform" % mask_sitk.GetDimension())(),
+            sitk.sitkNearestNeighbor,
             origin,
             spacing,
             direction,
-            float(self._padding),
-            fixed_sitk.GetPixelIDValue(),
+            0.,
+            mask_sitk.GetPixelIDValue(),
         )
+        resampled_mask_sitk = Resampler.get_trivially_resampled_image_sitk(
+            *args)
+        if resampled_mask_sitk is None:
+            resampled_mask_sitk = sitk.Resample(*args)
+        return resampled_mask_sitk
 
+    ##
+    # Set all voxels outside a mask to the padding value.
+    # \date       2026-10-18 16:05:12+0100
+    #
+    # \param      image_sitk  2D/3D (vector) image or 3D time series (4D) as
+    #                         sitk.Image object
+    # \param      mask_sitk   Mask on the (spatial) grid of the image as
+    #                         sitk.Image object
+    # \param      padding     Padding value
+    #
+    # \return     Masked image as sitk.Image object
+    #
     @staticmethod
-    def _convert_interpolator_sitk(interpolator):
-        if interpolator.isdigit():
-            if int(interpolator) == 0:
-                interpolator = "NearestNeighbor"
-            elif int(interpolator) == 1:
-                interpolator = "Linear"
-            else:
-                raise ValueError(
-                    "Interpolator order not known. Allowed options are: 0, 1")
-        if interpolator not in ALLOWED_INTERPOLATORS:
-            raise ValueError(
-                "Interpolator not known. Allowed options are: %s" % (
-                    ", ".join(ALLOWED_INTERPOLATORS)))
-
-        return getattr(sitk, "sitk%s" % interpolator)
-
-    def _convert_interpolator_itk(
-        self,
-        fixed_itk,
-        moving_itk,
-        spacing,
-        interpolator,
-        alpha_cut,
-        pixel_type=itk.D,
-    ):
-        if interpolator.isdigit():
-            if int(interpolator) == 0:
-                interpolator = "NearestNeighbor"
-            elif int(interpolator) == 1:
-                interpolator = "Linear"
-            else:
-                raise ValueError(
-                    "Interpolator order not known. Allowed options are: 0, 1")
-        if interpolator not in ALLOWED_INTERPOLATORS:
-            raise ValueError(
-                "Interpolator not known. Allowed options are: %s" % (
-                    ", ".join(ALLOWED_INTERPOLATORS)))
-
-        if interpolator == "OrientedGaussian":
-            cov = self._get_oriented_psf_covariance(
-                fixed_itk, moving_itk, spacing)
-            interpolator_itk = itk.OrientedGaussianInterpolateImageFunction[
-                type(fixed_itk), pixel_type].New()
-            interpolator_itk.SetCovariance(cov.flatten())
-            interpolator_itk.SetAlpha(alpha_cut)
+    def get_roi_masked_image_sitk(image_sitk, mask_sitk, padding):
+        nda = sitk.GetArrayFromImage(image_sitk)
+        mask_nda = sitk.GetArrayViewFromImage(mask_sitk) != 0
+        padding = npr.cast_nda(np.array(padding), nda.dtype)
+
+        # Array of time series is of shape (t, z, y, x)
+        if image_sitk.GetDimension() > mask_sitk.GetDimension():
+            nda[:, ~mask_nda] = padding
         else:
-            interpolator_itk = getattr(
-                itk, "%sInterpolateImageFunction" % interpolator)[
-                type(fixed_itk), pixel_type].New()
-        return interpolator_itk
-
-    def _get_oriented_psf_covariance(self, fixed_itk, moving_itk, spacing):
-
-        # Fixed axis-aligned covariance matrix representing the PSF
-        cov = self._get_psf_covariance(spacing)
-
-        # Express fixed axis-aligned PSF in moving space coordinates
-        fixed_direction = sitkh.get_sitk_from_itk_direction(
-            fixed_itk.GetDirection())
-        moving_direction = sitkh.get_sitk_from_itk_direction(
-            moving_itk.GetDirection())
-        U = self._get_rotation_matrix(fixed_direction, moving_direction)
-        cov = U.dot(cov).dot(U.transpose())
+            nda[~mask_nda] = padding
 
-        return cov
+        masked_image_sitk = sitk.GetImageFromArray(
+            nda, isVector=image_sitk.GetNumberOfComponentsPerPixel() > 1)
+        masked_image_sitk.CopyInformation(image_sitk)
+        return masked_image_sitk
 
     ##
-    # Compute (axis aligned) covariance matrix from spacing. The PSF is
-    # modelled as Gaussian with
-    #  *- FWHM = 1.2*in-plane-resolution (in-plane)
-    #  *- FWHM = slice thickness (through-plane)
-    # \date       2017-11-01 16:16:36+0000
+    # Paste an image resampled on the bounding box of a region of interest
+    # into its full grid filled with the padding value.
+    # \date       2026-10-18 16:05:12+0100
     #
-    # \param      spacing  3D array containing in-plane and through-plane
-    #                      dimensions
+    # \param      image_sitk  2D/3D (vector) image or 3D time series (4D) as
+    #                         sitk.Image object
+    # \param      roi         Bounding box of the image within the full grid as
+    #                         tuple of slices in (Simple)ITK index order
+    # \param      size        Size of full (spatial) grid
+    # \param      origin      Origin of full (spatial) grid
+    # \param      padding     Padding value
     #
-    # \return     (axis aligned) covariance matrix representing PSF modelled
-    #             Gaussian as 3x3 np.array
+    # \return     Padded image as sitk.Image object
     #
     @staticmethod
-    def _get_psf_covariance(spacing):
-        sigma2 = np.zeros_like(np.array(spacing))
-
-        # Compute Gaussian to approximate in-plane PSF:
-        sigma2[0:2] = (1.2 * spacing[0:2])**2 / (8 * np.log(2))
+    def get_roi_padded_image_sitk(image_sitk, roi, size, origin, padding):
+        nda = sitk.GetArrayViewFromImage(image_sitk)
+        dim = len(roi)
+
+        # Array of time series is of shape (t, z, y, x)
+        shape = list(nda.shape)
+        if image_sitk.GetDimension() > dim:
+            shape[1:] = size[::-1]
+            roi_nda = (slice(None), ) + roi[::-1]
+        else:
+            shape[0:dim] = size[::-1]
+            roi_nda = roi[::-1]
+
+        nda_padded = np.full(
+            shape, npr.cast_nda(np.array(padding), nda.dtype),
+            dtype=nda.dtype)
+        nda_padded[roi_nda] = nda
+
+        padded_image_sitk = sitk.GetImageFromArray(
+            nda_padded,
+            isVector=image_sitk.GetNumberOfComponentsPerPixel() > 1)
+        origin_padded = list(image_sitk.GetOrigin())
+        origin_padded[0:dim] = origin
+        padded_image_sitk.SetOrigin(origin_padded)
+        padded_image_sitk.SetSpacing(image_sitk.GetSpacing())
+        padded_image_sitk.SetDirection(image_sitk.GetDirection())
+        return padded_image_sitk
 
-        # Compute Gaussian to approximate through-plane PSF:
-        if sigma2.size == 3:
-            sigma2[2] = spacing[2]**2 / (8 * np.log(2))
+    ##
+    # Resample all volumes of a 3D time series (4D image) onto a 3D grid.
+    #
+    # Chunks of volumes are composed into a vector image so that the spatial
+    # transform and interpolation weights are computed once per voxel and
+    # shared across all volumes of the chunk. Each resampled chunk is written
+    # into the preallocated output so that only one chunk is held as
+    # additional copy in memory at a time.
+    # \date       2026-10-18 09:58:30+0100
+    #
+    # \param      image_sitk         4D image as sitk.Image object
+    # \param      size               Size of 3D resampling grid
+    # \param      transform_sitk     3D transform as sitk.Transform object
+    # \param      interpolator       Interpolator as sitk interpolator type
+    # \param      origin             Origin of 3D resampling grid
+    # \param      spacing            Spacing of 3D resampling grid
+    # \param      direction          Direction of 3D resampling grid
+    # \param      padding            Padding value
+    # \param      pixel_id           Pixel type of the output image; a vector
+    #                                pixel type denotes its component type
+    # \param      volumes_per_chunk  Number of volumes resampled at once; int
+    #
+    # \return     Resampled 4D image as sitk.Image object
+    #
+    @staticmethod
+    def get_resampled_time_series_sitk(
+            image_sitk,
+            size,
+            transform_sitk,
+            interpolator,
+            origin,
+            spacing,
+            direction,
+            padding,
+            pixel_id,
+            volumes_per_chunk=16):
+
+        if image_sitk.GetDimension() != 4:
+            raise ValueError("Time series must be a 4D image")
+
+        if image_sitk.GetNumberOfComponentsPerPixel() > 1:
+            raise ValueError("Time series of vector images are not supported")
+
+        n_volumes = image_sitk.GetSize()[3]
+        volumes_per_chunk = max(1, int(volumes_per_chunk))
+
+        # Output pixel type may be given as scalar or vector type
+        scalar_pixel_ids = dict(
+            (v, k) for k, v in VECTOR_PIXEL_TYPES_SITK.items())
+        if pixel_id in scalar_pixel_ids:
+            pixel_id = scalar_pixel_ids[pixel_id]
+        if pixel_id not in VECTOR_PIXEL_TYPES_SITK:
+            raise ValueError("Pixel type '%s' not supported for time series"
+                             % sitk.GetPixelIDValueAsString(pixel_id))
+
+        # Preallocated output; chunks are written into it directly so that
+        # only one resampled chunk is held in addition
+        resampled_image_sitk = Resampler._get_time_series_image_sitk(
+            size, origin, spacing, direction,
+            image_sitk.GetOrigin()[3], image_sitk.GetSpacing()[3],
+            n_volumes, pixel_id)
+
+        for i in range(0, n_volumes, volumes_per_chunk):
+            volumes_sitk = [
+                image_sitk[:, :, :, t]
+                for t in range(i, min(i + volumes_per_chunk, n_volumes))
+            ]
+            chunk_sitk = sitk.Resample(
+                sitk.Compose(volumes_sitk),
+                size,
+                transform_sitk,
+                interpolator,
+                origin,
+                spacing,
+                direction,
+                padding,
+                VECTOR_PIXEL_TYPES_SITK[pixel_id],
+            )
+            del volumes_sitk
+            resampled_image_sitk = Resampler._paste_time_series_chunk_sitk(
+                resampled_image_sitk, chunk_sitk, i)
+
+        if isinstance(resampled_image_sitk, np.ndarray):
+            nda = resampled_image_sitk
+            resampled_image_sitk = Resampler._get_time_series_image_sitk(
+                size, origin, spacing, direction,
+                image_sitk.GetOrigin()[3], image_sitk.GetSpacing()[3],
+                n_volumes, pixel_id, nda=nda)
 
-        return np.diag(sigma2)
+        return resampled_image_sitk
 
     ##
-    # Gets the relative rotation matrix to express fixed-axis aligned
-    # covariance matrix in coordinates of moving image
-    # \date       2016-10-14 16:37:57+0100
+    # Gets an empty (or given) 4D image of a time series on a 3D grid
+    # \date       2026-10-19 09:12:31+0100
     #
-    # \param      fixed_direction   fixed image direction
-    # \param      moving_direction  moving image direction
+    # \return     4D image as sitk.Image object
+    #
+    @staticmethod
+    def _get_time_series_image_sitk(size, origin, spacing, direction,
+                                    origin_t, spacing_t, n_volumes, pixel_id,
+                                    nda=None):
+        if nda is None:
+            image_sitk = sitk.Image(
+                [int(s) for s in size] + [int(n_volumes)], pixel_id)
+        else:
+            image_sitk = sitk.GetImageFromArray(nda)
+        direction_4D = np.eye(4)
+        direction_4D[0:3, 0:3] = np.array(direction).reshape(3, 3)
+        image_sitk.SetOrigin(tuple(origin) + (origin_t, ))
+        image_sitk.SetSpacing(tuple(spacing) + (spacing_t, ))
+        image_sitk.SetDirection(tuple(direction_4D.flatten()))
+        return image_sitk
+
+    ##
+    # Write the volumes of a resampled chunk (vector image) into the 4D
+    # output starting at volume index t0. The output is updated in place
+    # (SimpleITK >= 2.0); otherwise it is replaced by a preallocated array
+    # of the time series which is filled instead.
+    # \date       2026-10-19 09:12:31+0100
     #
-    # \return     The relative rotation matrix as 3x3 numpy array
+    # \return     4D output as sitk.Image object or np.array (t, z, y, x)
     #
     @staticmethod
-    def _get_rotation_matrix(fixed_direction, moving_direction):
-        dim = np.sqrt(np.array(fixed_direction).size).astype(np.uint8)
-        fixed_direction = np.array(fixed_direction).reshape(dim, dim)
-        moving_direction = np.array(moving_direction).reshape(dim, dim)
+    def _paste_time_series_chunk_sitk(resampled_image_sitk, chunk_sitk, t0):
+        n_components = chunk_sitk.GetNumberOfComponentsPerPixel()
+
+        if isinstance(resampled_image_sitk, sitk.Image):
+            try:
+                for j in range(n_components):
+                    resampled_image_sitk[:, :, :, t0 + j] = \
+                        sitk.VectorIndexSelectionCast(chunk_sitk, j)
+                return resampled_image_sitk
+            except (IndexError, TypeError):
+                # No in-place slice assignment available
+                resampled_image_sitk = np.zeros(
+                    resampled_image_sitk.GetSize()[::-1],
+                    dtype=sitk.GetArrayViewFromImage(chunk_sitk).dtype)
+
+        chunk_nda = sitk.GetArrayViewFromImage(chunk_sitk)
+        resampled_image_sitk[t0:t0 + n_components] = np.moveaxis(
+            chunk_nda.reshape(chunk_nda.shape[0:3] + (n_components, )), -1, 0)
+        return resampled_image_sitk
 
-        return moving_direction.transpose().dot(fixed_direction)
+    @staticmethod
+    def _convert_interpolator_sitk(interpolator):
+        return getattr(
+            sitk, "sitk%s" % npr.get_interpolator_name(interpolator))
 
     ##
     # Gets the space resampling properties given an image an optional
@@ -283,70 +559,30 @@ class Resampler(object):
         add_to_grid_unit="mm",
     ):
 
-        if not isinstance(image_sitk, (sitk.Image, itk.Image.D3, itk.Image.SS3)):
+        # itk.Image objects are recognised by their buffered region so that
+        # ITK (WrapITK) does not need to be imported
+        if not isinstance(image_sitk, sitk.Image) and \
+                not hasattr(image_sitk, "GetBufferedRegion"):
             raise IOError("Image must be of type sitk.Image or itk.Image")
 
         # Read input image information:
-        spacing_in = np.array(image_sitk.GetSpacing())
-        origin_out = np.array(image_sitk.GetOrigin())
         if isinstance(image_sitk, sitk.Image):
-            size_in = np.array(image_sitk.GetSize()).astype(int)
-            direction_out = np.array(image_sitk.GetDirection())
+            size = image_sitk.GetSize()
+            direction = image_sitk.GetDirection()
         else:
-            size_in = np.array(image_sitk.GetBufferedRegion().GetSize())
-            direction_out = np.array(
-                sitkh.get_sitk_from_itk_direction(image_sitk.GetDirection()))
-        dim = len(origin_out)
-
-        # Check given spacing information for grid resampling
-        if spacing is not None:
-            spacing_out = np.atleast_1d(spacing).astype(np.float64)
-            if spacing_out.size != 1 and spacing_out.size != dim:
-                raise IOError(
-                    "spacing information for resampling must either match the "
-                    "image dimension or is 1D (isotropic resampling)")
-            if spacing_out.size == 1:
-                spacing_out = np.ones(dim) * spacing_out[0]
-        else:
-            spacing_out = spacing_in
-
-        # Check given (optional) add_to_grid information
-        if add_to_grid is not None:
-            add_to_grid = np.atleast_1d(add_to_grid)
-            if add_to_grid.size != 1 and add_to_grid.size != dim:
-                raise IOError(
-                    "add_to_grid must either match the image "
-                    "dimension or is 1D (uniform change)")
-            if add_to_grid.size == 1:
-                add_to_grid = np.ones(dim) * add_to_grid[0]
-
-            # Get scaling for offset and grid change in (continuous) voxels
-            if add_to_grid_unit == "mm":
-                scale = add_to_grid
-                add_to_grid_vox = add_to_grid / spacing_out
-            else:
-                scale = add_to_grid / spacing_out
-                add_to_grid_vox = add_to_grid
-
-            # Offset origin to account for change in grid size
-            offset = np.eye(dim)
-            for i in range(dim):
-                # For Python3: Get standard integers; otherwise error
-                index = [int(j) for j in offset[:, i]]
-                offset[:, i] = image_sitk.TransformIndexToPhysicalPoint(index)
-                offset[:, i] -= origin_out
-                offset[:, i] /= np.linalg.norm(offset[:, i])
-            origin_out -= np.sum(offset, axis=1) * scale
-        else:
-            add_to_grid_vox = 0
-
-        size_out = size_in * spacing_in / spacing_out + 2 * add_to_grid_vox
-        size_out = np.round(size_out).astype(int)
-
-        # For Python3: sitk.Resample in Python3 does not like np.int types!
-        size_out = [int(i) for i in size_out]
-
-        return size_out, origin_out, spacing_out, direction_out
+            size = image_sitk.GetBufferedRegion().GetSize()
+            direction = sitkh.get_sitk_from_itk_direction(
+                image_sitk.GetDirection())
+
+        return npr.get_space_resampling_properties(
+            size=size,
+            origin=image_sitk.GetOrigin(),
+            spacing_in=image_sitk.GetSpacing(),
+            direction=direction,
+            spacing=spacing,
+            add_to_grid=add_to_grid,
+            add_to_grid_unit=add_to_grid_unit,
+        )
 
     ##
     # Gets the resampled image sitk.
@@ -374,10 +610,13 @@ class Resampler(object):
             image_sitk=image_sitk, spacing=spacing, add_to_grid=add_to_grid,
             add_to_grid_unit=add_to_grid_unit)
 
-        resampled_image_sitk = sitk.Resample(
+        transform_sitk = getattr(
+            sitk, "Euler%dDTransform" % image_sitk.GetDimension())()
+
+        resampled_image_sitk = Resampler.get_trivially_resampled_image_sitk(
             image_sitk,
             size,
-            getattr(sitk, "Euler%dDTransform" % image_sitk.GetDimension())(),
+            transform_sitk,
             interpolator,
             origin,
             spacing,
@@ -385,5 +624,236 @@ class Resampler(object):
             padding,
             image_sitk.GetPixelIDValue()
         )
+        if resampled_image_sitk is None:
+            resampled_image_sitk = sitk.Resample(
+                image_sitk,
+                size,
+                transform_sitk,
+                interpolator,
+                origin,
+                spacing,
+                direction,
+                padding,
+                image_sitk.GetPixelIDValue()
+            )
+
+        return resampled_image_sitk
+
+    ##
+    # Gets a multi-resolution pyramid of an image. The image is resampled once
+    # at the given spacing from which all levels are derived by anti-aliased
+    # decimation.
+    # \date       2026-10-18 16:48:20+0100
+    #
+    # \param      image_sitk        Image as sitk.Image object
+    # \param      factors           Decimation factors of pyramid levels
+    #                               relative to spacing; list of int
+    # \param      spacing           Spacing of finest level
+    # \param      interpolator      Interpolator as sitk interpolator type
+    # \param      padding           Padding value
+    # \param      add_to_grid       Grid extension/reduction
+    # \param      add_to_grid_unit  Unit of add_to_grid, i.e. "mm" or voxels
+    #
+    # \return     Pyramid levels as list of sitk.Image objects
+    #
+    @staticmethod
+    def get_resampled_pyramid_sitk(
+            image_sitk,
+            factors,
+            spacing=None,
+            interpolator=sitk.sitkLinear,
+            padding=0,
+            add_to_grid=None,
+            add_to_grid_unit="mm"):
+
+        resampled_image_sitk = Resampler.get_resampled_image_sitk(
+            image_sitk,
+            spacing=spacing,
+            interpolator=interpolator,
+            padding=padding,
+            add_to_grid=add_to_grid,
+            add_to_grid_unit=add_to_grid_unit,
+        )
+        smooth = interpolator != sitk.sitkNearestNeighbor
+
+        return [
+            Resampler.get_decimated_image_sitk(
+                resampled_image_sitk, factor, smooth=smooth)
+            for factor in factors
+        ]
+
+    ##
+    # Decimate an image spatially by an integer factor. See
+    # simplereg.numpy_resampler.get_decimated_nda
+    # \date       2026-10-18 16:48:20+0100
+    #
+    # \param      image_sitk  2D/3D (vector) image or 3D time series (4D) as
+    #                         sitk.Image object
+    # \param      factor      Spatial decimation factor; int
+    # \param      smooth      Turn on/off anti-aliasing; bool
+    #
+    # \return     Decimated image as sitk.Image object
+    #
+    @staticmethod
+    def get_decimated_image_sitk(image_sitk, factor, smooth=True):
+        nda = sitk.GetArrayViewFromImage(image_sitk)
+        dim = min(image_sitk.GetDimension(), 3)
+
+        # Array of time series is of shape (t, z, y, x), of vector image of
+        # shape (z, y, x, c)
+        factors = [factor] * dim
+        if image_sitk.GetDimension() > dim:
+            factors = [1] + factors
+        elif image_sitk.GetNumberOfComponentsPerPixel() > 1:
+            factors = factors + [1]
+
+        decimated_image_sitk = sitk.GetImageFromArray(
+            npr.get_decimated_nda(nda, factors, smooth=smooth),
+            isVector=image_sitk.GetNumberOfComponentsPerPixel() > 1)
+        spacing = np.array(image_sitk.GetSpacing())
+        spacing[0:dim] *= int(factor)
+        decimated_image_sitk.SetOrigin(image_sitk.GetOrigin())
+        decimated_image_sitk.SetSpacing(spacing)
+        decimated_image_sitk.SetDirection(image_sitk.GetDirection())
+
+        return decimated_image_sitk
+
+    ##
+    # Resample an image without interpolation in case its grid is trivially
+    # related to the resampling grid.
+    #
+    # Trivial relationships are given if every voxel of the resampling grid
+    # maps exactly onto a voxel of the image. This covers identical grids
+    # (copy), axis permutations and flips (array views), integer-factor
+    # downsampling (strided array views) and integer voxel shifts (crop/pad).
+    # In all these cases the result is identical to sitk.Resample with
+    # nearest neighbor or linear interpolation since the image is only
+    # evaluated at voxel centers.
+    # \date       2026-10-18 11:02:17+0100
+    #
+    # \param      image_sitk      Image as sitk.Image object
+    # \param      size            Size of resampling grid
+    # \param      transform_sitk  Transform as sitk.Transform object
+    # \param      interpolator    Interpolator as sitk interpolator type
+    # \param      origin          Origin of resampling grid
+    # \param      spacing         Spacing of resampling grid
+    # \param      direction       Direction of resampling grid
+    # \param      padding         Padding value
+    # \param      pixel_id        Pixel type of output image
+    # \param      tolerance       Tolerance (in voxels) to accept the grid
+    #                             relationship as trivial
+    #
+    # \return     Resampled image as sitk.Image object; None if the grids are
+    #             not trivially related
+    #
+    @staticmethod
+    def get_trivially_resampled_image_sitk(
+            image_sitk,
+            size,
+            transform_sitk,
+            interpolator,
+            origin,
+            spacing,
+            direction,
+            padding,
+            pixel_id,
+            tolerance=1e-6):
+
+        if interpolator not in [sitk.sitkNearestNeighbor, sitk.sitkLinear]:
+            return None
+
+        # Do not deal with intensity casting here
+        if pixel_id != image_sitk.GetPixelIDValue():
+            return None
+
+        if not transform_sitk.IsLinear():
+            return None
+
+        dim = image_sitk.GetDimension()
+        if len(size) != dim:
+            return None
+
+        # Get affine representation T(x) = L x + t of the transform
+        t = np.array(transform_sitk.TransformPoint((0.,) * dim))
+        L = np.array([
+            transform_sitk.TransformPoint(tuple(e)) for e in np.eye(dim)
+        ]).transpose() - t[:, np.newaxis]
+
+        # Map resampling grid indices i onto image indices A i + b
+        M_in = np.array(image_sitk.GetDirection()).reshape(dim, dim).dot(
+            np.diag(image_sitk.GetSpacing()))
+        M_out = np.array(direction).reshape(dim, dim).dot(np.diag(spacing))
+        M_in_inv = np.linalg.inv(M_in)
+        A = M_in_inv.dot(L).dot(M_out)
+        b = M_in_inv.dot(
+            L.dot(np.array(origin)) + t - np.array(image_sitk.GetOrigin()))
+
+        A_int = np.round(A)
+        b_int = np.round(b)
+        if np.max(np.abs(A - A_int)) > tolerance or \
+                np.max(np.abs(b - b_int)) > tolerance:
+            return None
+
+        # Each output axis must map onto exactly one image axis
+        if np.any(np.sum(A_int != 0, axis=0) != 1) or \
+                np.any(np.sum(A_int != 0, axis=1) != 1):
+            return None
+        A_int = A_int.astype(int)
+        b_int = b_int.astype(int)
+
+        size_in = np.array(image_sitk.GetSize())
+        n_components = image_sitk.GetNumberOfComponentsPerPixel()
+        axes_components = (dim, ) if n_components > 1 else ()
+
+        # Identical grids
+        if np.all(A_int == np.eye(dim)) and np.all(b_int == 0) and \
+                np.all(size_in == np.array(size)):
+            resampled_image_sitk = sitk.GetImageFromArray(
+                sitk.GetArrayViewFromImage(image_sitk),
+                isVector=n_components > 1)
+
+        else:
+            # Data arrays in x, y [, z] order
+            nda_in = sitk.GetArrayViewFromImage(image_sitk)
+            nda_in = nda_in.transpose(tuple(range(dim))[::-1] + axes_components)
+            nda_out = np.empty(
+                tuple(size[::-1]) + nda_in.shape[dim:], dtype=nda_in.dtype)
+            nda_out[...] = padding
+            nda_out_xyz = nda_out.transpose(
+                tuple(range(dim))[::-1] + axes_components)
+
+            # Permutations and flips as views on image data array
+            permutation = [int(np.nonzero(A_int[:, j])[0][0])
+                           for j in range(dim)]
+            nda_in = nda_in.transpose(tuple(permutation) + axes_components)
+
+            slices_in = []
+            slices_out = []
+            for j, p in enumerate(permutation):
+                step = A_int[p, j]
+                indices = b_int[p] + step * np.arange(size[j])
+                valid = np.nonzero((indices >= 0) & (indices < size_in[p]))[0]
+
+                # Resampling grid does not overlap with image
+                if valid.size == 0:
+                    slices_in = None
+                    break
+
+                # Strides and shifts as crop/pad
+                start = indices[valid[0]]
+                stop = indices[valid[-1]] + np.sign(step)
+                slices_in.append(slice(
+                    int(start), int(stop) if stop >= 0 else None, int(step)))
+                slices_out.append(slice(int(valid[0]), int(valid[-1]) + 1))
+
+            if slices_in is not None:
+                nda_out_xyz[tuple(slices_out)] = nda_in[tuple(slices_in)]
+
+            resampled_image_sitk = sitk.GetImageFromArray(
+                nda_out, isVector=n_components > 1)
+
+        resampled_image_sitk.SetOrigin(tuple(origin))
+        resampled_image_sitk.SetSpacing(tuple(spacing))
+        resampled_image_sitk.SetDirection(tuple(direction))
 
         return resampled_image_sitk
@@ -0,0 +1,258 @@
+##
+# \file scratch_store.py
+# \brief      Content-addressed store of (uncompressed) NIfTI images shared by
+#             wrapper registrations
+#
+# Images are keyed by a hash of their header and pixel buffer so that an image
+# used by many registrations, e.g. the fixed atlas image of atlas-to-many
+# registrations, is written only once and referenced by all later runs, also
+# across processes. Referenced files hold a shared file lock (fcntl.flock);
+# once the store exceeds its byte budget, least recently used files which are
+# not referenced by any process are evicted.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import fcntl
+import hashlib
+import tempfile
+import threading
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+
+import simplereg.precision as prec
+import simplereg.data_writer as dw
+from simplereg.definitions import DIR_SCRATCH
+
+
+class ScratchStore(object):
+
+    ##
+    # Open (or create) scratch store
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \param      directory  Directory of stored images (possibly shared by
+    #                        several processes). If None, the subfolder
+    #                        'store' in DIR_SCRATCH is used
+    # \param      max_bytes  Byte budget of store; int. Unreferenced files
+    #                        are evicted once exceeded
+    #
+    def __init__(self, directory=None, max_bytes=2**32):
+        if directory is None:
+            directory = os.path.join(DIR_SCRATCH, "store")
+        ph.create_directory(directory)
+
+        self._directory = directory
+        self._max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+
+        # Path of referenced file -> [locked file object, reference count]
+        self._references = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_directory(self):
+        return self._directory
+
+    ##
+    # Gets the key of an image, i.e. a hash of its header, pixel buffer and
+    # the precision it is written with.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \param      image_sitk  Image as sitk.Image object
+    #
+    # \return     Key as hexadecimal string
+    #
+    @staticmethod
+    def get_key(image_sitk):
+        header = (
+            image_sitk.GetSize(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetOrigin(),
+            image_sitk.GetDirection(),
+            image_sitk.GetPixelIDValue(),
+            image_sitk.GetNumberOfComponentsPerPixel(),
+            prec.get_precision(),
+        )
+        h = hashlib.sha256(repr(header).encode())
+        h.update(sitk.GetArrayViewFromImage(image_sitk).data)
+        return h.hexdigest()[0:32]
+
+    ##
+    # Gets the path to the stored file of an image. The image is written only
+    # if it is not stored yet. The file is referenced until it is released.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \param      image_sitk  Image as sitk.Image object
+    #
+    # \return     Path to stored (uncompressed) NIfTI file
+    #
+    def acquire(self, image_sitk):
+        path_to_file = os.path.join(
+            self._directory, "%s.nii" % self.get_key(image_sitk))
+
+        with self._lock:
+            if path_to_file in self._references:
+                self._references[path_to_file][1] += 1
+                self._hits += 1
+                return path_to_file
+
+            fin = self._open_stored_file(path_to_file)
+            if fin is not None:
+                self._hits += 1
+            else:
+                fin = self._write_stored_file(image_sitk, path_to_file)
+                self._misses += 1
+            self._references[path_to_file] = [fin, 1]
+
+        self.evict()
+        return path_to_file
+
+    ##
+    # Release a reference of a stored file obtained by acquire.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \param      path_to_file  Path to stored file
+    #
+    def release(self, path_to_file):
+        with self._lock:
+            if path_to_file not in self._references:
+                return
+            self._references[path_to_file][1] -= 1
+            if self._references[path_to_file][1] > 0:
+                return
+            self._references.pop(path_to_file)[0].close()
+
+        self.evict()
+
+    ##
+    # Remove least recently used files which are not referenced by any
+    # process until the byte budget is met.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \param      max_bytes  Byte budget; int. If None, the store's budget is
+    #                        used (0 removes all unreferenced files)
+    #
+    def evict(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = self._max_bytes
+
+        entries = []
+        for name in os.listdir(self._directory):
+            if name.startswith(".") or not name.endswith(".nii"):
+                continue
+            path_to_file = os.path.join(self._directory, name)
+            try:
+                stat = os.stat(path_to_file)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path_to_file))
+
+        n_bytes = sum(e[1] for e in entries)
+        for _, size, path_to_file in sorted(entries):
+            if n_bytes <= max_bytes:
+                break
+            if self._remove_unreferenced_file(path_to_file):
+                n_bytes -= size
+                with self._lock:
+                    self._evictions += 1
+
+    ##
+    # Gets the store statistics
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \return     Dictionary with number of hits, misses, evictions and files
+    #             referenced by this process as well as the byte budget
+    #
+    def get_statistics(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "references": sum(r[1] for r in self._references.values()),
+                "max_bytes": self._max_bytes,
+            }
+
+    ##
+    # Open a stored file and hold a shared lock on it. Its modification time
+    # is updated to mark it as recently used.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \return     Locked file object; None if the file is not stored
+    #
+    @staticmethod
+    def _open_stored_file(path_to_file):
+        try:
+            fin = open(path_to_file, "rb")
+        except IOError:
+            return None
+
+        fcntl.flock(fin, fcntl.LOCK_SH)
+
+        # File may have been evicted in the meantime
+        if os.fstat(fin.fileno()).st_nlink == 0:
+            fin.close()
+            return None
+
+        os.utime(path_to_file)
+        return fin
+
+    ##
+    # Write an image into the store. The file is written under a temporary
+    # name and (locked) moved into place so that concurrent writers and
+    # readers never see incomplete files.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \return     Locked file object
+    #
+    def _write_stored_file(self, image_sitk, path_to_file):
+        fd, path_to_tmp = tempfile.mkstemp(
+            prefix=".", suffix=".nii", dir=self._directory)
+        os.close(fd)
+        try:
+            dw.DataWriter.write_image(image_sitk, path_to_tmp)
+            fin = open(path_to_tmp, "rb")
+            fcntl.flock(fin, fcntl.LOCK_SH)
+            # Atomically replaces existing files (POSIX, see fcntl)
+            os.rename(path_to_tmp, path_to_file)
+        except BaseException:
+            if os.path.isfile(path_to_tmp):
+                os.remove(path_to_tmp)
+            raise
+        return fin
+
+    ##
+    # Remove a stored file unless it is referenced by any process.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \return     True if removed, False otherwise
+    #
+    @staticmethod
+    def _remove_unreferenced_file(path_to_file):
+        try:
+            fin = open(path_to_file, "rb")
+        except IOError:
+            return False
+
+        try:
+            fcntl.flock(fin, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            fin.close()
+            return False
+
+        try:
+            # File may have been replaced in the meantime
+            if os.fstat(fin.fileno()).st_ino != os.stat(path_to_file).st_ino:
+                return False
+            os.remove(path_to_file)
+        except OSError:
+            return False
+        finally:
+            fin.close()
+        return True
@@ -5,6 +5,7 @@
 # \date       Aug 2017
 
 # Import libraries
+import os
 import SimpleITK as sitk
 
 import pysitk.python_helper as ph
@@ -12,6 +13,8 @@ import pysitk.simple_itk_helper as sitkh
 
 from abc import ABCMeta, abstractmethod
 
+from simplereg.registration_cache import RegistrationCache
+
 
 ##
 # Abstract class for registration methods
@@ -20,6 +23,9 @@ from abc import ABCMeta, abstractmethod
 class SimpleItkRegistrationBase(object):
     __metaclass__ = ABCMeta
 
+    # Opt-in on-disk cache of registration results shared by all instances
+    _registration_cache = None
+
     ##
     # Store information which are considered as basic for all registration
     # tools
@@ -47,6 +53,53 @@ class SimpleItkRegistrationBase(object):
         self._registration_transform_sitk = None
         self._computational_time = ph.get_zero_time()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cleanup()
+
+    ##
+    # Release resources (e.g. temporary files) held by the registration
+    # method. Nothing to release by default.
+    # \date       2026-10-18 23:51:30+0100
+    #
+    # \param      self  The object
+    #
+    def cleanup(self):
+        pass
+
+    ##
+    # Enable the on-disk cache of registration results. Runs of registration
+    # methods supporting it are skipped if the result of a run with identical
+    # images and options is cached already (also by any other process using
+    # the same cache directory).
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      directory     Directory of cache; if None,
+    #                           DIR_REGISTRATION_CACHE is used
+    # \param      max_bytes     Byte budget of cache; least recently used
+    #                           entries are evicted once exceeded
+    # \param      cache_warped  Store the warped moving image of wrapper
+    #                           registrations along with the transform; bool
+    #
+    @staticmethod
+    def enable_registration_cache(directory=None,
+                                  max_bytes=2**32,
+                                  cache_warped=False):
+        SimpleItkRegistrationBase._registration_cache = RegistrationCache(
+            directory=directory,
+            max_bytes=max_bytes,
+            cache_warped=cache_warped)
+
+    @staticmethod
+    def disable_registration_cache():
+        SimpleItkRegistrationBase._registration_cache = None
+
+    @staticmethod
+    def get_registration_cache():
+        return SimpleItkRegistrationBase._registration_cache
+
     ##
     # Sets the fixed image
     # \date       2017-08-08 16:45:45+0100
@@ -216,13 +269,43 @@ class SimpleItkRegistrationBase(object):
         return self._computational_time
 
     ##
-    # Run the registration method
+    # Run the registration method. If the registration cache is enabled, a
+    # cached result is used instead and the computational time is the time it
+    # took to look it up.
     # \date       2017-08-08 17:01:01+0100
     #
     # \param      self  The object
     #
     def run(self):
 
+        self._check_inputs()
+
+        time_start = ph.start_timing()
+
+        registration_cache = SimpleItkRegistrationBase._registration_cache
+        key = None
+        if registration_cache is not None:
+            key = registration_cache.get_key(self)
+            if key is not None and registration_cache.load(key, self):
+                self._computational_time = ph.stop_timing(time_start)
+                return
+
+        # Execute registration method
+        self._run()
+
+        # Get computational time
+        self._computational_time = ph.stop_timing(time_start)
+
+        if key is not None:
+            registration_cache.save(key, self)
+
+    ##
+    # Check that images (and masks, if given) are sitk.Image objects
+    # \date       2026-10-19 01:58:12+0100
+    #
+    # \param      self  The object
+    #
+    def _check_inputs(self):
         if not isinstance(self._fixed_sitk, sitk.Image):
             raise ValueError("Fixed image must be of type SimpleITK.Image")
 
@@ -239,13 +322,45 @@ class SimpleItkRegistrationBase(object):
             raise ValueError(
                 "Moving image mask must be of type SimpleITK.Image")
 
-        time_start = ph.start_timing()
+    ##
+    # Gets all options affecting the registration result, i.e. the cache key
+    # in addition to the images.
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self  The object
+    #
+    # \return     JSON serializable dictionary; None if the registration
+    #             method does not support caching (default)
+    #
+    def _get_cache_options(self):
+        return None
 
-        # Execute registration method
-        self._run()
+    ##
+    # Write the registration result into a cache entry directory
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self          The object
+    # \param      directory     Directory of cache entry
+    # \param      cache_warped  Also write the warped moving image; bool
+    #
+    def _write_cache_results(self, directory, cache_warped):
+        sitk.WriteTransform(
+            self.get_registration_transform_sitk(),
+            os.path.join(directory, "transform.h5"))
 
-        # Get computational time
-        self._computational_time = ph.stop_timing(time_start)
+    ##
+    # Read the registration result from a cache entry directory
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self       The object
+    # \param      directory  Directory of cache entry
+    #
+    def _read_cache_results(self, directory):
+        path_to_transform = os.path.join(directory, "transform.h5")
+        if not os.path.isfile(path_to_transform):
+            raise IOError("Transform '%s' not found" % path_to_transform)
+        self._registration_transform_sitk = sitk.ReadTransform(
+            path_to_transform).Downcast()
 
     ##
     # Execute registration method
@@ -0,0 +1,201 @@
+##
+# \file stub_executables.py
+# \brief      Stand-in executables of the command line registration tools
+#             wrapped by SimpleReg, i.e. reg_aladin, reg_f3d and flirt.
+#
+# The stubs accept the command lines of the wrappers and instantly write
+# valid outputs: identity transforms (or the given initial transform) and
+# zero images on the reference grid. Together with the benchmark harness
+# (see wrapper_benchmark) they allow to measure the overhead of the wrappers
+# without NiftyReg or FSL installed. Only numpy and nibabel are imported to
+# keep the start-up time of the stubs low.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import sys
+import stat
+import numpy as np
+import nibabel as nib
+
+# Version reported by the stubs of NiftyReg (nipype checks it)
+NIFTYREG_VERSION = "1.5.68"
+
+# Control point spacing of reg_f3d in voxels (default of -sx)
+CONTROL_POINT_SPACING = 5
+
+
+##
+# Write stub executables into a directory. Prepend it to the PATH to have the
+# wrappers call them instead of the command line tools.
+# \date       2026-10-19 02:20:43+0100
+#
+# \param      directory  Directory of stub executables
+# \param      tools      Names of command line tools to stub; list
+#
+# \return     Paths to stub executables; list
+#
+def write_stub_executables(directory, tools=None):
+    if tools is None:
+        tools = sorted(STUBS.keys())
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    # Stubs import this module also if SimpleReg is not installed
+    dir_package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    paths_to_stubs = []
+    for tool in tools:
+        if tool not in STUBS:
+            raise ValueError("No stub for '%s' available. Choose from %s" % (
+                tool, ", ".join(sorted(STUBS.keys()))))
+        path_to_stub = os.path.join(directory, tool)
+        with open(path_to_stub, "w") as fout:
+            fout.write("#!%s\n" % sys.executable)
+            fout.write("import sys\n")
+            fout.write("sys.path.insert(0, %r)\n" % dir_package)
+            fout.write("from simplereg.stub_executables import run_stub\n")
+            fout.write("sys.exit(run_stub(%r, sys.argv[1:]))\n" % tool)
+        os.chmod(path_to_stub, os.stat(path_to_stub).st_mode |
+                 stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        paths_to_stubs.append(path_to_stub)
+
+    return paths_to_stubs
+
+
+##
+# Run the stub of a command line tool
+# \date       2026-10-19 02:20:43+0100
+#
+# \param      tool  Name of command line tool
+# \param      argv  Command line arguments; list
+#
+# \return     exit code
+#
+def run_stub(tool, argv):
+    try:
+        STUBS[tool](argv)
+    except (IOError, ValueError) as e:
+        sys.stderr.write("%s (stub): %s\n" % (tool, e))
+        return 1
+    return 0
+
+
+##
+# Gets the value of a command line option, e.g. the path following '-ref'
+# \date       2026-10-19 02:20:43+0100
+#
+def _get_option(argv, flag, required=False):
+    if flag in argv:
+        i = argv.index(flag)
+        if i + 1 < len(argv):
+            return argv[i + 1]
+    if required:
+        raise ValueError("Option '%s' required" % flag)
+    return None
+
+
+def _load_image(path_to_image):
+    if not os.path.isfile(path_to_image):
+        raise IOError("Image '%s' not found" % path_to_image)
+    return nib.load(path_to_image)
+
+
+##
+# Write a zero image on the grid of the reference image
+# \date       2026-10-19 02:20:43+0100
+#
+def _write_image_on_reference_grid(reference_nib, path_to_image):
+    image_nib = nib.Nifti1Image(
+        np.zeros(reference_nib.shape, dtype=np.float32),
+        reference_nib.affine)
+    image_nib.set_qform(reference_nib.affine, code=1)
+    image_nib.set_sform(reference_nib.affine, code=1)
+    nib.save(image_nib, path_to_image)
+
+
+def _write_matrix(path_to_input, path_to_output):
+    matrix = np.eye(4) if path_to_input is None else np.loadtxt(path_to_input)
+    np.savetxt(path_to_output, matrix, fmt="%.8g")
+
+
+def _run_reg_aladin(argv):
+    if "--version" in argv or "-v" in argv:
+        print(NIFTYREG_VERSION)
+        return
+
+    reference_nib = _load_image(_get_option(argv, "-ref", required=True))
+    _load_image(_get_option(argv, "-flo", required=True))
+
+    _write_matrix(_get_option(argv, "-inaff"),
+                  _get_option(argv, "-aff", required=True))
+
+    path_to_warped = _get_option(argv, "-res")
+    if path_to_warped is not None:
+        _write_image_on_reference_grid(reference_nib, path_to_warped)
+
+
+##
+# reg_f3d stub writing the cubic B-spline control point grid of the identity
+# transform, i.e. control points hold their own (RAS) positions
+# \date       2026-10-19 02:20:43+0100
+#
+def _run_reg_f3d(argv):
+    if "--version" in argv or "-v" in argv:
+        print(NIFTYREG_VERSION)
+        return
+
+    reference_nib = _load_image(_get_option(argv, "-ref", required=True))
+    _load_image(_get_option(argv, "-flo", required=True))
+
+    shape = reference_nib.shape[0:3]
+    dim = len(shape)
+
+    # Grid starts one control point before the first voxel
+    S = np.eye(4)
+    S[range(dim), range(dim)] = CONTROL_POINT_SPACING
+    S[0:dim, 3] = -CONTROL_POINT_SPACING
+    A_grid = reference_nib.affine.dot(S)
+
+    size = [int(np.ceil(s / float(CONTROL_POINT_SPACING))) + 3
+            for s in shape] + [1] * (3 - dim)
+    index = np.stack(np.meshgrid(
+        *[np.arange(s) for s in size], indexing="ij"), axis=-1)
+    positions = index.dot(A_grid[0:3, 0:3].transpose()) + A_grid[0:3, 3]
+
+    cpp_nib = nib.Nifti1Image(
+        positions[..., 0:dim].reshape(size + [1, dim]).astype(np.float32),
+        A_grid)
+    cpp_nib.header.set_intent("vector")
+    cpp_nib.header["intent_p1"] = 5
+    nib.save(cpp_nib, _get_option(argv, "-cpp", required=True))
+
+    path_to_warped = _get_option(argv, "-res")
+    if path_to_warped is not None:
+        _write_image_on_reference_grid(reference_nib, path_to_warped)
+
+
+def _run_flirt(argv):
+    if "-version" in argv:
+        print("FLIRT version 6.0")
+        return
+
+    reference_nib = _load_image(_get_option(argv, "-ref", required=True))
+    _load_image(_get_option(argv, "-in", required=True))
+
+    path_to_matrix = _get_option(argv, "-omat")
+    if path_to_matrix is not None:
+        _write_matrix(_get_option(argv, "-init"), path_to_matrix)
+
+    path_to_warped = _get_option(argv, "-out")
+    if path_to_warped is not None:
+        _write_image_on_reference_grid(reference_nib, path_to_warped)
+
+
+STUBS = {
+    "reg_aladin": _run_reg_aladin,
+    "reg_f3d": _run_reg_f3d,
+    "flirt": _run_flirt,
+}
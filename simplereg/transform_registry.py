@@ -0,0 +1,231 @@
+##
+# \file transform_registry.py
+# \brief      Registry storing many affine transforms in a single indexed
+#             SQLite file
+#
+# Transforms are keyed by subject and step and stored as homogeneous
+# (dim+1 x dim+1) float64 matrices in (Simple)ITK physical convention, i.e.
+# y = A (x - c) + t + c is stored as [[A, t + c - A c], [0, 1]]. Bulk read
+# and write operations work on stacked matrices (N x dim+1 x dim+1) so that
+# batched operations, e.g. composition or inversion, are simple np.matmul
+# and np.linalg.inv calls.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import sqlite3
+import numpy as np
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+import simplereg.utilities as utils
+
+
+class TransformRegistry(object):
+
+    ##
+    # Open (or create) transform registry
+    # \date       2026-10-18 22:31:52+0100
+    #
+    # \param      path_to_registry  Path to SQLite registry file
+    #
+    def __init__(self, path_to_registry):
+        ph.create_directory(os.path.dirname(os.path.abspath(path_to_registry)))
+        self._path_to_registry = path_to_registry
+        self._connection = sqlite3.connect(path_to_registry)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS transforms ("
+            "subject TEXT NOT NULL, "
+            "step TEXT NOT NULL, "
+            "dim INTEGER NOT NULL, "
+            "matrix BLOB NOT NULL, "
+            "PRIMARY KEY (subject, step))")
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    ##
+    # Gets the keys of stored transforms
+    # \date       2026-10-18 22:31:52+0100
+    #
+    # \param      subject  Optional subject to filter for
+    # \param      step     Optional step to filter for
+    #
+    # \return     Sorted list of (subject, step) tuples
+    #
+    def get_keys(self, subject=None, step=None):
+        query = "SELECT subject, step FROM transforms"
+        conditions, values = self._get_conditions(subject, step)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY subject, step"
+        return [tuple(r) for r in self._connection.execute(query, values)]
+
+    ##
+    # Write stacked matrices in a single transaction. Existing entries are
+    # replaced.
+    # \date       2026-10-18 22:31:52+0100
+    #
+    # \param      keys          List of (subject, step) tuples
+    # \param      matrices_nda  Homogeneous matrices as (N x dim+1 x dim+1)
+    #                           np.array
+    #
+    def write_matrices(self, keys, matrices_nda):
+        matrices_nda = np.asarray(matrices_nda, dtype=np.float64)
+        if matrices_nda.ndim != 3 or \
+                matrices_nda.shape[1] != matrices_nda.shape[2] or \
+                matrices_nda.shape[1] not in [3, 4]:
+            raise ValueError(
+                "Matrices must be given as (N x 3 x 3) or (N x 4 x 4) array")
+        if len(keys) != matrices_nda.shape[0]:
+            raise ValueError("Number of keys and matrices must match")
+
+        dim = matrices_nda.shape[1] - 1
+        rows = [
+            (str(subject), str(step), dim, matrix.tobytes())
+            for (subject, step), matrix in zip(keys, matrices_nda)
+        ]
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO transforms VALUES (?, ?, ?, ?)", rows)
+
+    ##
+    # Read stacked matrices
+    # \date       2026-10-18 22:31:52+0100
+    #
+    # \param      keys  List of (subject, step) tuples
+    #
+    # \return     Homogeneous matrices as (N x dim+1 x dim+1) np.array
+    #
+    def read_matrices(self, keys):
+        if len(keys) == 0:
+            return np.zeros((0, 4, 4))
+
+        # Look-up via temporary table to avoid one query per key
+        with self._connection:
+            self._connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS query_keys ("
+                "i INTEGER, subject TEXT, step TEXT)")
+            self._connection.execute("DELETE FROM query_keys")
+            self._connection.executemany(
+                "INSERT INTO query_keys VALUES (?, ?, ?)",
+                [(i, str(k[0]), str(k[1])) for i, k in enumerate(keys)])
+            rows = self._connection.execute(
+                "SELECT q.i, t.dim, t.matrix FROM query_keys q "
+                "JOIN transforms t "
+                "ON q.subject = t.subject AND q.step = t.step "
+                "ORDER BY q.i").fetchall()
+
+        if len(rows) != len(keys):
+            found = set(r[0] for r in rows)
+            missing = [keys[i] for i in range(len(keys)) if i not in found]
+            raise IOError("Transforms not found in registry '%s': %s" % (
+                self._path_to_registry,
+                ", ".join("%s/%s" % tuple(k) for k in missing[:10])))
+
+        dims = set(r[1] for r in rows)
+        if len(dims) > 1:
+            raise ValueError("Transforms of different dimensions cannot be "
+                             "stacked")
+        n = dims.pop() + 1
+
+        matrices_nda = np.empty((len(rows), n, n))
+        for i, (_, _, blob) in enumerate(rows):
+            matrices_nda[i] = np.frombuffer(blob, dtype=np.float64).reshape(
+                n, n)
+        return matrices_nda
+
+    def write_transform(self, subject, step, transform_sitk):
+        self.write_matrices(
+            [(subject, step)],
+            utils.get_matrix_from_sitk_transform(transform_sitk)[np.newaxis])
+
+    def read_transform(self, subject, step):
+        return utils.get_sitk_transform_from_matrix(
+            self.read_matrices([(subject, step)])[0])
+
+    def delete(self, subject=None, step=None):
+        query = "DELETE FROM transforms"
+        conditions, values = self._get_conditions(subject, step)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._connection:
+            self._connection.execute(query, values)
+
+    ##
+    # Import (linear) transforms from files, e.g. .txt or .h5
+    # \date       2026-10-18 22:31:52+0100
+    #
+    # \param      paths_to_transforms  List of paths to transforms
+    # \param      step                 Step the transforms are stored for
+    # \param      subjects             List of subjects; if None, file names
+    #                                  without extension are used
+    #
+    def import_transforms(self, paths_to_transforms, step, subjects=None):
+        if subjects is None:
+            subjects = [
+                os.path.basename(ph.strip_filename_extension(p)[0])
+                for p in paths_to_transforms]
+        if len(subjects) != len(paths_to_transforms):
+            raise ValueError("Number of subjects and transforms must match")
+
+        matrices_nda = np.array([
+            utils.get_matrix_from_sitk_transform(
+                dr.DataReader.read_transform(p))
+            for p in paths_to_transforms])
+        self.write_matrices([(s, step) for s in subjects], matrices_nda)
+
+    ##
+    # Export transforms as files
+    # \date       2026-10-18 22:31:52+0100
+    #
+    # \param      directory  Output directory
+    # \param      subject    Optional subject to filter for
+    # \param      step       Optional step to filter for
+    # \param      pattern    File name pattern with fields subject and step
+    # \param      verbose    Turn on/off verbose output
+    #
+    # \return     List of paths to written transforms
+    #
+    def export_transforms(self,
+                          directory,
+                          subject=None,
+                          step=None,
+                          pattern="{subject}_{step}.txt",
+                          verbose=0,
+                          ):
+        keys = self.get_keys(subject=subject, step=step)
+        paths_to_transforms = []
+        for (subject_, step_) in keys:
+            path_to_transform = os.path.join(
+                directory, pattern.format(subject=subject_, step=step_))
+            dw.DataWriter.write_transform(
+                self.read_transform(subject_, step_),
+                path_to_transform,
+                verbose=verbose)
+            paths_to_transforms.append(path_to_transform)
+        return paths_to_transforms
+
+    @staticmethod
+    def _get_conditions(subject, step):
+        conditions = []
+        values = []
+        if subject is not None:
+            conditions.append("subject = ?")
+            values.append(str(subject))
+        if step is not None:
+            conditions.append("step = ?")
+            values.append(str(step))
+        return conditions, values
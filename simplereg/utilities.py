@@ -15,7 +15,9 @@ import scipy.ndimage.morphology
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
+import simplereg.data_reader as dr
 import simplereg.data_writer as dw
+import simplereg.numpy_resampler as npr
 from simplereg.definitions import DIR_TMP
 
 
@@ -80,21 +82,21 @@ def update_image_header(image_sitk, transform_sitk):
 # \param      path_to_output  Path to 4D/5D output multi-label mask
 #
 def split_labels(path_to_labels, dimension, path_to_output):
-    if dimension == 4:
-        labels_nib = nib.load(path_to_labels)
-        nda = labels_nib.get_data().astype(np.uint8)
-    else:
-        labels_sitk = sitk.ReadImage(path_to_labels)
-        nda = sitk.GetArrayFromImage(labels_sitk).astype(np.uint8)
-
-    # split labels into separate components
+    # Data array (x, y, z) is memory-mapped for uncompressed images
+    labels_nib = dr.DataReader.read_image(path_to_labels, as_nib=True)
+    nda = np.asanyarray(labels_nib.dataobj)
+    if nda.dtype != np.uint8:
+        nda = nda.astype(np.uint8)
+
+    # split labels into separate components. Only the bounding box of each
+    # label is searched
     n_labels = nda.max()
     shape = nda.shape + (n_labels, )
     nda_4d = np.zeros((shape), dtype=np.uint8)
-    for label in range(n_labels):
-        indices = np.where(nda == label + 1)
-        indices += (label * np.ones(len(indices[0]), dtype=np.uint8),)
-        nda_4d[indices] = 1
+    regions = scipy.ndimage.find_objects(nda, n_labels)
+    for label, region in enumerate(regions):
+        if region is not None:
+            nda_4d[region + (label, )] = nda[region] == label + 1
 
     if dimension == 4:
         labels_4d_nib = nib.Nifti1Image(
@@ -103,10 +105,16 @@ def split_labels(path_to_labels, dimension, path_to_output):
         ph.create_directory(os.path.dirname(path_to_output))
         nib.save(labels_4d_nib, path_to_output)
     else:
-        labels_5d_sitk = sitk.GetImageFromArray(nda_4d)
-        labels_5d_sitk.SetOrigin(labels_sitk.GetOrigin())
-        labels_5d_sitk.SetSpacing(labels_sitk.GetSpacing())
-        labels_5d_sitk.SetDirection(labels_sitk.GetDirection())
+        # Labels are the components of a 2D/3D vector image which is written
+        # as 5D NIfTI image (x, y, z, 1, n_labels)
+        size, origin, spacing, direction = npr.get_grid_from_nib(labels_nib)
+        dim = nda.ndim
+        labels_5d_sitk = sitk.GetImageFromArray(
+            nda_4d.transpose(tuple(range(dim))[::-1] + (dim, )),
+            isVector=True)
+        labels_5d_sitk.SetOrigin(origin)
+        labels_5d_sitk.SetSpacing(spacing)
+        labels_5d_sitk.SetDirection(direction)
         sitkh.write_nifti_image_sitk(labels_5d_sitk, path_to_output)
 
 
@@ -119,8 +127,9 @@ def split_labels(path_to_labels, dimension, path_to_output):
 # \param      iterations      Number of binary erosion operations
 #
 def convert_label_to_boundary(path_to_labels, path_to_output, iterations=1):
-    labels_sitk = sitk.ReadImage(path_to_labels)
-    nda_labels = sitk.GetArrayFromImage(labels_sitk)
+    # Data array is memory-mapped for uncompressed images
+    labels_nib = dr.DataReader.read_image(path_to_labels, as_nib=True)
+    nda_labels = np.asanyarray(labels_nib.dataobj)
 
     if nda_labels.dtype != 'uint8' and nda_labels.dtype != 'uint16':
         raise ValueError(
@@ -129,21 +138,26 @@ def convert_label_to_boundary(path_to_labels, path_to_output, iterations=1):
             "you can convert the data type using "
             "simplereg_transform -d path-to-label uint8 path-to-label_out")
 
-    nda_labels_boundary = np.zeros_like(nda_labels)
+    nda_labels_boundary = np.zeros(nda_labels.shape, dtype=nda_labels.dtype)
 
-    for i in range(nda_labels.max()):
+    # Erosion is restricted to the bounding box of each label which is
+    # equivalent as voxels outside the box are background for this label
+    n_labels = nda_labels.max()
+    regions = scipy.ndimage.find_objects(nda_labels, n_labels)
+    for i, region in enumerate(regions):
+        if region is None:
+            continue
         label = i + 1
-        nda_mask = np.zeros_like(nda_labels)
-        nda_mask[np.where(nda_labels == label)] = 1
-        nda_mask_boundary = nda_mask - \
-            scipy.ndimage.morphology.binary_erosion(
-                nda_mask, iterations=iterations)
-        nda_labels_boundary += label * nda_mask_boundary
+        nda_mask = nda_labels[region] == label
+        nda_mask_boundary = nda_mask & ~scipy.ndimage.binary_erosion(
+            nda_mask, iterations=iterations)
+        nda_labels_boundary[region][nda_mask_boundary] = label
 
-    labels_boundary_sitk = sitk.GetImageFromArray(nda_labels_boundary)
-    labels_boundary_sitk.CopyInformation(labels_sitk)
+    labels_boundary_nib = nib.Nifti1Image(
+        nda_labels_boundary, affine=labels_nib.affine,
+        header=labels_nib.header)
 
-    dw.DataWriter.write_image(labels_boundary_sitk, path_to_output)
+    dw.DataWriter.write_image(labels_boundary_nib, path_to_output)
 
 
 def compose_transforms(transform_outer, transform_inner):
@@ -347,3 +361,43 @@ def get_voxel_displacements(image_sitk, transform_sitk):
     voxel_disp = np.sqrt(np.sum(np.square(disp), axis=-1))
 
     return voxel_disp
+
+
+##
+# Gets the homogeneous matrix of a linear transform, i.e. y = A (x - c) + t + c
+# is represented as [[A, t + c - A c], [0, 1]]
+# \date       2026-10-18 22:31:52+0100
+#
+# \param      transform_sitk  Linear transform as sitk.Transform object
+#
+# \return     Homogeneous matrix as (dim+1 x dim+1) np.array
+#
+def get_matrix_from_sitk_transform(transform_sitk):
+    if not transform_sitk.IsLinear():
+        raise ValueError("Transform must be linear")
+
+    dim = transform_sitk.GetDimension()
+    t = np.array(transform_sitk.TransformPoint((0.,) * dim))
+    A = np.array([
+        transform_sitk.TransformPoint(tuple(e)) for e in np.eye(dim)]) - t
+
+    matrix_nda = np.eye(dim + 1)
+    matrix_nda[0:dim, 0:dim] = A.transpose()
+    matrix_nda[0:dim, dim] = t
+    return matrix_nda
+
+
+##
+# Gets the affine transform of a homogeneous matrix
+# \date       2026-10-18 22:31:52+0100
+#
+# \param      matrix_nda  Homogeneous matrix as (dim+1 x dim+1) np.array
+#
+# \return     Transform as sitk.AffineTransform object
+#
+def get_sitk_transform_from_matrix(matrix_nda):
+    dim = matrix_nda.shape[0] - 1
+    transform_sitk = sitk.AffineTransform(dim)
+    transform_sitk.SetMatrix(matrix_nda[0:dim, 0:dim].flatten())
+    transform_sitk.SetTranslation(matrix_nda[0:dim, dim])
+    return transform_sitk
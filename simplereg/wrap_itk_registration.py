@@ -14,6 +14,8 @@ import SimpleITK as sitk
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
+import simplereg.precision as prec
+
 
 class WrapItkRegistration(object):
 
@@ -22,7 +24,7 @@ class WrapItkRegistration(object):
         fixed_itk,
         moving_itk,
         dimension,
-        pixel_type=itk.D,
+        pixel_type=None,
         fixed_itk_mask=None,
         moving_itk_mask=None,
         registration_type="Rigid",
@@ -65,8 +67,18 @@ class WrapItkRegistration(object):
         self._moving_itk = moving_itk
         self._moving_itk_mask = moving_itk_mask
         self._dimension = dimension
+
+        # Pixel type follows the (package-wide) precision if not given
+        if pixel_type is None:
+            pixel_type = {
+                "float32": itk.F,
+                "float64": itk.D,
+            }[prec.get_precision()]
         self._pixel_type = pixel_type
         self._image_type = itk.Image[self._pixel_type, self._dimension]
+
+        # Transforms, optimizers and interpolators are wrapped for double only
+        self._parameters_type = itk.D
         self._registration_type = registration_type
         self._metric = metric
         # self._metric_params = metric_params
@@ -204,17 +216,17 @@ class WrapItkRegistration(object):
         # ---------------------------Transform Type---------------------------
         if self._registration_type == "Rigid":
             transform_type = eval(
-                "itk.Euler%dDTransform[self._pixel_type]" % (
+                "itk.Euler%dDTransform[self._parameters_type]" % (
                     self._dimension))
 
         elif self._registration_type == "Similarity":
             transform_type = eval(
-                "itk.Similarity%dDTransform[self._pixel_type]" % (
+                "itk.Similarity%dDTransform[self._parameters_type]" % (
                     self._dimension))
 
         elif self._registration_type == "Affine":
             transform_type = itk.AffineTransform[
-                self._pixel_type, self._dimension]
+                self._parameters_type, self._dimension]
         else:
             raise ValueError("Registration type '%s' not known." %
                              (self._registration_type))
@@ -225,10 +237,10 @@ class WrapItkRegistration(object):
         if self._initializer_type is not None:
             if self._dimension == 2:
                 transform_type_that_works = itk.CenteredRigid2DTransform[
-                    self._pixel_type]
+                    self._parameters_type]
             else:
                 transform_type_that_works = itk.VersorRigid3DTransform[
-                    self._pixel_type]
+                    self._parameters_type]
             initial_transform_ = transform_type_that_works.New()
             initializer = itk.CenteredTransformInitializer[
                 transform_type_that_works,
@@ -258,7 +270,7 @@ class WrapItkRegistration(object):
         else:
             interpolator_type = \
                 eval("itk.%sInterpolateImageFunction[self._image_type, "
-                     "self._pixel_type]" % (self._interpolator))
+                     "self._parameters_type]" % (self._interpolator))
             interpolator = interpolator_type.New()
         registration.SetInterpolator(interpolator)
 
@@ -325,7 +337,7 @@ class WrapItkRegistration(object):
         # ---------------------------Optimizer Type---------------------------
         if self._optimizer == "RegularStepGradientDescent":
             optimizer_type = itk.RegularStepGradientDescentOptimizerv4[
-                self._pixel_type]
+                self._parameters_type]
             optimizer = optimizer_type.New()
             for key, value in six.iteritems(self._optimizer_params):
                 eval("optimizer.Set%s(%g)" % (key, value))
@@ -333,7 +345,7 @@ class WrapItkRegistration(object):
         # elif self._optimizer == "QuasiNewton":
         #     # Throws segmentation fault
         #     optimizer_type = itk.QuasiNewtonOptimizerv4Template[
-        #         self._pixel_type]
+        #         self._parameters_type]
         #     optimizer = optimizer_type.New()
         else:
             raise ValueError("Optimizer type '%s' not known." %
@@ -347,17 +359,17 @@ class WrapItkRegistration(object):
         # ---------------------------Transform Type---------------------------
         if self._registration_type == "Rigid":
             transform_type = eval(
-                "itk.Euler%dDTransform[self._pixel_type]" % (
+                "itk.Euler%dDTransform[self._parameters_type]" % (
                     self._dimension))
 
         elif self._registration_type == "Similarity":
             transform_type = eval(
-                "itk.Similarity%dDTransform[self._pixel_type]" % (
+                "itk.Similarity%dDTransform[self._parameters_type]" % (
                     self._dimension))
 
         elif self._registration_type == "Affine":
             transform_type = itk.AffineTransform[
-                self._pixel_type, self._dimension]
+                self._parameters_type, self._dimension]
         else:
             raise ValueError("Registration type '%s' not known." %
                              (self._registration_type))
@@ -368,10 +380,10 @@ class WrapItkRegistration(object):
         if self._initializer_type is not None:
             if self._dimension == 2:
                 transform_type_that_works = itk.CenteredRigid2DTransform[
-                    self._pixel_type]
+                    self._parameters_type]
             else:
                 transform_type_that_works = itk.VersorRigid3DTransform[
-                    self._pixel_type]
+                    self._parameters_type]
             initial_transform_ = transform_type_that_works.New()
             initializer = itk.CenteredTransformInitializer[
                 transform_type_that_works,
@@ -398,7 +410,7 @@ class WrapItkRegistration(object):
         else:
             interpolator_type = \
                 eval("itk.%sInterpolateImageFunction[self._image_type, "
-                     "self._pixel_type]" % (self._interpolator))
+                     "self._parameters_type]" % (self._interpolator))
             interpolator = interpolator_type.New()
 
         # -----------------------------Metric Type-----------------------------
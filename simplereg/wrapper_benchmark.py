@@ -0,0 +1,246 @@
+##
+# \file wrapper_benchmark.py
+# \brief      Benchmark harness measuring the overhead of the wrappers of
+#             command line registration tools
+#
+# The wrappers (RegAladin, RegF3D, FLIRT) are run against stub executables
+# (see stub_executables) on synthetic images of given sizes. The time of a
+# run is broken down into its stages, i.e. providing the inputs, running the
+# (stub) tool, reading and converting the outputs, and resampling the warped
+# moving image (and evaluating the displacement field for RegF3D). All stages
+# but 'tool' are overhead of SimpleReg.
+#
+# Note, nipype resolves the NiftyReg executables via NIFTYREGDIR when it is
+# imported. Hence, NIFTYREGDIR must not be set for the stubs to be used.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import shutil
+import tempfile
+import numpy as np
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+
+import simplereg.flirt
+import simplereg.niftyreg
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+import simplereg.stub_executables as se
+from simplereg.definitions import DIR_TMP
+
+# Registration methods to benchmark keyed by name
+METHODS = {
+    "RegAladin": lambda fixed, moving: simplereg.niftyreg.RegAladin(
+        fixed, moving, options="-voff"),
+    "RegAladinTransformOnly": lambda fixed, moving:
+    simplereg.niftyreg.RegAladin(
+        fixed, moving, options="-voff", transform_only=True),
+    "RegF3D": lambda fixed, moving: simplereg.niftyreg.RegF3D(
+        fixed, moving, options="-voff"),
+    "FLIRT": lambda fixed, moving: simplereg.flirt.FLIRT(fixed, moving),
+    "FLIRTTransformOnly": lambda fixed, moving: simplereg.flirt.FLIRT(
+        fixed, moving, transform_only=True),
+}
+
+# Stages of a run in order of execution
+STAGES = ["inputs", "tool", "outputs", "warp", "displacement", "total"]
+
+
+class WrapperBenchmark(object):
+
+    ##
+    # Constructor
+    # \date       2026-10-19 02:20:43+0100
+    #
+    # \param      sizes        Image sizes; list of tuples, e.g. [(128, 128,
+    #                          128)]. If None, 128^3 and 256^3 are used
+    # \param      methods      Names of registration methods (see METHODS);
+    #                          list. If None, all methods are benchmarked
+    # \param      repetitions  Number of timed runs per method and size (after
+    #                          one warm-up run); the median is reported
+    # \param      from_file    If True, images are read from (compressed)
+    #                          NIfTI files so that the files are passed
+    #                          through to the tools. Otherwise, in-memory
+    #                          images are written by the wrappers
+    # \param      dir_output   Directory for images and stub executables; if
+    #                          None, a temporary directory in DIR_TMP is used
+    # \param      verbose      Turn on/off verbose output
+    #
+    def __init__(self,
+                 sizes=None,
+                 methods=None,
+                 repetitions=3,
+                 from_file=True,
+                 dir_output=None,
+                 verbose=0,
+                 ):
+        if sizes is None:
+            sizes = [(128, 128, 128), (256, 256, 256)]
+        if methods is None:
+            methods = sorted(METHODS.keys())
+        for method in methods:
+            if method not in METHODS:
+                raise ValueError("Method '%s' unknown. Choose from %s" % (
+                    method, ", ".join(sorted(METHODS.keys()))))
+        if repetitions < 1:
+            raise ValueError("Number of repetitions must be positive")
+
+        self._sizes = [tuple(int(s) for s in size) for size in sizes]
+        self._methods = methods
+        self._repetitions = int(repetitions)
+        self._from_file = bool(from_file)
+        self._dir_output = dir_output
+        self._verbose = verbose
+
+        self._reports = []
+
+    ##
+    # Run the benchmark. The stub executables are prepended to the PATH for
+    # the duration of the benchmark.
+    # \date       2026-10-19 02:20:43+0100
+    #
+    # \return     List of reports (dictionaries) holding method, size,
+    #             from_file and the median times in seconds of all STAGES
+    #             (None if not applicable)
+    #
+    def run(self):
+        if self._dir_output is None:
+            ph.create_directory(DIR_TMP)
+            dir_output = tempfile.mkdtemp(
+                prefix="wrapper_benchmark_", dir=DIR_TMP)
+        else:
+            dir_output = self._dir_output
+            ph.create_directory(dir_output)
+
+        environ = {k: os.environ.get(k) for k in ["PATH", "FSLOUTPUTTYPE"]}
+        dir_stubs = os.path.join(dir_output, "bin")
+        se.write_stub_executables(dir_stubs)
+        os.environ["PATH"] = dir_stubs + os.pathsep + os.environ["PATH"]
+        os.environ.setdefault("FSLOUTPUTTYPE", "NIFTI_GZ")
+
+        self._reports = []
+        try:
+            for size in self._sizes:
+                fixed_sitk, moving_sitk = self._get_images(size, dir_output)
+                for method in self._methods:
+                    report = self._run_method(method, fixed_sitk, moving_sitk)
+                    self._reports.append(report)
+                    if self._verbose:
+                        ph.print_info("%s %s: %.3fs (tool %.3fs)" % (
+                            method, "x".join(str(s) for s in size),
+                            report["total"], report["tool"]))
+        finally:
+            for k, v in environ.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+            if self._dir_output is None:
+                shutil.rmtree(dir_output, True)
+
+        return self._reports
+
+    def get_reports(self):
+        return self._reports
+
+    ##
+    # Gets the reports as table with one row per method and size and one
+    # column per stage (times in seconds)
+    # \date       2026-10-19 02:20:43+0100
+    #
+    # \return     Table as string
+    #
+    def get_table(self):
+        header = ["method", "size"] + STAGES + ["overhead"]
+        rows = [header]
+        for report in self._reports:
+            row = [report["method"], "x".join(str(s) for s in report["size"])]
+            for stage in STAGES:
+                row.append("-" if report[stage] is None
+                           else "%.3f" % report[stage])
+            row.append("%.0f%%" % (100 * report["overhead"]))
+            rows.append(row)
+
+        widths = [max(len(row[i]) for row in rows)
+                  for i in range(len(header))]
+        return "\n".join(
+            "  ".join(c.ljust(w) if i < 2 else c.rjust(w)
+                      for i, (c, w) in enumerate(zip(row, widths)))
+            for row in rows)
+
+    ##
+    # Gets synthetic fixed and moving images (Gaussian blobs with different
+    # geometry) of given size
+    # \date       2026-10-19 02:20:43+0100
+    #
+    def _get_images(self, size, dir_output):
+        images_sitk = []
+        for i, name in enumerate(["fixed", "moving"]):
+            image_sitk = sitk.GaussianSource(
+                sitk.sitkFloat32,
+                size=size,
+                sigma=[s / 4. for s in size],
+                mean=[s / 2. + 2 * i for s in size],
+                scale=1000.,
+                spacing=[1. + 0.1 * i] * len(size),
+            )
+            image_sitk.SetOrigin([-s / 2. for s in size])
+
+            if self._from_file:
+                path_to_image = os.path.join(dir_output, "%s_%s.nii.gz" % (
+                    name, "x".join(str(s) for s in size)))
+                dw.DataWriter.write_image(image_sitk, path_to_image)
+                image_sitk = dr.DataReader.read_image(path_to_image)
+            images_sitk.append(image_sitk)
+
+        return images_sitk
+
+    ##
+    # Run a registration method repeatedly and get the median stage times
+    # \date       2026-10-19 02:20:43+0100
+    #
+    def _run_method(self, method, fixed_sitk, moving_sitk):
+        times = {stage: [] for stage in STAGES}
+
+        # First run (e.g. querying tool versions via nipype) is not timed
+        for repetition in range(self._repetitions + 1):
+            with METHODS[method](fixed_sitk, moving_sitk) as registration:
+                registration.run()
+                stage_times = {
+                    k: v.total_seconds()
+                    for k, v in registration.get_stage_times().items()}
+
+                time_start = ph.start_timing()
+                registration.get_warped_moving_sitk()
+                stage_times["warp"] = ph.stop_timing(
+                    time_start).total_seconds()
+
+                if isinstance(registration, simplereg.niftyreg.RegF3D):
+                    time_start = ph.start_timing()
+                    registration.get_displacement_field_transform_sitk()
+                    stage_times["displacement"] = ph.stop_timing(
+                        time_start).total_seconds()
+
+                stage_times["total"] = \
+                    registration.get_computational_time().total_seconds() + \
+                    stage_times["warp"] + stage_times.get("displacement", 0)
+
+            if repetition > 0:
+                for stage in STAGES:
+                    times[stage].append(stage_times.get(stage, None))
+
+        report = {
+            "method": method,
+            "size": fixed_sitk.GetSize(),
+            "from_file": self._from_file,
+        }
+        for stage in STAGES:
+            report[stage] = None if times[stage][0] is None \
+                else float(np.median(times[stage]))
+        report["overhead"] = 1. - report["tool"] / max(report["total"], 1e-9)
+
+        return report
@@ -5,11 +5,40 @@
 # \date       Aug 2017
 
 # Import libraries
+import os
+import shutil
+import atexit
+import tempfile
+import SimpleITK as sitk
+import six
 from abc import ABCMeta, abstractmethod
 
+import pysitk.python_helper as ph
+
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+from simplereg.scratch_store import ScratchStore
+from simplereg.definitions import DIR_SCRATCH
 from simplereg.simple_itk_registration_base \
     import SimpleItkRegistrationBase
 
+# Scratch directories of all instances which are not cleaned up yet
+_dirs_tmp = set()
+
+
+##
+# Remove the scratch directories of all instances which are not cleaned up
+# yet, e.g. instances in reference cycles at interpreter exit
+# \date       2026-10-19 10:48:26+0100
+#
+def _remove_dirs_tmp():
+    for dir_tmp in list(_dirs_tmp):
+        shutil.rmtree(dir_tmp, True)
+    _dirs_tmp.clear()
+
+
+atexit.register(_remove_dirs_tmp)
+
 
 ##
 # Abstract class to wrap registration methods from SimpleITK objects
@@ -18,16 +47,25 @@ from simplereg.simple_itk_registration_base \
 class WrapperRegistration(SimpleItkRegistrationBase):
     __metaclass__ = ABCMeta
 
+    # Opt-in content-addressed store of images shared by all instances
+    _scratch_store = None
+
     ##
     # Store information which are considered as basic for all registration
-    # tools
+    # tools.
+    #
+    # Images can also be given as paths to NIfTI files. These files, as well
+    # as the files of images read by DataReader.read_image, are handed to the
+    # command line tool directly instead of writing copies of them.
     # \date       2017-08-08 17:28:02+0100
     #
     # \param      self              The object
-    # \param      fixed_sitk        Fixed image as sitk.Image object
-    # \param      moving_sitk       Moving image as sitk.Image object
-    # \param      fixed_sitk_mask   Fixed image mask as sitk.Image object
-    # \param      moving_sitk_mask  Moving image mask as sitk.Image object
+    # \param      fixed_sitk        Fixed image as sitk.Image object or path
+    # \param      moving_sitk       Moving image as sitk.Image object or path
+    # \param      fixed_sitk_mask   Fixed image mask as sitk.Image object or
+    #                               path
+    # \param      moving_sitk_mask  Moving image mask as sitk.Image object or
+    #                               path
     # \param      options           Options to add for command line tool;
     #                               string
     #
@@ -40,15 +78,285 @@ class WrapperRegistration(SimpleItkRegistrationBase):
                  verbose,
                  ):
 
-        SimpleItkRegistrationBase.__init__(self,
-                                           fixed_sitk=fixed_sitk,
-                                           moving_sitk=moving_sitk,
-                                           fixed_sitk_mask=fixed_sitk_mask,
-                                           moving_sitk_mask=moving_sitk_mask,
-                                           )
+        SimpleItkRegistrationBase.__init__(
+            self,
+            fixed_sitk=self._read_image(fixed_sitk),
+            moving_sitk=self._read_image(moving_sitk),
+            fixed_sitk_mask=self._read_image(fixed_sitk_mask),
+            moving_sitk_mask=self._read_image(moving_sitk_mask),
+        )
         self._options = options
         self._verbose = verbose
 
+        self._dir_tmp = None
+        self._scratch_store_references = []
+
+        # Times of the stages of the last run (see get_stage_times)
+        self._stage_times = {}
+
+    ##
+    # Enable the content-addressed scratch store. In-memory images, e.g. the
+    # fixed image of atlas-to-many registrations, are then written once and
+    # the stored file is referenced by all later runs (of any process using
+    # the same store directory) instead of writing it again.
+    # \date       2026-10-19 00:12:40+0100
+    #
+    # \param      directory  Directory of store; if None, the subfolder
+    #                        'store' in DIR_SCRATCH is used
+    # \param      max_bytes  Byte budget of store; least recently used
+    #                        unreferenced images are evicted once exceeded
+    #
+    @staticmethod
+    def enable_scratch_store(directory=None, max_bytes=2**32):
+        WrapperRegistration._scratch_store = ScratchStore(
+            directory=directory, max_bytes=max_bytes)
+
+    @staticmethod
+    def disable_scratch_store():
+        WrapperRegistration._scratch_store = None
+
+    @staticmethod
+    def get_scratch_store():
+        return WrapperRegistration._scratch_store
+
+    ##
+    # Remove the scratch directory of this instance including all its files
+    # and release its references to images of the scratch store. This also
+    # happens automatically once the instance is garbage collected or the
+    # interpreter exits.
+    # \date       2026-10-18 23:24:10+0100
+    #
+    # \param      self  The object
+    #
+    def cleanup(self):
+        if self._dir_tmp is not None:
+            shutil.rmtree(self._dir_tmp, True)
+            _dirs_tmp.discard(self._dir_tmp)
+        for scratch_store, path_to_image in self._scratch_store_references:
+            scratch_store.release(path_to_image)
+        self._scratch_store_references = []
+
+    def __del__(self):
+        # Instance may not be initialized completely, e.g. if reading an
+        # image failed
+        if hasattr(self, "_scratch_store_references"):
+            self.cleanup()
+
+    def run(self):
+        self._stage_times = {}
+        super(WrapperRegistration, self).run()
+
+    ##
+    # Run the registration method asynchronously, i.e. run the command line
+    # tool as asyncio subprocess so that many registrations can be kept in
+    # flight by a single event loop (Python >= 3.7). Cancelling the coroutine
+    # kills the command line tool.
+    # \date       2026-10-19 01:58:12+0100
+    #
+    # \param      self             The object
+    # \param      timeout          Timeout in seconds for the command line
+    #                              tool; None for no timeout. asyncio.
+    #                              TimeoutError is raised once exceeded
+    # \param      output_callback  Callable receiving each (decoded) line of
+    #                              stdout and stderr of the command line tool.
+    #                              If None, lines are printed in verbose mode
+    #
+    # \return     Coroutine, see wrapper_registration_async.run_async
+    #
+    def run_async(self, timeout=None, output_callback=None):
+        # Imported here to keep this module importable on Python 2
+        import simplereg.wrapper_registration_async as wra
+        return wra.run_async(
+            self, timeout=timeout, output_callback=output_callback)
+
+    ##
+    # Run the command line tool (synchronously via nipype)
+    # \date       2026-10-19 01:58:12+0100
+    #
+    # \param      self  The object
+    #
+    def _run(self):
+        time_start = ph.start_timing()
+        interface = self._get_interface()
+        self._stage_times["inputs"] = ph.stop_timing(time_start)
+
+        # Execute registration
+        if self._verbose:
+            ph.print_execution(interface.cmdline)
+        time_start = ph.start_timing()
+        interface.run()
+        self._stage_times["tool"] = ph.stop_timing(time_start)
+
+        time_start = ph.start_timing()
+        self._read_results()
+        self._stage_times["outputs"] = ph.stop_timing(time_start)
+
+    ##
+    # Provide the inputs of the command line tool and get its nipype
+    # interface
+    # \date       2026-10-19 01:58:12+0100
+    #
+    # \param      self  The object
+    #
+    # \return     nipype interface (with all inputs set)
+    #
+    @abstractmethod
+    def _get_interface(self):
+        pass
+
+    ##
+    # Read the outputs of the command line tool, i.e. the registration
+    # transform and the warped moving image
+    # \date       2026-10-19 01:58:12+0100
+    #
+    # \param      self  The object
+    #
+    @abstractmethod
+    def _read_results(self):
+        pass
+
+    ##
+    # Gets the times of the stages of the last run, i.e. providing the inputs
+    # ('inputs'), running the command line tool ('tool') and reading and
+    # converting its outputs ('outputs'). Stages not run, e.g. for cached
+    # results, are missing.
+    # \date       2026-10-19 02:20:43+0100
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary of stage times as datetime.timedelta objects
+    #
+    def get_stage_times(self):
+        return dict(self._stage_times)
+
+    ##
+    # Gets the scratch directory holding the files exchanged with the command
+    # line tool.
+    # \date       2026-10-18 23:24:10+0100
+    #
+    # \param      self  The object
+    #
+    # \return     Path to scratch directory
+    #
+    def get_dir_tmp(self):
+        return self._dir_tmp
+
+    ##
+    # Create a unique scratch directory within DIR_SCRATCH so that several
+    # instances can run concurrently (in threads or processes).
+    # \date       2026-10-18 23:24:10+0100
+    #
+    # \param      self       The object
+    # \param      subfolder  Prefix of the scratch directory name
+    #
+    # \return     Path to scratch directory
+    #
+    def _create_dir_tmp(self, subfolder):
+        ph.create_directory(DIR_SCRATCH)
+        dir_tmp = tempfile.mkdtemp(prefix="%s_" % subfolder, dir=DIR_SCRATCH)
+        _dirs_tmp.add(dir_tmp)
+        return dir_tmp
+
+    ##
+    # Gets the path to an image file the command line tool can read. This is
+    # the source file of images read by DataReader.read_image. Other images
+    # are written uncompressed into the scratch store, if enabled, or into
+    # the scratch directory otherwise.
+    # \date       2026-10-18 23:58:04+0100
+    #
+    # \param      self        The object
+    # \param      image_sitk  Image as sitk.Image object
+    # \param      filename    Filename of image within scratch directory,
+    #                         e.g. "fixed.nii"
+    #
+    # \return     Path to image file
+    #
+    def _get_path_to_image(self, image_sitk, filename):
+        path_to_image = dr.DataReader.get_source_path(image_sitk)
+        if path_to_image is not None:
+            return path_to_image
+
+        scratch_store = WrapperRegistration._scratch_store
+        if scratch_store is not None:
+            path_to_image = scratch_store.acquire(image_sitk)
+            self._scratch_store_references.append(
+                (scratch_store, path_to_image))
+            return path_to_image
+
+        path_to_image = os.path.join(self._dir_tmp, filename)
+        dw.DataWriter.write_image(image_sitk, path_to_image)
+        return path_to_image
+
+    ##
+    # Gets the moving image resampled in-process on the fixed image grid
+    # using the obtained registration transform and linear interpolation.
+    # \date       2026-10-19 00:31:07+0100
+    #
+    # \param      self      The object
+    # \param      pixel_id  Pixel type of resampled image
+    #
+    # \return     Resampled moving image as sitk.Image object
+    #
+    def _get_resampled_moving_sitk(self, pixel_id):
+        return sitk.Resample(
+            self._moving_sitk,
+            self._fixed_sitk,
+            self.get_registration_transform_sitk(),
+            sitk.sitkLinear,
+            0.,
+            pixel_id,
+        )
+
+    ##
+    # Write the registration result, and optionally the warped moving image,
+    # into a cache entry directory
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self          The object
+    # \param      directory     Directory of cache entry
+    # \param      cache_warped  Also write the warped moving image; bool
+    #
+    def _write_cache_results(self, directory, cache_warped):
+        super(WrapperRegistration, self)._write_cache_results(
+            directory, cache_warped)
+        if cache_warped:
+            sitk.WriteImage(
+                self.get_warped_moving_sitk(),
+                os.path.join(directory, "warped_moving.nii"))
+
+    ##
+    # Read the registration result from a cache entry directory. Without a
+    # cached warped moving image it is resampled in-process once requested.
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self       The object
+    # \param      directory  Directory of cache entry
+    #
+    def _read_cache_results(self, directory):
+        super(WrapperRegistration, self)._read_cache_results(directory)
+        path_to_warped_moving = os.path.join(directory, "warped_moving.nii")
+        if os.path.isfile(path_to_warped_moving):
+            self._warped_moving_sitk = sitk.ReadImage(path_to_warped_moving)
+        else:
+            self._warped_moving_sitk = None
+
+    ##
+    # Gets all options affecting the registration result
+    # \date       2026-10-19 01:31:50+0100
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary holding the command line options
+    #
+    def _get_cache_options(self):
+        return {"options": self._options}
+
+    @staticmethod
+    def _read_image(image):
+        if isinstance(image, six.string_types):
+            return dr.DataReader.read_image(image)
+        return image
+
     ##
     # Sets the options of the registration method.
     # \date       2017-08-08 17:26:45+0100
@@ -74,10 +382,10 @@ class WrapperRegistration(SimpleItkRegistrationBase):
     # Sets the verbose.
     # \date       2017-11-08 18:26:59+0000
     #
-    # \param      self    The object
-    # \param      vebose  Turn on/off verbose. Boolean.
+    # \param      self     The object
+    # \param      verbose  Turn on/off verbose. Boolean.
     #
-    def set_verbose(self, vebose):
+    def set_verbose(self, verbose):
         self._verbose = verbose
 
     ##
@@ -0,0 +1,137 @@
+##
+# \file wrapper_registration_async.py
+# \brief      Asynchronous execution of wrapped command line registration tools
+#
+# The command line tool of a registration method is run as asyncio subprocess
+# so that many registrations can be kept in flight by a single event loop.
+# This module requires Python >= 3.7 and is imported on demand by
+# WrapperRegistration.run_async only, so that the synchronous wrappers keep
+# working on Python 2.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import sys
+import shlex
+import asyncio
+
+import pysitk.python_helper as ph
+
+
+##
+# Run a wrapper registration method asynchronously. Writing the inputs and
+# reading the results (as well as cache look-ups) happen in the loop's default
+# executor. Cancelling the coroutine kills the command line tool.
+# \date       2026-10-19 01:58:12+0100
+#
+# \param      registration_method  Registration method as WrapperRegistration
+#                                  object
+# \param      timeout              Timeout in seconds for the command line
+#                                  tool; None for no timeout. asyncio.
+#                                  TimeoutError is raised once exceeded
+# \param      output_callback      Callable receiving each (decoded) line of
+#                                  stdout and stderr of the command line
+#                                  tool. If None, lines are printed in verbose
+#                                  mode
+#
+async def run_async(registration_method, timeout=None, output_callback=None):
+
+    registration_method._check_inputs()
+    registration_method._stage_times = {}
+    stage_times = registration_method._stage_times
+
+    loop = asyncio.get_running_loop()
+    time_start = ph.start_timing()
+
+    registration_cache = registration_method.get_registration_cache()
+    key = None
+    if registration_cache is not None:
+        key = await loop.run_in_executor(
+            None, registration_cache.get_key, registration_method)
+        if key is not None and await loop.run_in_executor(
+                None, registration_cache.load, key, registration_method):
+            registration_method._computational_time = \
+                ph.stop_timing(time_start)
+            return
+
+    time_stage = ph.start_timing()
+    interface = await loop.run_in_executor(
+        None, registration_method._get_interface)
+    stage_times["inputs"] = ph.stop_timing(time_stage)
+
+    if output_callback is None and registration_method._verbose:
+        output_callback = sys.stdout.write
+
+    if registration_method._verbose:
+        ph.print_execution(interface.cmdline)
+    time_stage = ph.start_timing()
+    await run_command_async(
+        interface.cmdline, interface.inputs.environ,
+        timeout=timeout, output_callback=output_callback)
+    stage_times["tool"] = ph.stop_timing(time_stage)
+
+    time_stage = ph.start_timing()
+    await loop.run_in_executor(None, registration_method._read_results)
+    stage_times["outputs"] = ph.stop_timing(time_stage)
+
+    registration_method._computational_time = ph.stop_timing(time_start)
+
+    if key is not None:
+        await loop.run_in_executor(
+            None, registration_cache.save, key, registration_method)
+
+
+##
+# Run a command line as asyncio subprocess and stream its output
+# \date       2026-10-19 01:58:12+0100
+#
+# \param      cmdline          Command line; string
+# \param      environ          Environment variables in addition to the ones
+#                              of this process; dictionary
+# \param      timeout          Timeout in seconds; None for no timeout
+# \param      output_callback  Callable receiving each line of output; None
+#                              to discard the output
+#
+async def run_command_async(cmdline,
+                            environ,
+                            timeout=None,
+                            output_callback=None):
+
+    env = dict(os.environ)
+    env.update(environ)
+    process = await asyncio.create_subprocess_exec(
+        *shlex.split(cmdline),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+
+    stderr = []
+
+    async def stream(reader, lines=None):
+        async for line in reader:
+            line = line.decode(errors="replace")
+            if lines is not None:
+                lines.append(line)
+            if output_callback is not None:
+                output_callback(line)
+
+    try:
+        await asyncio.wait_for(asyncio.gather(
+            stream(process.stdout),
+            stream(process.stderr, stderr),
+            process.wait(),
+        ), timeout)
+    except BaseException:
+        # Timeout or cancellation
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    if process.returncode != 0:
+        raise RuntimeError(
+            "Command '%s' returned non-zero exit status %d:\n%s" % (
+                cmdline, process.returncode, "".join(stderr[-20:])))
@@ -18,6 +18,7 @@ import pysitk.simple_itk_helper as sitkh
 
 import simplereg.utilities as utils
 import simplereg.data_reader as dr
+import simplereg.data_writer as dw
 from simplereg.definitions import DIR_TMP, DIR_TEST, DIR_DATA
 
 
@@ -108,7 +109,8 @@ class ApplicationTest(unittest.TestCase):
         for h in HEADERS:
             self.assertEqual(res_nib.header[h], res_nib.header[h])
 
-        diff_nda = res_nib.get_data() - ref_nib.get_data()
+        diff_nda = np.asanyarray(res_nib.dataobj) - \
+            np.asanyarray(ref_nib.dataobj)
         self.assertAlmostEqual(
             np.linalg.norm(diff_nda), 0, places=self.precision)
 
@@ -164,8 +166,11 @@ class ApplicationTest(unittest.TestCase):
 
         res_nda = dr.DataReader.read_transform_flirt(self.output_transform)
         ref_nda = dr.DataReader.read_transform_flirt(self.transform_3D_flirt)
+
+        # Conversion is computed with full precision whereas reference
+        # transforms only provide 6 significant digits
         self.assertAlmostEqual(
-            np.linalg.norm(ref_nda - res_nda), 0, places=self.precision)
+            np.linalg.norm(ref_nda - res_nda), 0, places=4)
 
     def test_transform_swap_sitk_nii(self):
         cmd_args = ["python simplereg_transform.py"]
@@ -179,6 +184,29 @@ class ApplicationTest(unittest.TestCase):
         self.assertAlmostEqual(
             np.linalg.norm(ref_nda - res_nda), 0, places=self.precision)
 
+    def test_transform_swap_sitk_nii_npz(self):
+        landmarks_nda = dr.DataReader.read_landmarks(self.landmarks_3D)
+        labels = np.arange(landmarks_nda.shape[0]) + 10
+        path_to_landmarks = os.path.join(self.dir_output, "landmarks_in.npz")
+        path_to_output = os.path.join(self.dir_output, "landmarks.npz")
+        dw.DataWriter.write_landmarks(
+            landmarks_nda, path_to_landmarks, labels=labels)
+
+        cmd_args = ["python simplereg_transform.py"]
+        cmd_args.append("-sitk2nii %s %s" % (
+            path_to_landmarks, path_to_output))
+        self.assertEqual(ph.execute_command(" ".join(cmd_args)), 0)
+
+        res_nda = dr.DataReader.read_landmarks(path_to_output)
+        landmarks_nda[:, 0:2] *= -1
+        self.assertAlmostEqual(
+            np.linalg.norm(landmarks_nda - res_nda), 0, places=self.precision)
+
+        # Per-point labels are kept
+        attributes = dr.DataReader.read_landmark_attributes(path_to_output)
+        self.assertEqual(list(attributes.keys()), ["labels"])
+        self.assertEqual(np.linalg.norm(attributes["labels"] - labels), 0)
+
     # TODO
     def test_transform_split_labels(self):
         pass
@@ -218,6 +246,19 @@ class ApplicationTest(unittest.TestCase):
             sitk.ReadImage(moving), rotation)
         sitk.WriteImage(image_rotated, fixed)
 
+        # The reference was obtained with ITK 4 which read the grid from the
+        # q-form into a single precision matrix. The s-form of the rotated
+        # image and the double precision q-form deviate from it by up to
+        # 2e-7 in the direction cosines, i.e. sample points move by ~1e-5mm,
+        # which changes the result on the sharp edges of the phantom by
+        # ~1e-3 (norm ~0.03). Hence, set the s-form to the q-form (stored in
+        # single precision) to reproduce the reference grid.
+        fixed_nib = nib.load(fixed)
+        fixed_nib = nib.Nifti1Image(
+            np.asanyarray(fixed_nib.dataobj), None, fixed_nib.header)
+        fixed_nib.set_sform(fixed_nib.get_qform(), code=1)
+        nib.save(fixed_nib, fixed)
+
         reference = os.path.join(
             DIR_TEST, "3D_SheppLoganPhantom_64_OrientedGaussian_s113_atg4.nii.gz")
 
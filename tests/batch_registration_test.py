@@ -0,0 +1,227 @@
+##
+# \file batch_registration_test.py
+#  \brief  Class containing unit tests for scratch directories, inputs and
+#          outputs of wrapper registrations and the batch runner
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import gc
+import shutil
+import nibabel as nib
+import SimpleITK as sitk
+import unittest
+
+import simplereg.flirt
+import simplereg.niftyreg
+import simplereg.data_reader as dr
+import simplereg.batch_registration as br
+import simplereg.stub_executables as se
+from simplereg.niftyreg_to_simpleitk_converter import \
+    NiftyRegToSimpleItkConverter as nreg2sitk
+from simplereg.definitions import DIR_DATA, DIR_TMP, DIR_SCRATCH
+
+
+class BatchRegistrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fixed = os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz")
+        self.moving = os.path.join(DIR_DATA, "3D_Brain_Source.nii.gz")
+        self.fixed_sitk = sitk.ReadImage(self.fixed)
+        self.moving_sitk = sitk.ReadImage(self.moving)
+
+    def test_unique_dir_tmp(self):
+        reg_aladin_1 = simplereg.niftyreg.RegAladin(
+            self.fixed_sitk, self.moving_sitk)
+        reg_aladin_2 = simplereg.niftyreg.RegAladin(
+            self.fixed_sitk, self.moving_sitk)
+        flirt = simplereg.flirt.FLIRT(self.fixed_sitk, self.moving_sitk)
+
+        dirs_tmp = [r.get_dir_tmp() for r in
+                    [reg_aladin_1, reg_aladin_2, flirt]]
+        self.assertEqual(len(set(dirs_tmp)), 3)
+        for dir_tmp in dirs_tmp:
+            self.assertTrue(os.path.isdir(dir_tmp))
+            self.assertEqual(os.path.dirname(dir_tmp), DIR_SCRATCH)
+        self.assertTrue(
+            os.path.basename(dirs_tmp[0]).startswith("RegAladin_"))
+
+        # Removed explicitly, on garbage collection and by context manager
+        reg_aladin_1.cleanup()
+        self.assertFalse(os.path.isdir(dirs_tmp[0]))
+
+        del reg_aladin_2
+        gc.collect()
+        self.assertFalse(os.path.isdir(dirs_tmp[1]))
+
+        with flirt:
+            pass
+        self.assertFalse(os.path.isdir(dirs_tmp[2]))
+
+        with simplereg.niftyreg.RegF3D(
+                self.fixed_sitk, self.moving_sitk) as reg_f3d:
+            dir_tmp = reg_f3d.get_dir_tmp()
+            self.assertTrue(os.path.isdir(dir_tmp))
+        self.assertFalse(os.path.isdir(dir_tmp))
+
+    def test_get_source_path(self):
+        fixed_sitk = dr.DataReader.read_image(self.fixed)
+        self.assertEqual(dr.DataReader.get_source_path(fixed_sitk),
+                         os.path.abspath(self.fixed))
+
+        # Images not read from file or with altered geometry have no source
+        self.assertIsNone(dr.DataReader.get_source_path(self.fixed_sitk))
+        self.assertIsNone(
+            dr.DataReader.get_source_path(sitk.Image(fixed_sitk)))
+        fixed_sitk.SetOrigin([o + 1 for o in fixed_sitk.GetOrigin()])
+        self.assertIsNone(dr.DataReader.get_source_path(fixed_sitk))
+
+        # Images whose pixels were modified in-place have no source
+        fixed_sitk = dr.DataReader.read_image(self.fixed)
+        fixed_sitk[0, 0, 0] = fixed_sitk[0, 0, 0] + 5
+        self.assertIsNone(dr.DataReader.get_source_path(fixed_sitk))
+        fixed_sitk = dr.DataReader.read_image(self.fixed)
+        fixed_sitk.SetPixel(
+            [s // 2 for s in fixed_sitk.GetSize()],
+            fixed_sitk.GetPixel([s // 2 for s in fixed_sitk.GetSize()]) + 5)
+        self.assertIsNone(dr.DataReader.get_source_path(fixed_sitk))
+
+        # Also for images returned by the cache. Their pixel data is hashed
+        # when read from file only, i.e. not on cache hits.
+        get_image_checksum = dr.DataReader._get_image_checksum
+        images_hashed = []
+
+        def _get_image_checksum(image_sitk):
+            images_hashed.append(image_sitk)
+            return get_image_checksum(image_sitk)
+
+        dr.DataReader._get_image_checksum = staticmethod(_get_image_checksum)
+        dr.DataReader.enable_cache()
+        try:
+            for i in range(3):
+                fixed_sitk = dr.DataReader.read_image(self.fixed)
+            self.assertEqual(len(images_hashed), 1)
+            self.assertEqual(dr.DataReader.get_source_path(fixed_sitk),
+                             os.path.abspath(self.fixed))
+
+            fixed_sitk[0, 0, 0] = fixed_sitk[0, 0, 0] + 5
+            self.assertIsNone(dr.DataReader.get_source_path(fixed_sitk))
+            fixed_sitk = dr.DataReader.read_image(self.fixed)
+            self.assertEqual(dr.DataReader.get_source_path(fixed_sitk),
+                             os.path.abspath(self.fixed))
+        finally:
+            dr.DataReader.disable_cache()
+            dr.DataReader._get_image_checksum = \
+                staticmethod(get_image_checksum)
+
+    def test_pass_through_inputs(self):
+        moving_mask_sitk = sitk.BinaryThreshold(self.moving_sitk, 10)
+        with simplereg.niftyreg.RegAladin(
+                fixed_sitk=self.fixed,
+                moving_sitk=dr.DataReader.read_image(self.moving),
+                moving_sitk_mask=moving_mask_sitk) as reg_aladin:
+
+            # Files of read images are handed to the tool
+            self.assertEqual(
+                reg_aladin._get_path_to_image(
+                    reg_aladin.get_fixed_sitk(), "fixed.nii"),
+                os.path.abspath(self.fixed))
+            self.assertEqual(
+                reg_aladin._get_path_to_image(
+                    reg_aladin.get_moving_sitk(), "moving.nii"),
+                os.path.abspath(self.moving))
+
+            # Others are written uncompressed into the scratch directory
+            path_to_mask = reg_aladin._get_path_to_image(
+                reg_aladin.get_moving_sitk_mask(), "moving_mask.nii")
+            self.assertEqual(path_to_mask, os.path.join(
+                reg_aladin.get_dir_tmp(), "moving_mask.nii"))
+            nda_diff = sitk.GetArrayFromImage(sitk.ReadImage(path_to_mask)) - \
+                sitk.GetArrayFromImage(moving_mask_sitk)
+            self.assertEqual(abs(nda_diff).sum(), 0)
+
+    def test_transform_only(self):
+        transform_sitk = sitk.Euler3DTransform()
+        transform_sitk.SetTranslation((1, -2, 3))
+
+        for registration_method in [
+            simplereg.niftyreg.RegAladin(
+                self.fixed_sitk, self.moving_sitk, transform_only=True),
+            simplereg.flirt.FLIRT(
+                self.fixed_sitk, self.moving_sitk, transform_only=True),
+        ]:
+            with registration_method:
+                self.assertRaises(
+                    UnboundLocalError,
+                    registration_method.get_warped_moving_sitk)
+
+                # Warped image is resampled in-process once requested
+                registration_method._registration_transform_sitk = \
+                    transform_sitk
+                warped_moving_sitk = sitk.Resample(
+                    self.moving_sitk, self.fixed_sitk, transform_sitk,
+                    sitk.sitkLinear, 0., sitk.sitkFloat64)
+                nda_diff = sitk.GetArrayFromImage(
+                    registration_method.get_warped_moving_sitk()) - \
+                    sitk.GetArrayFromImage(warped_moving_sitk)
+                self.assertAlmostEqual(abs(nda_diff).max(), 0, places=5)
+
+        # No registered output image is requested from FLIRT
+        flt = simplereg.flirt._FLIRTTransformOnly()
+        flt.inputs.in_file = self.moving
+        flt.inputs.reference = self.fixed
+        flt.inputs.out_matrix_file = os.path.join(DIR_TMP, "matrix.txt")
+        self.assertNotIn("-out", flt.cmdline)
+
+        job = {"method": "FLIRT", "fixed": self.fixed, "moving": self.moving}
+        with br.get_registration_method(job) as registration_method:
+            self.assertTrue(registration_method._transform_only)
+        job["output_warped"] = os.path.join(DIR_TMP, "warped.nii.gz")
+        with br.get_registration_method(job) as registration_method:
+            self.assertFalse(registration_method._transform_only)
+
+    def test_run_registration_reg_f3d(self):
+        dir_output = os.path.join(DIR_TMP, "batch_registration")
+        if os.path.isdir(dir_output):
+            shutil.rmtree(dir_output)
+        dir_stubs = os.path.join(dir_output, "bin")
+        se.write_stub_executables(dir_stubs, ["reg_f3d"])
+
+        path = os.environ["PATH"]
+        os.environ["PATH"] = dir_stubs + os.pathsep + path
+        try:
+            job = {
+                "method": "RegF3D",
+                "fixed": self.fixed,
+                "moving": self.moving,
+                "options": "-voff",
+                "output_transform": os.path.join(dir_output, "cpp.nii.gz"),
+            }
+            br.run_registration(job)
+        finally:
+            os.environ["PATH"] = path
+
+        # Written control point grid keeps its intent codes and can be
+        # converted into a displacement field
+        cpp_nib = nib.load(job["output_transform"])
+        self.assertEqual(cpp_nib.header.get_intent()[0], "vector")
+        self.assertEqual(int(cpp_nib.header["intent_p1"]), 5)
+        displacement_sitk = \
+            nreg2sitk.convert_regf3d_cpp_to_sitk_displacement(
+                cpp_nib, self.fixed_sitk)
+        self.assertEqual(displacement_sitk.GetSize(),
+                         self.fixed_sitk.GetSize())
+
+    def test_run_batch_failures(self):
+        jobs = [
+            {"method": "Elastix", "fixed": self.fixed, "moving": self.moving},
+            {"method": "RegAladin", "fixed": self.fixed,
+             "moving": os.path.join(DIR_TMP, "non_existing.nii.gz")},
+        ]
+
+        # Failed jobs are reported without stopping the batch
+        results = br.run_batch(jobs, n_processes=2)
+        self.assertEqual(len(results), 2)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIsInstance(results[1], IOError)
@@ -0,0 +1,116 @@
+##
+# \file data_cache_test.py
+#  \brief  Class containing unit tests for the image and transform cache
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import pysitk.simple_itk_helper as sitkh
+
+import simplereg.data_reader as dr
+from simplereg.definitions import DIR_TMP, DIR_DATA, DIR_TEST
+
+
+class DataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_output = os.path.join(DIR_TMP, "data_cache")
+
+        self.image_3D = os.path.join(
+            DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz")
+        self.transform_3D = os.path.join(
+            DIR_TEST, "3D_sitk_Target_Source.txt")
+
+        # Shepp-Logan phantom: 64^3 voxels of 64-bit float
+        self.nbytes = 64**3 * 8
+
+    def tearDown(self):
+        dr.DataReader.disable_cache()
+
+    def test_cache_image(self):
+        self.assertIsNone(dr.DataReader.get_cache_statistics())
+
+        dr.DataReader.enable_cache()
+        image_sitk = dr.DataReader.read_image(self.image_3D)
+        nda = sitk.GetArrayFromImage(image_sitk)
+
+        # Altering returned images does not alter the cache
+        image_sitk[0, 0, 0] = 1e3
+        image_sitk = dr.DataReader.read_image(self.image_3D)
+        self.assertEqual(image_sitk[0, 0, 0], nda[0, 0, 0])
+        self.assertEqual(
+            np.linalg.norm(sitk.GetArrayFromImage(image_sitk) - nda), 0)
+
+        statistics = dr.DataReader.get_cache_statistics()
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 1)
+        self.assertEqual(statistics["entries"], 1)
+        self.assertEqual(statistics["bytes"], self.nbytes)
+
+        # Read options are part of the key
+        image_sitk = dr.DataReader.read_image(
+            self.image_3D, precision="float32")
+        self.assertEqual(image_sitk.GetPixelID(), sitk.sitkFloat32)
+        self.assertEqual(dr.DataReader.get_cache_statistics()["entries"], 2)
+
+    def test_cache_modified_file(self):
+        path_to_image = os.path.join(self.dir_output, "image.nii.gz")
+        image_sitk = sitk.ReadImage(self.image_3D)
+        sitkh.write_nifti_image_sitk(image_sitk, path_to_image)
+
+        dr.DataReader.enable_cache()
+        dr.DataReader.read_image(path_to_image)
+
+        sitkh.write_nifti_image_sitk(image_sitk * 2., path_to_image)
+        stat = os.stat(path_to_image)
+        os.utime(path_to_image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        image_2_sitk = dr.DataReader.read_image(path_to_image)
+
+        self.assertEqual(dr.DataReader.get_cache_statistics()["misses"], 2)
+        nda_diff = sitk.GetArrayFromImage(image_2_sitk - image_sitk * 2.)
+        self.assertEqual(np.linalg.norm(nda_diff), 0)
+
+    def test_cache_eviction(self):
+        path_to_image = os.path.join(self.dir_output, "image.nii.gz")
+        sitkh.write_nifti_image_sitk(
+            sitk.ReadImage(self.image_3D), path_to_image)
+
+        dr.DataReader.enable_cache(max_bytes=1.5 * self.nbytes)
+        dr.DataReader.read_image(self.image_3D)
+        dr.DataReader.read_image(path_to_image)
+        dr.DataReader.read_image(path_to_image)
+        dr.DataReader.read_image(self.image_3D)
+
+        statistics = dr.DataReader.get_cache_statistics()
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 3)
+        self.assertEqual(statistics["evictions"], 2)
+        self.assertEqual(statistics["entries"], 1)
+
+        # Objects exceeding the budget are not cached
+        dr.DataReader.enable_cache(max_bytes=self.nbytes - 1)
+        dr.DataReader.read_image(self.image_3D)
+        self.assertEqual(dr.DataReader.get_cache_statistics()["entries"], 0)
+
+    def test_cache_transform(self):
+        dr.DataReader.enable_cache()
+        transform_sitk = dr.DataReader.read_transform(self.transform_3D)
+        parameters = transform_sitk.GetParameters()
+
+        transform_sitk.SetParameters((0, ) * len(parameters))
+        transform_sitk = dr.DataReader.read_transform(self.transform_3D)
+        self.assertIsInstance(transform_sitk, sitk.AffineTransform)
+        self.assertEqual(transform_sitk.GetParameters(), parameters)
+
+        transform_inv_sitk = dr.DataReader.read_transform(
+            self.transform_3D, inverse=1)
+        self.assertNotEqual(transform_inv_sitk.GetParameters(), parameters)
+
+        statistics = dr.DataReader.get_cache_statistics()
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 2)
@@ -122,3 +122,18 @@ class FlirtTest(unittest.TestCase):
         )
 
         self.registration_method.run()
+
+    def test_registration_3D_transform_only(self):
+
+        self.fixed_sitk = self.fixed_sitk_3D
+        self.moving_sitk = self.moving_sitk_3D
+        self.show_fig = 0
+
+        self.registration_method = simplereg.flirt.FLIRT(
+            fixed_sitk=self.fixed_sitk,
+            moving_sitk=self.moving_sitk,
+            options="-dof 6",
+            transform_only=True,
+        )
+
+        self.registration_method.run()
@@ -0,0 +1,89 @@
+##
+# \file landmark_io_test.py
+#  \brief  Class containing unit tests for reading and writing landmarks
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+import simplereg.landmark_visualizer as lv
+from simplereg.definitions import DIR_TMP, DIR_TEST
+
+
+class LandmarkIOTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_output = os.path.join(DIR_TMP, "landmark_io")
+
+        self.image_3D = os.path.join(
+            DIR_TEST, "3D_Brain_Template_fiducials.nii.gz")
+        self.landmarks_3D = os.path.join(
+            DIR_TEST, "3D_Brain_Template_landmarks.txt")
+
+    def test_read_write_landmarks(self):
+        landmarks_nda = dr.DataReader.read_landmarks(self.landmarks_3D)
+
+        for extension in ["txt", "npy", "npz"]:
+            path_to_landmarks = os.path.join(
+                self.dir_output, "landmarks.%s" % extension)
+            dw.DataWriter.write_landmarks(landmarks_nda, path_to_landmarks)
+            res_nda = dr.DataReader.read_landmarks(path_to_landmarks)
+            self.assertEqual(res_nda.shape, landmarks_nda.shape)
+            self.assertAlmostEqual(
+                np.linalg.norm(res_nda - landmarks_nda), 0, places=6)
+            self.assertEqual(
+                dr.DataReader.read_landmark_attributes(path_to_landmarks), {})
+
+        self.assertRaises(IOError, lambda: dw.DataWriter.write_landmarks(
+            landmarks_nda, os.path.join(self.dir_output, "landmarks.csv")))
+
+    def test_read_write_point_cloud(self):
+        path_to_points = os.path.join(self.dir_output, "points.npz")
+        path_to_points_mmap = os.path.join(self.dir_output, "points.npy")
+
+        points_nda = np.random.RandomState(1).rand(100000, 3) * 100
+        labels = np.arange(points_nda.shape[0]) % 7
+        weights = np.linspace(0, 1, points_nda.shape[0])
+
+        dw.DataWriter.write_landmarks(
+            points_nda, path_to_points, labels=labels, weights=weights)
+        self.assertEqual(np.linalg.norm(
+            dr.DataReader.read_landmarks(path_to_points) - points_nda), 0)
+
+        attributes = dr.DataReader.read_landmark_attributes(path_to_points)
+        self.assertEqual(np.linalg.norm(attributes["labels"] - labels), 0)
+        self.assertEqual(np.linalg.norm(attributes["weights"] - weights), 0)
+
+        dw.DataWriter.write_landmarks(points_nda, path_to_points_mmap)
+        res_nda = dr.DataReader.read_landmarks(path_to_points_mmap, mmap=1)
+        self.assertIsInstance(res_nda, np.memmap)
+        self.assertEqual(np.linalg.norm(res_nda - points_nda), 0)
+
+        # One attribute value per point is required
+        self.assertRaises(ValueError, lambda: dw.DataWriter.write_landmarks(
+            points_nda, path_to_points, labels=labels[1:]))
+
+    def test_landmark_visualizer_labels(self):
+        image_sitk = sitk.ReadImage(self.image_3D)
+        landmarks_nda = dr.DataReader.read_landmarks(self.landmarks_3D)
+        labels = np.arange(landmarks_nda.shape[0]) + 300
+
+        landmark_visualizer = lv.LandmarkVisualizer(
+            landmarks_nda=landmarks_nda,
+            direction=image_sitk.GetDirection(),
+            origin=image_sitk.GetOrigin(),
+            spacing=image_sitk.GetSpacing(),
+            size=image_sitk.GetSize(),
+            labels=labels,
+        )
+        landmark_visualizer.build_landmark_image_sitk(marker="dot")
+        nda = landmark_visualizer.get_image_nda()
+
+        self.assertEqual(nda.dtype, np.uint16)
+        self.assertEqual(list(np.unique(nda)), [0] + list(labels))
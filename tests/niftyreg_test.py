@@ -7,6 +7,7 @@
 
 import os
 import numpy as np
+import nibabel as nib
 import SimpleITK as sitk
 import unittest
 
@@ -139,6 +140,23 @@ class NiftyRegTest(unittest.TestCase):
 
         self.tearDown_reg_aladin()
 
+    def test_registration_reg_aladin_3D_transform_only(self):
+
+        self.fixed_sitk = self.fixed_sitk_3D
+        self.moving_sitk = self.moving_sitk_3D
+        self.show_fig = 0
+
+        self.registration_method = simplereg.niftyreg.RegAladin(
+            fixed_sitk=self.fixed_sitk,
+            moving_sitk=self.moving_sitk,
+            options="-voff",
+            transform_only=True,
+        )
+
+        self.registration_method.run()
+
+        self.tearDown_reg_aladin()
+
     def test_registration_reg_f3d_2D(self):
 
         self.fixed_sitk = self.fixed_sitk_2D
@@ -175,3 +193,106 @@ class NiftyRegTest(unittest.TestCase):
 
         self.registration_method.run()
         self.tearDown_reg_f3d()
+
+    def test_reg_f3d_in_process_warps(self):
+        fixed_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz"))
+        moving_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Source.nii.gz"))
+        moving_sitk_mask = sitk.BinaryThreshold(moving_sitk, 50)
+
+        # Control point grid (spacing of 5 voxels) of a translation by t
+        t_ras = np.array([2., -3., 1.])
+        A_fixed = np.eye(4)
+        A_fixed[0:3, 0:3] = np.array(fixed_sitk.GetDirection()).reshape(
+            3, 3).dot(np.diag(fixed_sitk.GetSpacing()))
+        A_fixed[0:3, 3] = fixed_sitk.GetOrigin()
+        A_grid = np.diag([-1., -1., 1., 1.]).dot(A_fixed).dot(
+            np.array([[5, 0, 0, -5], [0, 5, 0, -5], [0, 0, 5, -5],
+                      [0, 0, 0, 1]]))
+        size = [int(np.ceil(s / 5.)) + 3 for s in fixed_sitk.GetSize()]
+        index = np.stack(np.meshgrid(
+            *[np.arange(s) for s in size], indexing="ij"), axis=-1)
+        positions = index.dot(A_grid[0:3, 0:3].transpose()) + \
+            A_grid[0:3, 3] + t_ras
+        cpp_nib = nib.Nifti1Image(
+            positions.reshape(size + [1, 3]), A_grid)
+        cpp_nib.header["intent_p1"] = 5
+
+        registration_method = simplereg.niftyreg.RegF3D(
+            fixed_sitk=fixed_sitk,
+            moving_sitk=moving_sitk,
+            moving_sitk_mask=moving_sitk_mask,
+        )
+        self.assertRaises(
+            UnboundLocalError,
+            registration_method.get_displacement_field_transform_sitk)
+        registration_method._registration_control_point_grid_nib = cpp_nib
+
+        translation_sitk = sitk.TranslationTransform(
+            3, (-t_ras[0], -t_ras[1], t_ras[2]))
+        for image_sitk, interpolator, order in [
+            (moving_sitk, sitk.sitkLinear, 1),
+            (moving_sitk_mask, sitk.sitkNearestNeighbor, 0),
+            (sitk.Compose(moving_sitk, 2 * moving_sitk), sitk.sitkLinear, 1),
+        ]:
+            warped_sitk = registration_method.get_deformed_image_sitk(
+                fixed_sitk, image_sitk, order)
+            warped_ref_sitk = sitk.Resample(
+                image_sitk, fixed_sitk, translation_sitk, interpolator, 0.,
+                image_sitk.GetPixelIDValue())
+            self.assertEqual(warped_sitk.GetPixelIDValue(),
+                             image_sitk.GetPixelIDValue())
+
+            # Ignore boundary where the interpolated field drops off
+            nda_diff = sitk.GetArrayFromImage(warped_sitk - warped_ref_sitk)
+            self.assertAlmostEqual(
+                np.abs(nda_diff[5:-5, 5:-5, 5:-5]).max(), 0, places=3)
+
+        # Displacement field is evaluated once
+        self.assertIs(
+            registration_method.get_displacement_field_transform_sitk(),
+            registration_method.get_displacement_field_transform_sitk())
+
+        # Other grids within the control point grid are evaluated separately
+        coarse_sitk = sitk.Resample(
+            fixed_sitk,
+            [s // 2 for s in fixed_sitk.GetSize()],
+            sitk.Transform(),
+            sitk.sitkLinear,
+            fixed_sitk.GetOrigin(),
+            [2 * s for s in fixed_sitk.GetSpacing()],
+            fixed_sitk.GetDirection())
+        warped_sitk = registration_method.get_deformed_image_sitk(
+            coarse_sitk, moving_sitk, 1)
+        warped_ref_sitk = sitk.Resample(
+            moving_sitk, coarse_sitk, translation_sitk, sitk.sitkLinear, 0.,
+            moving_sitk.GetPixelIDValue())
+        self.assertEqual(warped_sitk.GetSize(), coarse_sitk.GetSize())
+        nda_diff = sitk.GetArrayFromImage(warped_sitk - warped_ref_sitk)
+        self.assertAlmostEqual(
+            np.abs(nda_diff[3:-3, 3:-3, 3:-3]).max(), 0, places=3)
+
+        # Grids exceeding the control point grid are rejected
+        shifted_sitk = sitk.Image(fixed_sitk)
+        shifted_sitk.SetOrigin(fixed_sitk.TransformIndexToPhysicalPoint(
+            (-20, 0, 0)))
+        self.assertRaises(
+            ValueError, lambda: registration_method.get_deformed_image_sitk(
+                shifted_sitk, moving_sitk, 1))
+        self.assertRaises(
+            ValueError, lambda: registration_method.get_deformed_image_sitk(
+                fixed_sitk, moving_sitk, 2))
+
+    def test_read_image_and_verbose(self):
+        path_to_fixed = os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz")
+        registration_method = simplereg.niftyreg.RegAladin()
+
+        # Also paths given as unicode (Python 2) are read from file
+        fixed_sitk = registration_method._read_image(u"%s" % path_to_fixed)
+        self.assertIsInstance(fixed_sitk, sitk.Image)
+        self.assertIs(registration_method._read_image(fixed_sitk), fixed_sitk)
+
+        for verbose in [True, False]:
+            registration_method.set_verbose(verbose)
+            self.assertEqual(registration_method.get_verbose(), verbose)
@@ -0,0 +1,103 @@
+##
+# \file parallel_gzip_test.py
+#  \brief  Class containing unit tests for the parallel gzip writer
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import gzip
+import numpy as np
+import nibabel as nib
+import SimpleITK as sitk
+import unittest
+
+import simplereg.definitions as definitions
+import simplereg.parallel_gzip as pgz
+import simplereg.data_writer as dw
+from simplereg.definitions import DIR_TMP, DIR_DATA
+
+
+class ParallelGzipTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_output = os.path.join(DIR_TMP, "parallel_gzip")
+
+        self.image_3D = os.path.join(
+            DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz")
+
+        self.compression_default = definitions.COMPRESSION
+
+    def tearDown(self):
+        definitions.COMPRESSION = self.compression_default
+
+    def test_get_compression_level(self):
+        definitions.COMPRESSION = None
+        self.assertIsNone(pgz.get_compression_level())
+        self.assertEqual(pgz.get_compression_level("fast"), 1)
+        self.assertEqual(pgz.get_compression_level("3"), 3)
+
+        definitions.COMPRESSION = "store"
+        self.assertEqual(pgz.get_compression_level(), 0)
+
+        self.assertRaises(ValueError, lambda: pgz.get_compression_level(10))
+        self.assertRaises(
+            ValueError, lambda: pgz.get_compression_level("fastest"))
+
+    def test_compress_file(self):
+        path_to_input = os.path.join(self.dir_output, "data.bin")
+        path_to_output = os.path.join(self.dir_output, "data.bin.gz")
+        if not os.path.isdir(self.dir_output):
+            os.makedirs(self.dir_output)
+
+        data = np.random.RandomState(1).randint(
+            0, 4, size=300000).astype(np.uint8).tobytes()
+        with open(path_to_input, "wb") as fout:
+            fout.write(data)
+
+        # Several gzip members compressed by several threads
+        pgz.compress_file(
+            path_to_input, path_to_output, level=1, block_size=2**15,
+            n_threads=3)
+        with gzip.open(path_to_output, "rb") as fin:
+            self.assertEqual(fin.read(), data)
+
+    def test_write_image(self):
+        path_to_image = os.path.join(self.dir_output, "image.nii.gz")
+        path_to_image_store = os.path.join(
+            self.dir_output, "image_store.nii.gz")
+        image_sitk = sitk.ReadImage(self.image_3D)
+        nda = sitk.GetArrayFromImage(image_sitk)
+
+        dw.DataWriter.write_image(
+            image_sitk, path_to_image, compression="fast")
+        dw.DataWriter.write_image(
+            image_sitk, path_to_image_store, compression="store")
+        self.assertGreater(os.path.getsize(path_to_image_store),
+                           os.path.getsize(path_to_image))
+
+        # No temporary files are left behind
+        self.assertEqual(
+            [f for f in os.listdir(self.dir_output) if f.startswith(".")], [])
+
+        for path in [path_to_image, path_to_image_store]:
+            image_written_sitk = sitk.ReadImage(path)
+            self.assertEqual(image_written_sitk.GetOrigin(),
+                             image_sitk.GetOrigin())
+            nda_diff = sitk.GetArrayFromImage(image_written_sitk) - nda
+            self.assertEqual(np.linalg.norm(nda_diff), 0)
+
+            nda_nib = np.asanyarray(nib.load(path).dataobj).transpose()
+            self.assertEqual(np.linalg.norm(nda_nib - nda), 0)
+
+    def test_write_image_nib(self):
+        path_to_image = os.path.join(self.dir_output, "image_nib.nii.gz")
+        image_nib = nib.load(self.image_3D)
+
+        # Package-wide setting
+        definitions.COMPRESSION = 9
+        dw.DataWriter.write_image(image_nib, path_to_image)
+
+        nda_diff = np.asanyarray(nib.load(path_to_image).dataobj) - \
+            np.asanyarray(image_nib.dataobj)
+        self.assertEqual(np.linalg.norm(nda_diff), 0)
@@ -0,0 +1,109 @@
+##
+# \file precision_test.py
+#  \brief  Class containing unit tests for floating point precision settings
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import pysitk.simple_itk_helper as sitkh
+
+import simplereg.precision as prec
+import simplereg.definitions as definitions
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+from simplereg.definitions import DIR_TMP, DIR_DATA, DIR_TEST
+
+
+class PrecisionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_output = os.path.join(DIR_TMP, "precision")
+
+        self.image_3D = os.path.join(
+            DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz")
+        self.image_3D_int = os.path.join(
+            DIR_DATA, "3D_Brain_Source.nii.gz")
+        self.transform_3D = os.path.join(
+            DIR_TEST, "3D_sitk_Target_Source.txt")
+
+        self.precision_default = definitions.PRECISION
+
+    def tearDown(self):
+        definitions.PRECISION = self.precision_default
+
+    def test_get_precision(self):
+        definitions.PRECISION = "float32"
+        self.assertEqual(prec.get_precision(), "float32")
+        self.assertEqual(prec.get_precision("float64"), "float64")
+        self.assertEqual(prec.get_dtype(), np.float32)
+
+        self.assertRaises(ValueError, lambda: prec.get_precision("float16"))
+
+    def test_get_limited_dtype(self):
+        self.assertEqual(
+            prec.get_limited_dtype(np.float64, "float32"), np.float32)
+        self.assertEqual(
+            prec.get_limited_dtype(np.float32, "float64"), np.float32)
+        self.assertEqual(
+            prec.get_limited_dtype(np.int16, "float32"), np.int16)
+
+    def test_read_image(self):
+        image_sitk = dr.DataReader.read_image(self.image_3D)
+        self.assertEqual(image_sitk.GetPixelID(), sitk.sitkFloat64)
+
+        # Package-wide setting
+        definitions.PRECISION = "float32"
+        image32_sitk = dr.DataReader.read_image(self.image_3D)
+        self.assertEqual(image32_sitk.GetPixelID(), sitk.sitkFloat32)
+
+        # Per-call override
+        image64_sitk = dr.DataReader.read_image(
+            self.image_3D, precision="float64")
+        self.assertEqual(image64_sitk.GetPixelID(), sitk.sitkFloat64)
+
+        # Integer images are never altered
+        image_sitk = dr.DataReader.read_image(self.image_3D_int)
+        self.assertEqual(image_sitk.GetPixelID(), sitk.sitkInt16)
+
+        nda_diff = sitk.GetArrayFromImage(image32_sitk) - \
+            sitk.GetArrayFromImage(image64_sitk)
+        self.assertLessEqual(
+            np.max(np.abs(nda_diff)),
+            np.finfo(np.float32).eps * np.max(np.abs(
+                sitk.GetArrayFromImage(image64_sitk))))
+
+    def test_write_displacement_field(self):
+        path_to_displacement = os.path.join(
+            self.dir_output, "displacement.nii.gz")
+
+        image_sitk = sitk.ReadImage(self.image_3D)
+        transform_sitk = sitkh.read_transform_sitk(self.transform_3D)
+        displacement_sitk = sitk.TransformToDisplacementField(
+            transform_sitk,
+            sitk.sitkVectorFloat64,
+            image_sitk.GetSize(),
+            image_sitk.GetOrigin(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetDirection(),
+        )
+        dw.DataWriter.write_transform(
+            displacement_sitk, path_to_displacement, precision="float32")
+
+        displacement32_sitk = sitk.ReadImage(path_to_displacement)
+        self.assertEqual(displacement32_sitk.GetPixelID(),
+                         sitk.sitkVectorFloat32)
+
+        # Float32 displacements (here of up to 7.3 mm) are accurate up to a
+        # relative error of float32 machine precision
+        transform32_sitk = dr.DataReader.read_transform(path_to_displacement)
+        nda = sitk.GetArrayFromImage(displacement_sitk)
+        nda_diff = sitk.GetArrayFromImage(
+            transform32_sitk.GetDisplacementField()) - nda
+        self.assertLessEqual(
+            np.max(np.abs(nda_diff)),
+            np.finfo(np.float32).eps * np.max(np.abs(nda)))
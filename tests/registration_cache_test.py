@@ -0,0 +1,214 @@
+##
+# \file registration_cache_test.py
+#  \brief  Class containing unit tests for the cache of registration results
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import errno
+import shutil
+import datetime
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import pysitk.python_helper as ph
+
+import simplereg.niftyreg
+import simplereg.simple_itk_registration as sitkreg
+from simplereg.registration_cache import RegistrationCache
+from simplereg.simple_itk_registration_base import SimpleItkRegistrationBase
+from simplereg.definitions import DIR_DATA, DIR_TMP
+
+
+class RegistrationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.precision = 7
+        self.dir_cache = os.path.join(DIR_TMP, "registration_cache_test")
+        if os.path.isdir(self.dir_cache):
+            shutil.rmtree(self.dir_cache)
+
+        self.fixed_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "2D_Brain_Target.png"), sitk.sitkFloat64)
+        self.moving_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "2D_Brain_Source.png"), sitk.sitkFloat64)
+
+    def tearDown(self):
+        SimpleItkRegistrationBase.disable_registration_cache()
+
+    def _get_registration_method(self, **kwargs):
+        return sitkreg.SimpleItkRegistration(
+            fixed_sitk=self.fixed_sitk,
+            moving_sitk=self.moving_sitk,
+            optimizer_params={
+                "minStep": 1e-6,
+                "numberOfIterations": 20,
+                "gradientMagnitudeTolerance": 1e-6,
+                "learningRate": 1,
+            },
+            verbose=0,
+            **kwargs)
+
+    def test_simple_itk_registration(self):
+        SimpleItkRegistrationBase.enable_registration_cache(self.dir_cache)
+        registration_cache = SimpleItkRegistrationBase.get_registration_cache()
+
+        registration_method = self._get_registration_method()
+        registration_method.run()
+        parameters = registration_method.\
+            get_registration_transform_sitk().GetParameters()
+        self.assertEqual(registration_cache.get_statistics()["misses"], 1)
+        self.assertEqual(registration_cache.get_statistics()["entries"], 1)
+
+        # Identical images and options are looked up
+        registration_method = self._get_registration_method()
+        registration_method.run()
+        transform_sitk = registration_method.get_registration_transform_sitk()
+        self.assertIsInstance(transform_sitk, sitk.Euler2DTransform)
+        self.assertAlmostEqual(np.linalg.norm(
+            np.array(transform_sitk.GetParameters()) - parameters),
+            0, places=self.precision)
+        self.assertEqual(registration_cache.get_statistics()["hits"], 1)
+
+        # Resampling works as for computed results
+        warped_moving_sitk = registration_method.get_warped_moving_sitk()
+        self.assertEqual(warped_moving_sitk.GetSize(),
+                         self.fixed_sitk.GetSize())
+
+        # Changed options miss the cache
+        registration_method = self._get_registration_method(
+            metric="MeanSquares")
+        registration_method.run()
+        self.assertEqual(registration_cache.get_statistics()["misses"], 2)
+        self.assertEqual(registration_cache.get_statistics()["entries"], 2)
+
+        entries = registration_cache.get_entries()
+        self.assertEqual(entries[-1]["options"]["metric"], "MeanSquares")
+        self.assertEqual(entries[-1]["class"], "SimpleItkRegistration")
+
+    def test_get_key(self):
+        registration_method = self._get_registration_method()
+        key = RegistrationCache.get_key(registration_method)
+        self.assertEqual(key, RegistrationCache.get_key(
+            self._get_registration_method()))
+
+        # Images and options are part of the key
+        registration_method = self._get_registration_method(
+            fixed_sitk_mask=sitk.Cast(self.fixed_sitk > 0, sitk.sitkUInt8))
+        self.assertNotEqual(key, RegistrationCache.get_key(
+            registration_method))
+        self.assertNotEqual(key, RegistrationCache.get_key(
+            self._get_registration_method(registration_type="Affine")))
+
+        moving_sitk = sitk.Image(self.moving_sitk)
+        moving_sitk[0, 0] = 1.
+        registration_method.set_moving_sitk(moving_sitk)
+        self.assertNotEqual(key, RegistrationCache.get_key(
+            registration_method))
+
+    def test_wrapper_registration(self):
+        fixed_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz"))
+        moving_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Source.nii.gz"))
+        SimpleItkRegistrationBase.enable_registration_cache(
+            self.dir_cache, cache_warped=True)
+        registration_cache = SimpleItkRegistrationBase.get_registration_cache()
+
+        # Store result as obtained by a run of reg_aladin
+        transform_sitk = sitk.Euler3DTransform()
+        transform_sitk.SetRotation(0.1, -0.05, 0.2)
+        transform_sitk.SetTranslation((3, -2, 5))
+        with simplereg.niftyreg.RegAladin(fixed_sitk, moving_sitk) as nreg:
+            nreg._registration_transform_sitk = transform_sitk
+            nreg._computational_time = datetime.timedelta(seconds=10)
+            registration_cache.save(
+                registration_cache.get_key(nreg), nreg)
+            warped_moving_sitk = nreg.get_warped_moving_sitk()
+
+        # Cached results do not require reg_aladin
+        with simplereg.niftyreg.RegAladin(fixed_sitk, moving_sitk) as nreg:
+            nreg.run()
+            self.assertAlmostEqual(np.linalg.norm(
+                np.array(nreg.get_registration_transform_sitk().
+                         GetParameters()) -
+                np.array(transform_sitk.GetParameters())),
+                0, places=self.precision)
+            nda = sitk.GetArrayFromImage(nreg.get_warped_moving_sitk())
+            self.assertAlmostEqual(np.linalg.norm(
+                nda - sitk.GetArrayFromImage(warped_moving_sitk)),
+                0, places=self.precision)
+
+        entries = registration_cache.get_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["class"], "RegAladin")
+        self.assertEqual(entries[0]["computational_time"], 10)
+
+    def test_evict_and_clear(self):
+        SimpleItkRegistrationBase.enable_registration_cache(self.dir_cache)
+        registration_cache = SimpleItkRegistrationBase.get_registration_cache()
+
+        for metric in ["Correlation", "MeanSquares", "MattesMutualInformation"]:
+            self._get_registration_method(metric=metric).run()
+        entries = registration_cache.get_entries()
+        self.assertEqual(len(entries), 3)
+
+        # Least recently used entry is evicted first
+        self._get_registration_method(metric="Correlation").run()
+        n_bytes = registration_cache.get_statistics()["bytes"]
+        registration_cache.evict(n_bytes - 1)
+        keys = [e["key"] for e in registration_cache.get_entries()]
+        self.assertEqual(len(keys), 2)
+        self.assertNotIn(entries[1]["key"], keys)
+        self.assertIn(entries[0]["key"], keys)
+
+        registration_cache.clear()
+        self.assertEqual(registration_cache.get_entries(), [])
+
+    def test_save_failure(self):
+        SimpleItkRegistrationBase.enable_registration_cache(self.dir_cache)
+        registration_cache = SimpleItkRegistrationBase.get_registration_cache()
+
+        # Failing writes (e.g. full disk) neither leave an entry behind nor
+        # affect the registration result
+        def _write_cache_results(directory, cache_warped):
+            raise IOError(errno.ENOSPC, "No space left on device")
+
+        registration_method = self._get_registration_method()
+        registration_method._write_cache_results = _write_cache_results
+        registration_method.run()
+        registration_method.get_registration_transform_sitk()
+        self.assertEqual(registration_cache.get_entries(), [])
+        self.assertEqual(os.listdir(self.dir_cache), [])
+
+        # Entries written concurrently by another process are kept
+        registration_method = self._get_registration_method()
+        key = registration_cache.get_key(registration_method)
+        write_cache_results = registration_method._write_cache_results
+
+        def _write_cache_results_concurrently(directory, cache_warped):
+            write_cache_results(directory, cache_warped)
+            shutil.copytree(directory, os.path.join(self.dir_cache, key))
+
+        registration_method._write_cache_results = \
+            _write_cache_results_concurrently
+        registration_method.run()
+        self.assertEqual(os.listdir(self.dir_cache), [key])
+
+    def test_application(self):
+        SimpleItkRegistrationBase.enable_registration_cache(self.dir_cache)
+        self._get_registration_method().run()
+
+        cmd_args = ["python simplereg_registration_cache.py"]
+        cmd_args.append("-d %s" % self.dir_cache)
+        cmd_args.append("--list")
+        self.assertEqual(ph.execute_command(" ".join(cmd_args)), 0)
+
+        cmd_args = ["python simplereg_registration_cache.py"]
+        cmd_args.append("-d %s" % self.dir_cache)
+        cmd_args.append("--clear")
+        self.assertEqual(ph.execute_command(" ".join(cmd_args)), 0)
+
+        self.assertEqual(RegistrationCache(self.dir_cache).get_entries(), [])
@@ -0,0 +1,77 @@
+##
+# \file registration_scheduler_test.py
+#  \brief  Class containing unit tests for the CPU-budget-aware registration
+#          scheduler
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import unittest
+
+import simplereg.registration_scheduler as rs
+from simplereg.definitions import DIR_DATA, DIR_TMP
+
+
+class RegistrationSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_output = os.path.join(DIR_TMP, "registration_scheduler")
+
+        self.fixed_2D = os.path.join(DIR_DATA, "2D_Brain_Target.nii.gz")
+        self.moving_2D = os.path.join(DIR_DATA, "2D_Brain_Source.nii.gz")
+        self.fixed_3D = os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz")
+
+    def test_get_number_of_threads(self):
+        scheduler = rs.RegistrationScheduler(
+            n_cores=4, voxels_per_thread=100)
+
+        # Large images get all threads of the budget
+        job = {"method": "RegAladin", "fixed": self.fixed_3D}
+        self.assertEqual(scheduler.get_number_of_threads(job), 4)
+
+        scheduler = rs.RegistrationScheduler(
+            n_cores=4, max_threads=2, voxels_per_thread=1e12)
+        self.assertEqual(scheduler.get_number_of_threads(job), 1)
+
+        job = {"method": "RegF3D", "fixed": self.fixed_3D, "n_threads": 8}
+        self.assertEqual(scheduler.get_number_of_threads(job), 2)
+
+        job = {"method": "FLIRT", "fixed": self.fixed_3D}
+        self.assertEqual(scheduler.get_number_of_threads(job), 1)
+
+        self.assertRaises(
+            ValueError, lambda: rs.RegistrationScheduler(n_cores=0))
+
+    def test_run(self):
+        options = {"registration_type": "Rigid", "metric": "MeanSquares"}
+        jobs = [{
+            "method": "SimpleItkRegistration",
+            "fixed": self.fixed_2D,
+            "moving": self.moving_2D,
+            "options": options,
+            "n_threads": n_threads,
+            "output_transform": os.path.join(
+                self.dir_output, "transform_%d.txt" % i),
+        } for i, n_threads in enumerate([1, 2, 1])]
+        jobs.append({
+            "method": "RegAladin",
+            "fixed": self.fixed_2D,
+            "moving": os.path.join(DIR_TMP, "non_existing.nii.gz"),
+        })
+
+        scheduler = rs.RegistrationScheduler(n_cores=2)
+        reports = scheduler.run(jobs)
+
+        self.assertEqual(len(reports), len(jobs))
+        for i, report in enumerate(reports[0:3]):
+            self.assertIsNone(report["error"])
+            self.assertEqual(report["n_threads"], jobs[i]["n_threads"])
+            self.assertGreaterEqual(report["wall_time"], 0)
+            self.assertGreaterEqual(report["cpu_time"], 0)
+            self.assertGreaterEqual(report["cpu_utilisation"], 0)
+            self.assertTrue(os.path.isfile(jobs[i]["output_transform"]))
+
+        # Failed jobs are reported without stopping the others
+        self.assertIsNotNone(reports[3]["error"])
+        self.assertIsNone(reports[3]["computational_time"])
@@ -15,6 +15,7 @@ import pysitk.simple_itk_helper as sitkh
 
 import simplereg.utilities as utils
 import simplereg.resampler as res
+import simplereg.numpy_resampler as npr
 from simplereg.definitions import DIR_TMP, DIR_DATA, DIR_TEST
 
 
@@ -22,6 +23,12 @@ class ResamplerTest(unittest.TestCase):
 
     def setUp(self):
         self.precision = 7
+        self.dir_output = os.path.join(DIR_TMP, "resampler")
+
+        self.image_3D = os.path.join(
+            DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz")
+        self.transform_3D = os.path.join(
+            DIR_TEST, "3D_sitk_Target_Source.txt")
 
     def test_get_resampling_space_properties(self):
         for dim in [2, 3]:
@@ -96,3 +103,586 @@ class ResamplerTest(unittest.TestCase):
             nda_diff = sitk.GetArrayFromImage(
                 image_sitk - resampled_image_sitk)
             self.assertEqual(np.sum(np.abs(nda_diff)), 0)
+
+    def test_resample_time_series(self):
+        path_to_moving = os.path.join(self.dir_output, "time_series.nii.gz")
+        path_to_output = os.path.join(self.dir_output, "resampled.nii.gz")
+
+        image_sitk = sitk.ReadImage(self.image_3D)
+        volumes_sitk = [image_sitk * float(t + 1) for t in range(5)]
+        sitkh.write_nifti_image_sitk(
+            sitk.JoinSeries(volumes_sitk, 0., 2.5), path_to_moving)
+
+        transform_sitk = sitkh.read_transform_sitk(self.transform_3D)
+        size, origin, spacing, direction = \
+            res.Resampler.get_space_resampling_properties(
+                image_sitk, spacing=(1, 1.5, 3), add_to_grid=-4)
+
+        for interpolator in ["NearestNeighbor", "Linear", "BSpline"]:
+            resampler = res.Resampler(
+                path_to_fixed=path_to_moving,
+                path_to_moving=path_to_moving,
+                path_to_transform=self.transform_3D,
+                interpolator=interpolator,
+                spacing=(1, 1.5, 3),
+                padding=-10,
+                add_to_grid=-4,
+                volumes_per_chunk=2,
+            )
+            resampler.run()
+            resampler.write_image(path_to_output)
+            resampled_sitk = sitk.ReadImage(path_to_output)
+
+            self.assertEqual(resampled_sitk.GetDimension(), 4)
+            self.assertEqual(resampled_sitk.GetSize()[3], len(volumes_sitk))
+            self.assertAlmostEqual(resampled_sitk.GetSpacing()[3], 2.5)
+
+            for t, volume_sitk in enumerate(volumes_sitk):
+                reference_sitk = sitk.Resample(
+                    volume_sitk,
+                    size,
+                    transform_sitk,
+                    getattr(sitk, "sitk%s" % interpolator),
+                    origin,
+                    spacing,
+                    direction,
+                    -10.,
+                    image_sitk.GetPixelIDValue(),
+                )
+                nda_diff = sitk.GetArrayFromImage(
+                    resampled_sitk[:, :, :, t] - reference_sitk)
+                self.assertAlmostEqual(
+                    np.linalg.norm(nda_diff), 0, places=self.precision)
+
+    def test_resample_time_series_on_vector_fixed(self):
+        image_sitk = sitk.ReadImage(self.image_3D, sitk.sitkFloat32)
+        volumes_sitk = [image_sitk * float(t + 1) for t in range(3)]
+        time_series_sitk = sitk.JoinSeries(volumes_sitk, 0., 2.5)
+
+        # Grid given by a vector image, e.g. a displacement field
+        fixed_sitk = sitk.Compose(image_sitk, image_sitk, image_sitk)
+        size, origin, spacing, direction = \
+            res.Resampler.get_space_resampling_properties(fixed_sitk)
+
+        for pixel_id in [image_sitk.GetPixelIDValue(),
+                         fixed_sitk.GetPixelIDValue()]:
+            resampled_sitk = res.Resampler.get_resampled_time_series_sitk(
+                time_series_sitk, size, sitk.Euler3DTransform(),
+                sitk.sitkLinear, origin, spacing, direction, 0.,
+                pixel_id, volumes_per_chunk=2)
+            self.assertEqual(resampled_sitk.GetPixelIDValue(),
+                             image_sitk.GetPixelIDValue())
+            self.assertEqual(resampled_sitk.GetSize(),
+                             time_series_sitk.GetSize())
+            nda_diff = sitk.GetArrayFromImage(resampled_sitk) - \
+                sitk.GetArrayFromImage(time_series_sitk)
+            self.assertAlmostEqual(
+                np.linalg.norm(nda_diff), 0, places=self.precision)
+
+        # Fallback for SimpleITK without in-place slice assignment
+        chunk_sitk = sitk.Compose(volumes_sitk[1:])
+        nda = np.zeros(time_series_sitk.GetSize()[::-1], dtype=np.float32)
+        nda = res.Resampler._paste_time_series_chunk_sitk(nda, chunk_sitk, 1)
+        self.assertAlmostEqual(np.linalg.norm(
+            nda[1:] - sitk.GetArrayFromImage(time_series_sitk)[1:]),
+            0, places=self.precision)
+        self.assertEqual(np.abs(nda[0]).max(), 0)
+
+    def test_resample_vector_image(self):
+        path_to_moving = os.path.join(self.dir_output, "vector.nii.gz")
+        path_to_output = os.path.join(self.dir_output, "resampled.nii.gz")
+
+        image_sitk = sitk.ReadImage(self.image_3D)
+        components_sitk = [image_sitk * float(i + 1) for i in range(3)]
+        sitkh.write_nifti_image_sitk(
+            sitk.Compose(components_sitk), path_to_moving)
+
+        resampler = res.Resampler(
+            path_to_fixed=self.image_3D,
+            path_to_moving=path_to_moving,
+            path_to_transform=self.transform_3D,
+            spacing=2,
+        )
+        resampler.run()
+        resampler.write_image(path_to_output)
+        resampled_sitk = sitk.ReadImage(path_to_output)
+        self.assertEqual(resampled_sitk.GetNumberOfComponentsPerPixel(), 3)
+
+        transform_sitk = sitkh.read_transform_sitk(self.transform_3D)
+        for i, component_sitk in enumerate(components_sitk):
+            reference_sitk = sitk.Resample(
+                component_sitk,
+                res.Resampler.get_resampled_image_sitk(
+                    image_sitk, spacing=2),
+                transform_sitk,
+                sitk.sitkLinear,
+            )
+            nda_diff = sitk.GetArrayFromImage(
+                sitk.VectorIndexSelectionCast(resampled_sitk, i) -
+                reference_sitk)
+            self.assertAlmostEqual(
+                np.linalg.norm(nda_diff), 0, places=self.precision)
+
+    def _assert_equal_trivial_resampling(
+            self, image_sitk, size, transform_sitk, origin, spacing,
+            direction, padding=-7):
+        for interpolator in [sitk.sitkNearestNeighbor, sitk.sitkLinear]:
+            args = (
+                image_sitk,
+                [int(i) for i in size],
+                transform_sitk,
+                interpolator,
+                origin,
+                spacing,
+                direction,
+                float(padding),
+                image_sitk.GetPixelIDValue(),
+            )
+            resampled_sitk = \
+                res.Resampler.get_trivially_resampled_image_sitk(*args)
+            self.assertIsNotNone(resampled_sitk)
+            reference_sitk = sitk.Resample(*args)
+
+            self.assertEqual(resampled_sitk.GetSize(),
+                             reference_sitk.GetSize())
+            self.assertEqual(resampled_sitk.GetPixelIDValue(),
+                             reference_sitk.GetPixelIDValue())
+            nda_diff = sitk.GetArrayFromImage(
+                resampled_sitk - reference_sitk)
+            self.assertAlmostEqual(
+                np.linalg.norm(nda_diff), 0, places=self.precision)
+
+    def test_trivial_resampling_identical_grid(self):
+        image_sitk = sitk.ReadImage(self.image_3D)
+        self._assert_equal_trivial_resampling(
+            image_sitk,
+            image_sitk.GetSize(),
+            sitk.Euler3DTransform(),
+            image_sitk.GetOrigin(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetDirection(),
+        )
+
+    def test_trivial_resampling_permutation_flip(self):
+        image_sitk = sitk.ReadImage(self.image_3D)[:, 5:50, 10:40]
+        size = np.array(image_sitk.GetSize())
+        spacing = np.array(image_sitk.GetSpacing())
+        direction = np.array(image_sitk.GetDirection()).reshape(3, 3)
+
+        # Signed permutation of axes: x -> -z, y -> x, z -> -y
+        P = np.array([[0, 0, -1], [1, 0, 0], [0, -1, 0]])
+        permutation = np.argmax(np.abs(P), axis=0)
+        index_origin = [(size[i] - 1) * (P[i].sum() < 0) for i in range(3)]
+        self._assert_equal_trivial_resampling(
+            image_sitk,
+            size[permutation],
+            sitk.Euler3DTransform(),
+            image_sitk.TransformIndexToPhysicalPoint(
+                [int(i) for i in index_origin]),
+            spacing[permutation],
+            direction.dot(P).flatten(),
+        )
+
+        # Rotation by 90 degrees about a voxel center
+        rotation_sitk = sitk.Euler3DTransform()
+        rotation_sitk.SetCenter(
+            image_sitk.TransformIndexToPhysicalPoint((10, 20, 5)))
+        rotation_sitk.SetRotation(0, 0, np.pi / 2.)
+        self._assert_equal_trivial_resampling(
+            image_sitk,
+            size,
+            rotation_sitk,
+            image_sitk.GetOrigin(),
+            spacing,
+            direction.flatten(),
+        )
+
+    def test_trivial_resampling_downsampling(self):
+        image_sitk = sitk.ReadImage(self.image_3D)
+        for spacing in [2, (1, 2, 3)]:
+            size, origin, spacing, direction = \
+                res.Resampler.get_space_resampling_properties(
+                    image_sitk, spacing=spacing)
+            self._assert_equal_trivial_resampling(
+                image_sitk, size, sitk.Euler3DTransform(),
+                origin, spacing, direction)
+
+    def test_trivial_resampling_shift(self):
+        image_sitk = sitk.ReadImage(self.image_3D)
+
+        # Crop and pad grid
+        for add_to_grid in [-3, 5, (2, -4, 0)]:
+            size, origin, spacing, direction = \
+                res.Resampler.get_space_resampling_properties(
+                    image_sitk, add_to_grid=add_to_grid)
+            self._assert_equal_trivial_resampling(
+                image_sitk, size, sitk.Euler3DTransform(),
+                origin, spacing, direction)
+
+        # Integer voxel translation
+        translation_sitk = sitk.Euler3DTransform()
+        translation_sitk.SetTranslation((2, -3, 1))
+        self._assert_equal_trivial_resampling(
+            image_sitk,
+            image_sitk.GetSize(),
+            translation_sitk,
+            image_sitk.GetOrigin(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetDirection(),
+        )
+
+    def test_trivial_resampling_not_applicable(self):
+        image_sitk = sitk.ReadImage(self.image_3D)
+        translation_sitk = sitk.Euler3DTransform()
+        translation_sitk.SetTranslation((0.3, 0, 0))
+        resampled_sitk = res.Resampler.get_trivially_resampled_image_sitk(
+            image_sitk,
+            image_sitk.GetSize(),
+            translation_sitk,
+            sitk.sitkLinear,
+            image_sitk.GetOrigin(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetDirection(),
+            0.,
+            image_sitk.GetPixelIDValue(),
+        )
+        self.assertIsNone(resampled_sitk)
+
+    def _assert_equal_backends(self, path_to_moving, path_to_transform,
+                               interpolators, **kwargs):
+        for interpolator in interpolators:
+            nda = {}
+            for backend in ["sitk", "numpy"]:
+                path_to_output = os.path.join(
+                    self.dir_output, "resampled_%s.nii.gz" % backend)
+                resampler = res.Resampler(
+                    path_to_fixed=self.image_3D,
+                    path_to_moving=path_to_moving,
+                    path_to_transform=path_to_transform,
+                    interpolator=interpolator,
+                    backend=backend,
+                    **kwargs
+                )
+                resampler.run()
+                resampler.write_image(path_to_output)
+                resampled_sitk = sitk.ReadImage(path_to_output)
+                nda[backend] = sitk.GetArrayFromImage(resampled_sitk)
+
+                if backend == "sitk":
+                    reference_sitk = resampled_sitk
+                    continue
+
+                self.assertEqual(resampled_sitk.GetSize(),
+                                 reference_sitk.GetSize())
+                self.assertEqual(resampled_sitk.GetPixelIDValue(),
+                                 reference_sitk.GetPixelIDValue())
+                for attr in ["GetOrigin", "GetSpacing", "GetDirection"]:
+                    self.assertAlmostEqual(
+                        np.linalg.norm(
+                            np.array(getattr(resampled_sitk, attr)()) -
+                            getattr(reference_sitk, attr)()),
+                        0, places=self.precision)
+
+            self.assertAlmostEqual(
+                np.linalg.norm(nda["numpy"] - nda["sitk"]), 0,
+                places=self.precision)
+
+    def test_numpy_backend(self):
+        self._assert_equal_backends(
+            self.image_3D,
+            self.transform_3D,
+            ["NearestNeighbor", "Linear", "BSpline"],
+            spacing=(1, 1.5, 3),
+            padding=-10,
+            add_to_grid=-4,
+        )
+
+    def test_numpy_backend_displacement_field(self):
+        path_to_displacement = os.path.join(
+            self.dir_output, "displacement.nii.gz")
+
+        image_sitk = sitk.ReadImage(self.image_3D)
+        displacement_sitk = sitk.TransformToDisplacementField(
+            sitkh.read_transform_sitk(self.transform_3D),
+            sitk.sitkVectorFloat64,
+            image_sitk.GetSize(),
+            image_sitk.GetOrigin(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetDirection(),
+        )
+        sitkh.write_nifti_image_sitk(displacement_sitk, path_to_displacement)
+
+        self._assert_equal_backends(
+            self.image_3D,
+            path_to_displacement,
+            ["NearestNeighbor", "Linear"],
+            spacing=2,
+            add_to_grid=3,
+        )
+
+    def test_numpy_backend_time_series(self):
+        path_to_moving = os.path.join(self.dir_output, "time_series.nii.gz")
+
+        image_sitk = sitk.ReadImage(self.image_3D)
+        volumes_sitk = [image_sitk * float(t + 1) for t in range(3)]
+        sitkh.write_nifti_image_sitk(
+            sitk.JoinSeries(volumes_sitk, 0., 2.5), path_to_moving)
+
+        self._assert_equal_backends(
+            path_to_moving,
+            self.transform_3D,
+            ["Linear"],
+            spacing=(1, 1.5, 3),
+            padding=-10,
+        )
+
+    def test_resample_precision(self):
+        # Float32 pipeline agrees with float64 up to a relative error of
+        # about 1e-7 (observed: 3e-8 for Linear, 1.1e-7 for BSpline)
+        tolerance = {"NearestNeighbor": 0, "Linear": 1e-6, "BSpline": 1e-6}
+
+        for backend in ["sitk", "numpy"]:
+            for interpolator in ["NearestNeighbor", "Linear", "BSpline"]:
+                nda = {}
+                for precision in ["float64", "float32"]:
+                    path_to_output = os.path.join(
+                        self.dir_output, "resampled_%s.nii.gz" % precision)
+                    resampler = res.Resampler(
+                        path_to_fixed=self.image_3D,
+                        path_to_moving=self.image_3D,
+                        path_to_transform=self.transform_3D,
+                        interpolator=interpolator,
+                        spacing=(1, 1.5, 3),
+                        backend=backend,
+                        precision=precision,
+                    )
+                    resampler.run()
+                    resampler.write_image(path_to_output)
+                    resampled_sitk = sitk.ReadImage(path_to_output)
+                    self.assertEqual(
+                        resampled_sitk.GetPixelIDValue(),
+                        getattr(sitk, "sitkFloat%s" % precision[-2:]))
+                    nda[precision] = sitk.GetArrayFromImage(resampled_sitk)
+
+                self.assertLessEqual(
+                    np.max(np.abs(nda["float32"] - nda["float64"])),
+                    tolerance[interpolator] * np.max(np.abs(nda["float64"])))
+
+    def test_resample_oriented_gaussian(self):
+        path_to_fixed = os.path.join(self.dir_output, "rotated.nii.gz")
+        path_to_output = os.path.join(self.dir_output, "resampled.nii.gz")
+        reference = os.path.join(
+            DIR_TEST, "3D_SheppLoganPhantom_64_OrientedGaussian_s113_atg4.nii.gz")
+
+        rotation = sitk.Euler3DTransform()
+        rotation.SetRotation(0.3, -0.2, -0.3)
+        rotation.SetCenter((-40, -25, 17))
+        sitkh.write_nifti_image_sitk(
+            utils.update_image_header(
+                sitk.ReadImage(self.image_3D), rotation),
+            path_to_fixed)
+
+        # Reference was computed based on the q-form of the fixed image
+        fixed_nib = nib.load(path_to_fixed)
+        fixed_nib.set_sform(fixed_nib.get_qform())
+        nib.save(fixed_nib, path_to_fixed)
+
+        resampler = res.Resampler(
+            path_to_fixed=path_to_fixed,
+            path_to_moving=self.image_3D,
+            path_to_transform=None,
+            interpolator="OrientedGaussian",
+            spacing=(1, 1, 3),
+            padding=-1000,
+            add_to_grid=4,
+        )
+        resampler.run()
+        resampler.write_image(path_to_output)
+
+        nda_diff = sitk.GetArrayFromImage(
+            sitk.ReadImage(path_to_output) - sitk.ReadImage(reference))
+        self.assertAlmostEqual(
+            np.linalg.norm(nda_diff), 0, places=self.precision)
+
+    def test_resample_oriented_gaussian_separable(self):
+        image_nib = nib.load(self.image_3D)
+        nda = np.asanyarray(image_nib.dataobj)
+        grid = npr.get_grid_from_nib(image_nib)
+        size, origin, spacing, direction = \
+            npr.get_space_resampling_properties(
+                *grid, spacing=(1.3, 2, 3), add_to_grid=2)
+        cov = npr.get_oriented_psf_covariance(direction, grid[3], spacing)
+
+        resampled_nda = npr.resample_nda(
+            nda, grid, size, origin, spacing, direction,
+            cov=cov, padding=-10)
+
+        # Compare with evaluation of kernel at each individual point
+        M_in = np.array(grid[3]).reshape(3, 3).dot(np.diag(grid[2]))
+        M_out = np.array(direction).reshape(3, 3).dot(np.diag(spacing))
+        indices = np.array([
+            i.flatten(order="F")
+            for i in np.meshgrid(*[np.arange(n) for n in size], indexing="ij")
+        ])
+        cindices = np.linalg.inv(M_in).dot(
+            M_out.dot(indices) + (origin - grid[1])[:, np.newaxis])
+        reference_nda = npr.sample_oriented_gaussian_nda(
+            nda, cindices, grid[2], cov, 3, -10).reshape(size, order="F")
+
+        self.assertEqual(resampled_nda.shape, tuple(size))
+        self.assertAlmostEqual(
+            np.linalg.norm(resampled_nda - reference_nda), 0,
+            places=self.precision)
+
+    def test_resample_label_linear(self):
+        path_to_labels = os.path.join(self.dir_output, "labels.nii.gz")
+        path_to_output = os.path.join(self.dir_output, "resampled.nii.gz")
+
+        image_sitk = sitk.ReadImage(self.image_3D)
+        labels_nda = np.unique(
+            sitk.GetArrayFromImage(image_sitk), return_inverse=True)[1]
+        labels_sitk = sitk.GetImageFromArray(
+            labels_nda.reshape(image_sitk.GetSize()[::-1]).astype(np.uint8))
+        labels_sitk.CopyInformation(image_sitk)
+        sitkh.write_nifti_image_sitk(labels_sitk, path_to_labels)
+
+        resampler = res.Resampler(
+            path_to_fixed=self.image_3D,
+            path_to_moving=path_to_labels,
+            path_to_transform=self.transform_3D,
+            interpolator="LabelLinear",
+            spacing=1.5,
+        )
+        resampler.run()
+        resampler.write_image(path_to_output)
+        resampled_sitk = sitk.ReadImage(path_to_output)
+        self.assertEqual(resampled_sitk.GetPixelIDValue(), sitk.sitkUInt8)
+
+        # Reference: Argmax of linearly interpolated labels
+        reference_sitk = res.Resampler.get_resampled_image_sitk(
+            image_sitk, spacing=1.5)
+        transform_sitk = sitkh.read_transform_sitk(self.transform_3D)
+        labels, counts = np.unique(labels_nda, return_counts=True)
+        labels = [labels[np.argmax(counts)]] + \
+            [l for l in labels if l != labels[np.argmax(counts)]]
+        for i, label in enumerate(labels):
+            mask_sitk = sitk.Cast(labels_sitk == int(label), sitk.sitkFloat64)
+            values = sitk.GetArrayFromImage(sitk.Resample(
+                mask_sitk, reference_sitk, transform_sitk, sitk.sitkLinear))
+            if i == 0:
+                max_values = values
+                reference_nda = np.full(values.shape, label, dtype=np.uint8)
+            else:
+                update = values > max_values
+                max_values[update] = values[update]
+                reference_nda[update] = label
+
+        self.assertEqual(np.sum(
+            sitk.GetArrayFromImage(resampled_sitk) != reference_nda), 0)
+
+    def test_resample_roi(self):
+        path_to_mask = os.path.join(self.dir_output, "mask.nii.gz")
+        path_to_output = os.path.join(self.dir_output, "resampled.nii.gz")
+
+        image_sitk = sitk.ReadImage(self.image_3D)
+        mask_sitk = sitk.Cast(image_sitk > 100, sitk.sitkUInt8)
+        mask_sitk = mask_sitk[10:40, 20:50, 5:30]
+        sitkh.write_nifti_image_sitk(mask_sitk, path_to_mask)
+
+        for backend in ["sitk", "numpy"]:
+            kwargs = {
+                "path_to_fixed": self.image_3D,
+                "path_to_moving": self.image_3D,
+                "path_to_transform": self.transform_3D,
+                "spacing": 1.5,
+                "padding": -10,
+                "backend": backend,
+            }
+            resampler = res.Resampler(**kwargs)
+            resampler.run()
+            resampler.write_image(path_to_output)
+            reference_sitk = sitk.ReadImage(path_to_output)
+            mask_reference_sitk = res.Resampler.get_resampled_mask_sitk(
+                mask_sitk,
+                reference_sitk.GetSize(),
+                reference_sitk.GetOrigin(),
+                reference_sitk.GetSpacing(),
+                reference_sitk.GetDirection(),
+            )
+            reference_sitk = res.Resampler.get_roi_masked_image_sitk(
+                reference_sitk, mask_reference_sitk, -10)
+
+            # bounding box of mask in resampled grid
+            indices = np.nonzero(
+                sitk.GetArrayFromImage(mask_reference_sitk).transpose())
+            roi = tuple(slice(int(np.min(i)), int(np.max(i)) + 1)
+                        for i in indices)
+
+            for crop in [0, 1]:
+                resampler = res.Resampler(
+                    path_to_mask=path_to_mask, crop=crop, **kwargs)
+                resampler.run()
+                resampler.write_image(path_to_output)
+                resampled_sitk = sitk.ReadImage(path_to_output)
+
+                if crop:
+                    expected_sitk = reference_sitk[roi]
+                else:
+                    expected_sitk = reference_sitk
+                self.assertEqual(resampled_sitk.GetSize(),
+                                 expected_sitk.GetSize())
+                self.assertAlmostEqual(
+                    np.linalg.norm(np.array(resampled_sitk.GetOrigin()) -
+                                   expected_sitk.GetOrigin()),
+                    0, places=4)
+                nda_diff = sitk.GetArrayFromImage(
+                    resampled_sitk - expected_sitk)
+                self.assertAlmostEqual(
+                    np.linalg.norm(nda_diff), 0, places=self.precision)
+
+    def test_resample_pyramid(self):
+        path_to_output = os.path.join(self.dir_output, "pyramid.nii.gz")
+        image_sitk = sitk.ReadImage(self.image_3D)
+
+        for backend in ["sitk", "numpy"]:
+            resampler = res.Resampler(
+                path_to_fixed=self.image_3D,
+                path_to_moving=self.image_3D,
+                path_to_transform=self.transform_3D,
+                spacing=(1, 1, 2),
+                pyramid_factors=[1, 2, 3],
+                backend=backend,
+            )
+            resampler.run()
+            resampler.write_image(path_to_output)
+
+            for factor in [1, 2, 3]:
+                spacing = factor * np.array([1, 1, 2])
+                path_to_level = npr.get_pyramid_filename(
+                    path_to_output, spacing)
+                self.assertEqual(os.path.basename(path_to_level),
+                                 "pyramid_s%gx%gx%g.nii.gz" % tuple(spacing))
+                level_sitk = sitk.ReadImage(path_to_level)
+
+                # Grid matches the one of a direct resampling at that spacing
+                reference_sitk = res.Resampler.get_resampled_image_sitk(
+                    image_sitk, spacing=spacing)
+                self.assertEqual(level_sitk.GetSize(),
+                                 reference_sitk.GetSize())
+                self.assertAlmostEqual(
+                    np.linalg.norm(np.array(level_sitk.GetSpacing()) -
+                                   spacing), 0, places=self.precision)
+                self.assertAlmostEqual(
+                    np.linalg.norm(np.array(level_sitk.GetOrigin()) -
+                                   reference_sitk.GetOrigin()),
+                    0, places=4)
+
+        # Decimation of constant image is exact; factor 1 keeps the image
+        levels_sitk = res.Resampler.get_resampled_pyramid_sitk(
+            image_sitk * 0 + 7, factors=[1, 4])
+        nda = sitk.GetArrayFromImage(image_sitk * 0 + 7)
+        self.assertEqual(levels_sitk[1].GetSize(), (16, 16, 16))
+        for level_sitk, factor in zip(levels_sitk, [1, 4]):
+            self.assertAlmostEqual(np.linalg.norm(
+                sitk.GetArrayFromImage(level_sitk) -
+                nda[::factor, ::factor, ::factor]), 0, places=self.precision)
@@ -0,0 +1,112 @@
+##
+# \file scratch_store_test.py
+#  \brief  Class containing unit tests for the content-addressed scratch store
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import gc
+import shutil
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import simplereg.niftyreg
+from simplereg.scratch_store import ScratchStore
+from simplereg.wrapper_registration import WrapperRegistration
+from simplereg.definitions import DIR_DATA, DIR_TMP
+
+
+class ScratchStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_store = os.path.join(DIR_TMP, "scratch_store")
+        if os.path.isdir(self.dir_store):
+            shutil.rmtree(self.dir_store)
+
+        self.fixed_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz"))
+        self.moving_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Source.nii.gz"))
+
+    def tearDown(self):
+        WrapperRegistration.disable_scratch_store()
+
+    def test_get_key(self):
+        key = ScratchStore.get_key(self.fixed_sitk)
+        self.assertEqual(key, ScratchStore.get_key(
+            sitk.Image(self.fixed_sitk)))
+
+        # Header and pixel buffer are hashed
+        image_sitk = sitk.Image(self.fixed_sitk)
+        image_sitk.SetSpacing([2 * s for s in image_sitk.GetSpacing()])
+        self.assertNotEqual(key, ScratchStore.get_key(image_sitk))
+        self.assertNotEqual(key, ScratchStore.get_key(self.fixed_sitk + 1))
+
+    def test_acquire_release(self):
+        store = ScratchStore(self.dir_store, max_bytes=0)
+
+        path_to_fixed = store.acquire(self.fixed_sitk)
+        self.assertEqual(store.acquire(sitk.Image(self.fixed_sitk)),
+                         path_to_fixed)
+        path_to_moving = store.acquire(self.moving_sitk)
+        self.assertNotEqual(path_to_fixed, path_to_moving)
+
+        nda_diff = sitk.GetArrayFromImage(sitk.ReadImage(path_to_fixed)) - \
+            sitk.GetArrayFromImage(self.fixed_sitk)
+        self.assertEqual(np.linalg.norm(nda_diff), 0)
+
+        statistics = store.get_statistics()
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 2)
+        self.assertEqual(statistics["references"], 3)
+
+        # Referenced files are kept despite the byte budget
+        self.assertTrue(os.path.isfile(path_to_fixed))
+        store.release(path_to_moving)
+        self.assertFalse(os.path.isfile(path_to_moving))
+        store.release(path_to_fixed)
+        self.assertTrue(os.path.isfile(path_to_fixed))
+        store.release(path_to_fixed)
+        self.assertFalse(os.path.isfile(path_to_fixed))
+        self.assertEqual(store.get_statistics()["evictions"], 2)
+
+    def test_shared_store(self):
+        store_1 = ScratchStore(self.dir_store)
+        store_2 = ScratchStore(self.dir_store)
+
+        # Written once and referenced by both
+        path_to_fixed = store_1.acquire(self.fixed_sitk)
+        self.assertEqual(store_2.acquire(self.fixed_sitk), path_to_fixed)
+        self.assertEqual(store_2.get_statistics()["hits"], 1)
+
+        store_1.release(path_to_fixed)
+        store_1.evict(max_bytes=0)
+        self.assertTrue(os.path.isfile(path_to_fixed))
+
+        store_2.release(path_to_fixed)
+        store_1.evict(max_bytes=0)
+        self.assertFalse(os.path.isfile(path_to_fixed))
+
+    def test_wrapper_registration(self):
+        WrapperRegistration.enable_scratch_store(self.dir_store)
+        store = WrapperRegistration.get_scratch_store()
+
+        reg_aladin_1 = simplereg.niftyreg.RegAladin(
+            self.fixed_sitk, self.moving_sitk)
+        reg_aladin_2 = simplereg.niftyreg.RegAladin(
+            self.fixed_sitk, self.moving_sitk)
+
+        paths = [r._get_path_to_image(r.get_fixed_sitk(), "fixed.nii")
+                 for r in [reg_aladin_1, reg_aladin_2]]
+        self.assertEqual(paths[0], paths[1])
+        self.assertEqual(os.path.dirname(paths[0]), self.dir_store)
+        self.assertEqual(store.get_statistics()["references"], 2)
+
+        # References are released on clean-up and garbage collection
+        reg_aladin_1.cleanup()
+        self.assertEqual(store.get_statistics()["references"], 1)
+        del reg_aladin_2
+        gc.collect()
+        self.assertEqual(store.get_statistics()["references"], 0)
@@ -0,0 +1,121 @@
+##
+# \file transform_io_test.py
+#  \brief  Class containing unit tests for reading and writing transforms
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import pysitk.python_helper as ph
+
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+from simplereg.definitions import DIR_TMP, DIR_DATA, DIR_TEST
+
+
+class TransformIOTest(unittest.TestCase):
+
+    def setUp(self):
+        self.precision = 7
+        self.dir_output = os.path.join(DIR_TMP, "transform_io")
+
+        self.image_3D = os.path.join(
+            DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz")
+        self.transform_3D = os.path.join(
+            DIR_TEST, "3D_sitk_Target_Source.txt")
+        self.landmarks_3D = os.path.join(
+            DIR_TEST, "3D_Brain_Template_landmarks.txt")
+
+        self.output_transform = os.path.join(
+            self.dir_output, "transform.h5")
+
+    def _get_points_nda(self):
+        return dr.DataReader.read_landmarks(self.landmarks_3D)
+
+    def _assert_equal_transforms(self, transform_1, transform_2):
+        points_nda = self._get_points_nda()
+        nda_1 = np.array([transform_1.TransformPoint(p) for p in points_nda])
+        nda_2 = np.array([transform_2.TransformPoint(p) for p in points_nda])
+        self.assertAlmostEqual(
+            np.linalg.norm(nda_1 - nda_2), 0, places=self.precision)
+
+    def test_read_write_affine_transform(self):
+        transform_sitk = dr.DataReader.read_transform(self.transform_3D)
+        dw.DataWriter.write_transform(transform_sitk, self.output_transform)
+
+        res_sitk = dr.DataReader.read_transform(self.output_transform)
+        self.assertIsInstance(res_sitk, sitk.AffineTransform)
+        self.assertEqual(
+            res_sitk.GetParameters(), transform_sitk.GetParameters())
+
+        res_inv_sitk = dr.DataReader.read_transform(
+            self.output_transform, inverse=1)
+        self._assert_equal_transforms(
+            res_inv_sitk,
+            dr.DataReader.read_transform(self.transform_3D, inverse=1))
+
+    def test_read_write_composite_transform(self):
+        transform_sitk = sitk.CompositeTransform([
+            dr.DataReader.read_transform(self.transform_3D),
+            sitk.TranslationTransform(3, (1.5, -2, 3)),
+        ])
+        dw.DataWriter.write_transform(transform_sitk, self.output_transform)
+
+        res_sitk = dr.DataReader.read_transform(self.output_transform)
+        self.assertIsInstance(res_sitk, sitk.CompositeTransform)
+        self.assertEqual(res_sitk.GetNumberOfTransforms(), 2)
+        self._assert_equal_transforms(res_sitk, transform_sitk)
+
+    def test_read_write_displacement_field(self):
+        image_sitk = sitk.ReadImage(self.image_3D)
+        transform_sitk = dr.DataReader.read_transform(self.transform_3D)
+        displacement_sitk = sitk.TransformToDisplacementField(
+            transform_sitk,
+            sitk.sitkVectorFloat32,
+            image_sitk.GetSize(),
+            image_sitk.GetOrigin(),
+            image_sitk.GetSpacing(),
+            image_sitk.GetDirection(),
+        )
+        dw.DataWriter.write_transform(
+            displacement_sitk, self.output_transform)
+
+        res_sitk = dr.DataReader.read_transform(self.output_transform)
+        self.assertIsInstance(res_sitk, sitk.DisplacementFieldTransform)
+        nda_diff = sitk.GetArrayFromImage(res_sitk.GetDisplacementField()) - \
+            sitk.GetArrayFromImage(displacement_sitk)
+        self.assertEqual(np.linalg.norm(nda_diff), 0)
+
+        # Displacement field as nibabel object (sitk_to_nreg conversion)
+        res_nib = dr.DataReader.read_transform(
+            self.output_transform, nii_as_nib=1)
+        nda_nib = np.asanyarray(res_nib.dataobj)[:, :, :, 0, :]
+        self.assertEqual(np.linalg.norm(
+            nda_nib.swapaxes(0, 2) -
+            sitk.GetArrayFromImage(displacement_sitk)), 0)
+
+    def test_compose_transforms_hdf5(self):
+        transform_2 = os.path.join(self.dir_output, "transform_2.txt")
+        transform_sitk = dr.DataReader.read_transform(self.transform_3D)
+        transform_2_sitk = sitk.Euler3DTransform()
+        transform_2_sitk.SetRotation(0.1, -0.2, 0.3)
+        transform_2_sitk.SetTranslation((1, 2, 3))
+        dw.DataWriter.write_transform(transform_2_sitk, transform_2)
+
+        cmd_args = ["python simplereg_transform.py"]
+        cmd_args.append("-c %s %s %s" % (
+            transform_2, self.transform_3D, self.output_transform))
+        self.assertEqual(ph.execute_command(" ".join(cmd_args)), 0)
+
+        res_sitk = dr.DataReader.read_transform(self.output_transform)
+        self.assertIsInstance(res_sitk, sitk.CompositeTransform)
+        ref_sitk = sitk.CompositeTransform([transform_2_sitk, transform_sitk])
+        self._assert_equal_transforms(res_sitk, ref_sitk)
+
+    def test_write_transform_hdf5_invalid(self):
+        self.assertRaises(IOError, lambda: dw.DataWriter.write_transform(
+            np.eye(4), self.output_transform))
@@ -0,0 +1,122 @@
+##
+# \file transform_registry_test.py
+#  \brief  Class containing unit tests for the transform registry
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import pysitk.python_helper as ph
+
+import simplereg.data_reader as dr
+import simplereg.data_writer as dw
+import simplereg.utilities as utils
+import simplereg.transform_registry as tr
+from simplereg.definitions import DIR_TMP, DIR_TEST
+
+
+class TransformRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.precision = 7
+        self.dir_output = os.path.join(DIR_TMP, "transform_registry")
+        ph.create_directory(self.dir_output, delete_files=True)
+
+        self.path_to_registry = os.path.join(self.dir_output, "registry.db")
+        self.transform_3D = os.path.join(
+            DIR_TEST, "3D_sitk_Target_Source.txt")
+
+    def _get_random_transforms_sitk(self, n):
+        random = np.random.RandomState(1)
+        transforms_sitk = []
+        for i in range(n):
+            transform_sitk = sitk.Euler3DTransform()
+            transform_sitk.SetCenter(random.rand(3) * 10)
+            transform_sitk.SetRotation(*(random.rand(3) - 0.5))
+            transform_sitk.SetTranslation(random.rand(3) * 20)
+            transforms_sitk.append(transform_sitk)
+        return transforms_sitk
+
+    def test_read_write_transform(self):
+        transform_sitk = dr.DataReader.read_transform(self.transform_3D)
+        point = (10.5, -3, 25)
+
+        with tr.TransformRegistry(self.path_to_registry) as registry:
+            registry.write_transform("subject1", "affine", transform_sitk)
+
+        with tr.TransformRegistry(self.path_to_registry) as registry:
+            self.assertEqual(registry.get_keys(), [("subject1", "affine")])
+            res_sitk = registry.read_transform("subject1", "affine")
+            self.assertRaises(
+                IOError, lambda: registry.read_transform("subject2", "affine"))
+
+        self.assertAlmostEqual(np.linalg.norm(
+            np.array(res_sitk.TransformPoint(point)) -
+            np.array(transform_sitk.TransformPoint(point))),
+            0, places=self.precision)
+
+    def test_read_write_matrices(self):
+        transforms_sitk = self._get_random_transforms_sitk(100)
+        matrices_nda = np.array([
+            utils.get_matrix_from_sitk_transform(t)
+            for t in transforms_sitk])
+        keys = [("subject%03d" % i, "rigid") for i in range(100)]
+
+        with tr.TransformRegistry(self.path_to_registry) as registry:
+            registry.write_matrices(keys, matrices_nda)
+            registry.write_matrices(
+                keys[:10], np.tile(np.eye(4), (10, 1, 1)))
+
+            self.assertEqual(len(registry.get_keys(step="rigid")), 100)
+
+            # Stacked matrices are returned in order of the given keys
+            res_nda = registry.read_matrices(keys[::-1])
+            self.assertEqual(res_nda.shape, (100, 4, 4))
+            self.assertEqual(np.linalg.norm(
+                res_nda[::-1][10:] - matrices_nda[10:]), 0)
+            self.assertEqual(np.linalg.norm(
+                res_nda[::-1][:10] - np.eye(4)), 0)
+
+            # Batched operations on stacked matrices
+            inverses_nda = np.linalg.inv(registry.read_matrices(keys))
+            point = np.array([1., 2, 3])
+            res_point = inverses_nda[50, 0:3, 0:3].dot(
+                transforms_sitk[50].TransformPoint(point)) + \
+                inverses_nda[50, 0:3, 3]
+            self.assertAlmostEqual(
+                np.linalg.norm(res_point - point), 0, places=self.precision)
+
+    def test_import_export_transforms(self):
+        transforms_sitk = self._get_random_transforms_sitk(3)
+        paths_to_transforms = []
+        for i, transform_sitk in enumerate(transforms_sitk):
+            path_to_transform = os.path.join(
+                self.dir_output, "sub-%d.txt" % i)
+            dw.DataWriter.write_transform(transform_sitk, path_to_transform)
+            paths_to_transforms.append(path_to_transform)
+
+        cmd_args = ["python simplereg_transform_registry.py"]
+        cmd_args.append("-r %s" % self.path_to_registry)
+        cmd_args.append("-imp %s" % " ".join(paths_to_transforms))
+        cmd_args.append("--step rigid")
+        self.assertEqual(ph.execute_command(" ".join(cmd_args)), 0)
+
+        dir_export = os.path.join(self.dir_output, "export")
+        cmd_args = ["python simplereg_transform_registry.py"]
+        cmd_args.append("-r %s" % self.path_to_registry)
+        cmd_args.append("-exp %s" % dir_export)
+        cmd_args.append("-s sub-1")
+        self.assertEqual(ph.execute_command(" ".join(cmd_args)), 0)
+
+        self.assertEqual(os.listdir(dir_export), ["sub-1_rigid.txt"])
+        res_sitk = dr.DataReader.read_transform(
+            os.path.join(dir_export, "sub-1_rigid.txt"))
+        point = (10.5, -3, 25)
+        self.assertAlmostEqual(np.linalg.norm(
+            np.array(res_sitk.TransformPoint(point)) -
+            np.array(transforms_sitk[1].TransformPoint(point))),
+            0, places=self.precision)
@@ -11,6 +11,7 @@ import nibabel as nib
 import SimpleITK as sitk
 import unittest
 import itertools
+import scipy.ndimage
 
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
@@ -65,8 +66,9 @@ class UtilitiesTest(unittest.TestCase):
             transform_reference_nib = nib.load(
                 path_to_sitk_reference_transform)
 
-            nda = transform_sitk_nib.get_data()
-            nda_reference = transform_reference_nib.get_data()
+            nda = np.asanyarray(transform_sitk_nib.dataobj)
+            nda_reference = np.asanyarray(
+                transform_reference_nib.dataobj)
 
             self.assertAlmostEqual(
                 np.sum(np.abs(nda - nda_reference)), 0,
@@ -103,8 +105,9 @@ class UtilitiesTest(unittest.TestCase):
             transform_reference_nib = nib.load(
                 path_to_sitk_reference_transform)
 
-            nda = transform_nreg_nib.get_data()
-            nda_reference = transform_reference_nib.get_data()
+            nda = np.asanyarray(transform_nreg_nib.dataobj)
+            nda_reference = np.asanyarray(
+                transform_reference_nib.dataobj)
 
             self.assertAlmostEqual(
                 np.sum(np.abs(nda - nda_reference)), 0,
@@ -130,9 +133,11 @@ class UtilitiesTest(unittest.TestCase):
             nda_reference = np.loadtxt(
                 path_to_reference_transform)
 
+            # Conversion is computed with full precision whereas reference
+            # transforms only provide 6 significant digits
             self.assertAlmostEqual(
                 np.sum(np.abs(nda - nda_reference)), 0,
-                places=self.precision)
+                places=4)
 
     def test_convert_flirt_to_sitk_transform(self):
         for dim in [3]:
@@ -157,11 +162,115 @@ class UtilitiesTest(unittest.TestCase):
             nda_reference = np.array(transform_ref_sitk.GetParameters())
             nda = np.array(transform_sitk.GetParameters())
 
-            # Conversion to FLIRT only provides 4 decimal places
+            # Reference transforms only provide 6 significant digits
             self.assertAlmostEqual(
                 np.sum(np.abs(nda - nda_reference)), 0,
                 places=2)
 
+    def test_convert_flirt_to_sitk_matrices(self):
+        path_to_fixed = os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz")
+        path_to_moving = os.path.join(DIR_DATA, "3D_Brain_Source.nii.gz")
+        fixed_sitk = sitk.ReadImage(path_to_fixed)
+
+        # Moving image with positive determinant, i.e. flipped FSL x-axis
+        moving_sitk = sitk.ReadImage(path_to_moving)
+        moving_sitk.SetDirection(np.eye(3).flatten())
+
+        # Scaled voxel coordinates of first voxel in flipped x-axis
+        W = flirt2sitk.get_flirt_to_physical_matrix(moving_sitk)
+        point = np.ones(4)
+        point[0:3] = moving_sitk.TransformIndexToPhysicalPoint((0, 0, 0))
+        spacing = moving_sitk.GetSpacing()
+        nda = np.linalg.solve(W, point)[0:3]
+        nda_reference = np.array(
+            [(moving_sitk.GetSize()[0] - 1) * spacing[0], 0, 0])
+        self.assertAlmostEqual(
+            np.linalg.norm(nda - nda_reference), 0, places=self.precision)
+
+        # Batch conversion for (in-memory) images and round trip
+        matrices_flirt_nda = np.tile(np.eye(4), (5, 1, 1))
+        matrices_flirt_nda[:, 0:3, 3] = np.random.RandomState(1).rand(5, 3)
+        matrices_sitk_nda = flirt2sitk.convert_flirt_to_sitk_matrices(
+            matrices_flirt_nda, fixed_sitk, moving_sitk)
+        self.assertEqual(matrices_sitk_nda.shape, (5, 4, 4))
+        nda_diff = flirt2sitk.convert_sitk_to_flirt_matrices(
+            matrices_sitk_nda, fixed_sitk, moving_sitk) - matrices_flirt_nda
+        self.assertAlmostEqual(
+            np.linalg.norm(nda_diff), 0, places=self.precision)
+
+        # Image headers are read from file if given as path
+        matrix_flirt_nda = np.loadtxt(
+            os.path.join(DIR_TEST, "3D_flirt_Target_Source.txt"))
+        transform_sitk = flirt2sitk.get_sitk_transform_from_flirt_matrix(
+            matrix_flirt_nda, path_to_fixed, path_to_moving)
+        transform_2_sitk = flirt2sitk.get_sitk_transform_from_flirt_matrix(
+            matrix_flirt_nda, fixed_sitk, sitk.ReadImage(path_to_moving))
+        nda_diff = np.array(transform_sitk.GetParameters()) - \
+            np.array(transform_2_sitk.GetParameters())
+        self.assertEqual(np.linalg.norm(nda_diff), 0)
+
+    def test_convert_regf3d_cpp_to_sitk_displacement(self):
+        L = np.diag([-1., -1., 1.])
+        A = np.array([[1.02, 0.05, 0], [-0.05, 0.98, 0.02], [0, -0.02, 1.]])
+        t = np.array([3., -2., 5.])
+
+        for dim in [2, 3]:
+            fixed_sitk = sitk.ReadImage(
+                os.path.join(DIR_DATA, "%dD_Brain_Target.nii.gz" % dim))
+
+            # Cubic B-splines reproduce affine control point positions
+            cpp_nib = self._get_regf3d_cpp(
+                fixed_sitk, lambda points: points.dot(A.transpose()) + t)
+            displacement_sitk = \
+                nreg2sitk.convert_regf3d_cpp_to_sitk_displacement(
+                    cpp_nib, fixed_sitk, n_threads=3)
+            self.assertEqual(displacement_sitk.GetSize(), fixed_sitk.GetSize())
+            self.assertEqual(
+                displacement_sitk.GetNumberOfComponentsPerPixel(), dim)
+
+            # Physical points and expected displacements in LPS
+            nda = sitk.GetArrayFromImage(displacement_sitk)
+            for index in itertools.product(*[
+                    [0, 17, s - 1] for s in fixed_sitk.GetSize()]):
+                point = np.zeros(3)
+                point[0:dim] = fixed_sitk.TransformIndexToPhysicalPoint(
+                    index)
+                displacement = L.dot(A.dot(L.dot(point)) + t) - point
+                self.assertAlmostEqual(np.linalg.norm(
+                    nda[index[::-1]] - displacement[0:dim]), 0, places=3)
+
+    ##
+    # Gets a control point grid as written by reg_f3d (control point spacing
+    # of 5 voxels) holding the positions given by a function of the (RAS)
+    # control point positions
+    #
+    @staticmethod
+    def _get_regf3d_cpp(fixed_sitk, get_positions):
+        dim = fixed_sitk.GetDimension()
+        A_fixed = np.eye(4)
+        A_fixed[0:dim, 0:dim] = np.array(
+            fixed_sitk.GetDirection()).reshape(dim, dim).dot(
+            np.diag(fixed_sitk.GetSpacing()))
+        A_fixed[0:dim, 3] = fixed_sitk.GetOrigin()
+        A_fixed = np.diag([-1., -1., 1., 1.]).dot(A_fixed)
+
+        S = np.eye(4)
+        S[range(dim), range(dim)] = 5
+        S[0:dim, 3] = -5
+        A_grid = A_fixed.dot(S)
+
+        size = [int(np.ceil(s / 5.)) + 3 for s in fixed_sitk.GetSize()]
+        size += [1] * (3 - dim)
+        index = np.stack(np.meshgrid(
+            *[np.arange(s) for s in size], indexing="ij"), axis=-1)
+        points = index.dot(A_grid[0:3, 0:3].transpose()) + A_grid[0:3, 3]
+
+        cpp_nib = nib.Nifti1Image(
+            get_positions(points)[..., 0:dim].reshape(
+                size + [1, dim]).astype(np.float32), A_grid)
+        cpp_nib.header["intent_p1"] = 5
+        return cpp_nib
+
     def test_convert_sitk_to_nib_image_3D(self):
         path_to_image = os.path.join(
             DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz")
@@ -198,6 +307,155 @@ class UtilitiesTest(unittest.TestCase):
             np.linalg.norm(diff_nda), 0,
             places=self.precision)
 
+    def test_convert_nib_to_sitk_image(self):
+        path_to_image = os.path.join(DIR_TMP, "image_mmap.nii")
+
+        image_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz"))
+        image_sitk.SetSpacing((1.3, 2.1, 3.9))
+        image_sitk = sitk.Compose(image_sitk, 2 * image_sitk)
+        sitk.WriteImage(image_sitk, path_to_image)
+
+        # Data of uncompressed images is memory-mapped
+        image_nib = dr.DataReader.read_image(path_to_image, as_nib=True)
+        self.assertIsInstance(np.asanyarray(image_nib.dataobj), np.memmap)
+
+        # Header information is stored with single precision
+        image_sitk = sitk.ReadImage(path_to_image)
+
+        image2_sitk = nib2sitk.convert_nib_to_sitk_image(image_nib)
+        self.assertEqual(image2_sitk.GetNumberOfComponentsPerPixel(), 2)
+        for attr in ["GetSize", "GetOrigin", "GetSpacing", "GetDirection"]:
+            self.assertAlmostEqual(
+                np.linalg.norm(
+                    np.array(getattr(image_sitk, attr)()) -
+                    getattr(image2_sitk, attr)()),
+                0, places=self.precision)
+        diff_nda = sitk.GetArrayFromImage(image_sitk) - \
+            sitk.GetArrayFromImage(image2_sitk)
+        self.assertEqual(np.linalg.norm(diff_nda), 0)
+
+    def test_convert_sitk_to_nib_image_zero_copy(self):
+        image_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_SheppLoganPhantom_64.nii.gz"))
+        image_sitk.SetSpacing((1.3, 2.1, 3.9))
+        displacement_sitk = sitk.Compose(
+            image_sitk, 2 * image_sitk, -image_sitk)
+        nda = sitk.GetArrayFromImage(displacement_sitk)
+
+        # Data buffer is shared and kept alive by the nibabel image
+        displacement_nib = nib2sitk.convert_sitk_to_nib_image(
+            displacement_sitk)
+        self.assertTrue(np.shares_memory(
+            np.asanyarray(displacement_nib.dataobj),
+            sitk.GetArrayViewFromImage(displacement_sitk)))
+        del displacement_sitk
+        self.assertEqual(displacement_nib.shape, (64, 64, 64, 1, 3))
+        self.assertEqual(np.linalg.norm(
+            np.asanyarray(displacement_nib.dataobj)[:, :, :, 0, :].transpose(
+                2, 1, 0, 3) - nda), 0)
+
+        displacement2_sitk = nib2sitk.convert_nib_to_sitk_image(
+            displacement_nib)
+        self.assertEqual(displacement2_sitk.GetNumberOfComponentsPerPixel(), 3)
+        for attr in ["GetOrigin", "GetSpacing", "GetDirection"]:
+            self.assertAlmostEqual(
+                np.linalg.norm(
+                    np.array(getattr(image_sitk, attr)()) -
+                    getattr(displacement2_sitk, attr)()),
+                0, places=self.precision)
+        self.assertEqual(np.linalg.norm(
+            sitk.GetArrayFromImage(displacement2_sitk) - nda), 0)
+
+    def _get_labels_nda(self):
+        nda = np.zeros((20, 30, 40), dtype=np.uint8)
+        nda[2:5, 3:9, 4:20] = 1
+        nda[10:17, 10:28, 25:38] = 3
+        nda[12:14, 13:15, 27:30] = 4
+        return nda
+
+    def test_split_labels(self):
+        path_to_labels = os.path.join(DIR_TMP, "labels.nii")
+        path_to_output = os.path.join(DIR_TMP, "labels_split.nii.gz")
+
+        nda = self._get_labels_nda()
+        labels_sitk = sitk.GetImageFromArray(nda)
+        labels_sitk.SetSpacing((1.3, 2.1, 3.9))
+        sitk.WriteImage(labels_sitk, path_to_labels)
+
+        for dimension in [4, 5]:
+            utils.split_labels(path_to_labels, dimension, path_to_output)
+            nda_split = sitk.GetArrayFromImage(sitk.ReadImage(path_to_output))
+            if dimension == 4:
+                # [t,] z, y, x -> z, y, x, t
+                nda_split = np.moveaxis(nda_split, 0, -1)
+            self.assertEqual(nda_split.shape, nda.shape + (4, ))
+            for label in range(4):
+                self.assertEqual(
+                    np.sum(np.abs(nda_split[..., label] -
+                                  (nda == label + 1))), 0)
+
+    def test_split_labels_5D(self):
+        path_to_labels = os.path.join(DIR_TMP, "labels.nii")
+        path_to_output = os.path.join(DIR_TMP, "labels_split.nii.gz")
+
+        nda_3D = self._get_labels_nda()
+        for nda in [nda_3D, nda_3D[12]]:
+            dim = nda.ndim
+            labels_sitk = sitk.GetImageFromArray(nda)
+            labels_sitk.SetSpacing((1.3, 2.1, 3.9)[0:dim])
+            labels_sitk.SetOrigin((-4.2, 1.7, 10.3)[0:dim])
+            if dim == 3:
+                labels_sitk.SetDirection(sitk.VersorTransform(
+                    (0.1, -0.4, 0.3), 0.5).GetMatrix())
+            else:
+                labels_sitk.SetDirection((0.6, -0.8, 0.8, 0.6))
+            sitk.WriteImage(labels_sitk, path_to_labels)
+
+            # Reference: vector image from array (z,) y, x, labels as
+            # obtained by the former sitk-based implementation
+            nda_ref = np.stack([nda == label + 1 for label in range(4)],
+                               axis=-1).astype(np.uint8)
+            labels_ref_sitk = sitk.GetImageFromArray(nda_ref, isVector=True)
+            labels_ref_sitk.CopyInformation(labels_sitk)
+
+            utils.split_labels(path_to_labels, 5, path_to_output)
+            labels_5d_nib = nib.load(path_to_output)
+            self.assertEqual(
+                labels_5d_nib.shape,
+                nda.shape[::-1] + (1, ) * (4 - dim) + (4, ))
+
+            labels_5d_sitk = sitk.ReadImage(path_to_output)
+            self.assertEqual(labels_5d_sitk.GetDimension(), dim)
+            self.assertEqual(
+                labels_5d_sitk.GetNumberOfComponentsPerPixel(), 4)
+            for attr in ["GetOrigin", "GetSpacing", "GetDirection"]:
+                self.assertAlmostEqual(
+                    np.linalg.norm(
+                        np.array(getattr(labels_ref_sitk, attr)()) -
+                        getattr(labels_5d_sitk, attr)()),
+                    0, places=5)
+            self.assertEqual(np.sum(np.abs(
+                sitk.GetArrayFromImage(labels_5d_sitk) - nda_ref)), 0)
+
+    def test_convert_label_to_boundary(self):
+        path_to_labels = os.path.join(DIR_TMP, "labels.nii")
+        path_to_output = os.path.join(DIR_TMP, "labels_boundary.nii.gz")
+
+        nda = self._get_labels_nda()
+        sitk.WriteImage(sitk.GetImageFromArray(nda), path_to_labels)
+        utils.convert_label_to_boundary(
+            path_to_labels, path_to_output, iterations=2)
+        nda_boundary = sitk.GetArrayFromImage(sitk.ReadImage(path_to_output))
+
+        nda_reference = np.zeros_like(nda)
+        for label in range(1, nda.max() + 1):
+            mask = nda == label
+            boundary = mask & ~scipy.ndimage.binary_erosion(
+                mask, iterations=2)
+            nda_reference[boundary] = label
+        self.assertEqual(np.sum(np.abs(nda_boundary - nda_reference)), 0)
+
     def test_convert_sitk_to_nib_image_displacement(self):
         path_to_image = os.path.join(
             DIR_TEST, "3D_regf3d_Target_Source_cpp_disp.nii.gz")
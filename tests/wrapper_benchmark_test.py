@@ -0,0 +1,100 @@
+##
+# \file wrapper_benchmark_test.py
+#  \brief  Class containing unit tests for the stub executables and the
+#  benchmark harness of the wrappers of command line registration tools
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import shutil
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import pysitk.python_helper as ph
+
+import simplereg.niftyreg
+import simplereg.stub_executables as se
+import simplereg.wrapper_benchmark as wb
+from simplereg.definitions import DIR_DATA, DIR_TMP
+
+
+class WrapperBenchmarkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.precision = 7
+        self.dir_output = os.path.join(DIR_TMP, "wrapper_benchmark")
+        if os.path.isdir(self.dir_output):
+            shutil.rmtree(self.dir_output)
+
+        self.path = os.environ["PATH"]
+
+    def tearDown(self):
+        os.environ["PATH"] = self.path
+
+    def test_stub_executables(self):
+        dir_stubs = os.path.join(self.dir_output, "bin")
+        self.assertEqual(len(se.write_stub_executables(dir_stubs)), 3)
+        os.environ["PATH"] = dir_stubs + os.pathsep + self.path
+
+        fixed_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz"))
+        moving_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Source.nii.gz"))
+
+        # Outputs of stubs are valid: identity transforms and warped images
+        # on the fixed grid
+        with simplereg.niftyreg.RegAladin(fixed_sitk, moving_sitk) as nreg:
+            nreg.run()
+            transform_sitk = nreg.get_registration_transform_sitk()
+            self.assertAlmostEqual(np.linalg.norm(
+                np.array(transform_sitk.GetParameters()) -
+                np.array(sitk.AffineTransform(3).GetParameters())),
+                0, places=self.precision)
+            self.assertEqual(nreg.get_warped_moving_sitk().GetSize(),
+                             fixed_sitk.GetSize())
+            self.assertEqual(sorted(nreg.get_stage_times().keys()),
+                             ["inputs", "outputs", "tool"])
+
+        with simplereg.niftyreg.RegF3D(fixed_sitk, moving_sitk) as nreg:
+            nreg.run()
+            displacement_sitk = nreg.get_displacement_field_transform_sitk().\
+                GetDisplacementField()
+            self.assertAlmostEqual(np.abs(sitk.GetArrayFromImage(
+                displacement_sitk)).max(), 0, places=3)
+
+        self.assertEqual(se.run_stub("reg_aladin", ["-ref", "void.nii"]), 1)
+        self.assertRaises(ValueError, se.write_stub_executables,
+                          dir_stubs, ["c3d"])
+
+    def test_wrapper_benchmark(self):
+        for from_file in [True, False]:
+            benchmark = wb.WrapperBenchmark(
+                sizes=[(32, 32, 32)],
+                repetitions=1,
+                from_file=from_file,
+                dir_output=self.dir_output,
+            )
+            reports = benchmark.run()
+            self.assertEqual(os.environ["PATH"], self.path)
+
+            self.assertEqual(len(reports), len(wb.METHODS))
+            for report in reports:
+                self.assertEqual(report["size"], (32, 32, 32))
+                for stage in ["inputs", "tool", "outputs", "warp", "total"]:
+                    self.assertGreaterEqual(report[stage], 0)
+                self.assertEqual(report["displacement"] is None,
+                                 report["method"] != "RegF3D")
+                self.assertLessEqual(report["tool"], report["total"])
+
+            table = benchmark.get_table()
+            self.assertEqual(len(table.split("\n")), len(reports) + 1)
+
+    def test_application(self):
+        cmd_args = ["python simplereg_benchmark_wrappers.py"]
+        cmd_args.append("--sizes 16")
+        cmd_args.append("--methods RegAladin FLIRT")
+        cmd_args.append("--repetitions 1")
+        cmd_args.append("--dir-output %s" % self.dir_output)
+        self.assertEqual(ph.execute_command(" ".join(cmd_args)), 0)
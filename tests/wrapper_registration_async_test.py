@@ -0,0 +1,94 @@
+##
+# \file wrapper_registration_async_test.py
+#  \brief  Class containing unit tests for the asynchronous execution of
+#          wrapped command line registration tools (Python >= 3.7)
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+import os
+import sys
+import time
+import asyncio
+import numpy as np
+import SimpleITK as sitk
+import unittest
+
+import simplereg.niftyreg
+import simplereg.wrapper_registration_async as wra
+from simplereg.definitions import DIR_DATA
+
+
+class WrapperRegistrationAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.accuracy = 10
+
+        self.fixed_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Source.nii.gz"))
+        self.moving_sitk = sitk.ReadImage(
+            os.path.join(DIR_DATA, "3D_Brain_Target.nii.gz"))
+
+    def test_registration_reg_aladin_3D_async(self):
+        registration_methods = [
+            simplereg.niftyreg.RegAladin(
+                fixed_sitk=self.fixed_sitk,
+                moving_sitk=self.moving_sitk,
+                options="-voff",
+                transform_only=transform_only,
+            ) for transform_only in [False, True]
+        ]
+
+        async def run_all():
+            await asyncio.gather(*[
+                r.run_async(timeout=600) for r in registration_methods])
+        asyncio.run(run_all())
+
+        # Same transform as obtained by the synchronous run
+        registration_method = simplereg.niftyreg.RegAladin(
+            fixed_sitk=self.fixed_sitk,
+            moving_sitk=self.moving_sitk,
+            options="-voff",
+        )
+        registration_method.run()
+        parameters = np.array(
+            registration_method.get_registration_transform_sitk().
+            GetParameters())
+        for registration_method in registration_methods:
+            self.assertAlmostEqual(np.linalg.norm(
+                np.array(registration_method.
+                         get_registration_transform_sitk().GetParameters()) -
+                parameters), 0, places=self.accuracy)
+
+    def test_run_command_async(self):
+
+        def get_cmdline(code):
+            return "%s -c \"%s\"" % (sys.executable, code)
+
+        # Output is streamed and the environment is passed
+        lines = []
+        asyncio.run(wra.run_command_async(
+            get_cmdline(
+                "import os, sys; print(os.environ['SIMPLEREG_TEST']); "
+                "print('err', file=sys.stderr)"),
+            {"SIMPLEREG_TEST": "out"}, output_callback=lines.append))
+        self.assertEqual(sorted(lines), ["err\n", "out\n"])
+
+        self.assertRaises(RuntimeError, asyncio.run, wra.run_command_async(
+            get_cmdline("import sys; sys.exit(3)"), {}))
+
+        # Timeouts and cancellations terminate the command
+        time_start = time.time()
+        self.assertRaises(asyncio.TimeoutError, asyncio.run,
+                          wra.run_command_async(
+                              get_cmdline("import time; time.sleep(30)"),
+                              {}, timeout=0.5))
+
+        async def cancel():
+            task = asyncio.ensure_future(wra.run_command_async(
+                get_cmdline("import time; time.sleep(30)"), {}))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            await task
+        self.assertRaises(asyncio.CancelledError, asyncio.run, cancel())
+        self.assertLess(time.time() - time_start, 10)